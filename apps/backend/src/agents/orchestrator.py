@@ -24,6 +24,7 @@ LONG-RUNNING AGENT HARNESS:
 """
 
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 from datetime import datetime
 
@@ -62,6 +63,26 @@ from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Checked in order; the first category with a matching keyword wins
+_CATEGORY_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("frontend", ("frontend", "component", "ui", "page", "next", "react", "css", "tailwind")),
+    ("backend", ("backend", "api", "agent", "langgraph", "python", "fastapi")),
+    ("database", ("database", "migration", "supabase", "sql", "query", "schema")),
+    ("devops", ("deploy", "docker", "ci", "cd", "devops", "infrastructure")),
+)
+
+
+@lru_cache(maxsize=2048)
+def _categorize_description(description: str) -> str:
+    """Categorize a task description by keyword, memoized per description."""
+    description_lower = description.lower()
+
+    for category, words in _CATEGORY_KEYWORDS:
+        if any(word in description_lower for word in words):
+            return category
+
+    return "general"
+
 
 # ============================================================================
 # Task Status - Updated with verification states
@@ -976,20 +997,7 @@ class OrchestratorAgent(BaseAgent):
 
     def _categorize_task(self, description: str) -> str:
         """Categorize task based on description."""
-        description_lower = description.lower()
-
-        keywords = {
-            "frontend": ["frontend", "component", "ui", "page", "next", "react", "css", "tailwind"],
-            "backend": ["backend", "api", "agent", "langgraph", "python", "fastapi"],
-            "database": ["database", "migration", "supabase", "sql", "query", "schema"],
-            "devops": ["deploy", "docker", "ci", "cd", "devops", "infrastructure"],
-        }
-
-        for category, words in keywords.items():
-            if any(word in description_lower for word in words):
-                return category
-
-        return "general"
+        return _categorize_description(description)
 
     def _generate_failure_report(self, task: TaskState) -> str:
         """Generate honest failure report."""
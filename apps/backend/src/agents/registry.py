@@ -1,5 +1,6 @@
 """Agent registry for managing available agents."""
 
+from functools import lru_cache
 from typing import Any
 
 from .base_agent import (
@@ -22,6 +23,8 @@ class AgentRegistry:
     def __init__(self) -> None:
         self._agents: dict[str, BaseAgent] = {}
         self._category_mapping: dict[str, str] = {}
+        # Task description -> matching agent name, cleared on register()
+        self._agent_name_for_task = lru_cache(maxsize=1024)(self._find_agent_name_for_task)
         self._initialize_default_agents()
 
     def _initialize_default_agents(self) -> None:
@@ -65,6 +68,7 @@ class AgentRegistry:
             agent: The agent to register
         """
         self._agents[agent.name] = agent
+        self._agent_name_for_task.cache_clear()
         logger.info("Registered agent", name=agent.name, capabilities=agent.capabilities)
 
     def get_agent(self, name: str) -> BaseAgent | None:
@@ -99,12 +103,16 @@ class AgentRegistry:
         Returns:
             The best matching agent
         """
+        return self._agents.get(self._agent_name_for_task(task_description))
+
+    def _find_agent_name_for_task(self, task_description: str) -> str:
+        """Scan agents in registration order for the first that can handle the task."""
         for agent in self._agents.values():
             if agent.can_handle(task_description):
-                return agent
+                return agent.name
 
         # Fall back to general agent
-        return self._agents.get("general")
+        return "general"
 
     def list_agents(self) -> list[dict[str, Any]]:
         """List all registered agents.
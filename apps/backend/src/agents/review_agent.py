@@ -12,6 +12,7 @@ IMPORTANT: This is for review/feedback, NOT for verification.
 Independent verification still done by IndependentVerifier.
 """
 
+from collections import Counter
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -386,10 +387,9 @@ class ReviewAgent(BaseAgent):
         - No critical issues
         - No more than 2 high severity issues
         """
-        critical_count = sum(1 for i in issues if i.severity == IssueSeverity.CRITICAL)
-        high_count = sum(1 for i in issues if i.severity == IssueSeverity.HIGH)
+        counts = Counter(i.severity for i in issues)
 
-        approved = critical_count == 0 and high_count <= 2
+        approved = counts[IssueSeverity.CRITICAL] == 0 and counts[IssueSeverity.HIGH] <= 2
 
         return approved
 
@@ -408,8 +408,9 @@ class ReviewAgent(BaseAgent):
                 "Please address the feedback but changes can proceed."
             )
         else:
-            critical = sum(1 for i in issues if i.severity == IssueSeverity.CRITICAL)
-            high = sum(1 for i in issues if i.severity == IssueSeverity.HIGH)
+            counts = Counter(i.severity for i in issues)
+            critical = counts[IssueSeverity.CRITICAL]
+            high = counts[IssueSeverity.HIGH]
 
             if critical > 0:
                 return (
@@ -9,6 +9,7 @@ Handles:
 """
 
 import asyncio
+from collections import Counter
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -210,11 +211,13 @@ class SubagentManager:
                 else:
                     all_results.append(result)
 
+        status_counts = Counter(r.status for r in all_results)
+
         logger.info(
             "Parallel execution complete",
             total_subtasks=len(configs),
-            successful=sum(1 for r in all_results if r.status == SubagentStatus.COMPLETED),
-            failed=sum(1 for r in all_results if r.status == SubagentStatus.FAILED)
+            successful=status_counts[SubagentStatus.COMPLETED],
+            failed=status_counts[SubagentStatus.FAILED]
         )
 
         return all_results
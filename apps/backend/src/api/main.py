@@ -7,6 +7,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import get_settings
+from src.state import pool
+from src.state.buffer import get_write_buffer
+from src.state.events import get_agent_run_watcher
+from src.tools import _http as tool_http
 from src.utils import setup_logging, get_logger
 
 from .routes import agents, chat, health, webhooks, prd, workflows, rag, analytics, agent_dashboard, task_queue
@@ -24,6 +28,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting application", environment=settings.environment)
     yield
     logger.info("Shutting down application")
+    await get_agent_run_watcher().aclose()
+    await get_write_buffer().aclose()
+    await pool.aclose()
+    await tool_http.aclose()
 
 
 app = FastAPI(
@@ -16,7 +16,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
     """Middleware for JWT authentication."""
 
     # Paths that don't require authentication
-    PUBLIC_PATHS = {"/", "/health", "/ready", "/docs", "/openapi.json"}
+    PUBLIC_PATHS = {"/", "/health", "/health/db", "/ready", "/docs", "/openapi.json"}
 
     async def dispatch(
         self,
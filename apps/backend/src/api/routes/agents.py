@@ -4,11 +4,15 @@ This module provides HTTP endpoints for triggering and monitoring agent runs.
 Uses Supabase Realtime to push updates to the frontend in real-time.
 """
 
+import json
+from collections.abc import AsyncIterator
+
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.agents.orchestrator import OrchestratorAgent
-from src.state.events import AgentEventPublisher
+from src.state.events import AgentEventPublisher, get_agent_run_watcher
 from src.state.supabase import SupabaseStateStore
 from src.utils import get_logger
 
@@ -290,3 +294,30 @@ async def get_active_agent_runs(user_id: str) -> list[AgentRunStatusResponse]:
     except Exception as e:
         logger.error("Failed to get active agent runs", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/active/stream")
+async def stream_active_agent_runs(user_id: str) -> StreamingResponse:
+    """Stream a user's active agent runs as Server-Sent Events.
+
+    Sends one ``snapshot`` event with the currently active runs, then an
+    event for every change to the user's runs, pushed from Supabase
+    Realtime. Use this instead of polling ``/agents/active``.
+
+    Args:
+        user_id: User ID to filter runs
+
+    Returns:
+        An ``text/event-stream`` response
+
+    Example:
+        ```bash
+        curl -N http://localhost:8000/api/agents/active/stream?user_id=user_123
+        ```
+    """
+
+    async def events() -> AsyncIterator[str]:
+        async for event in get_agent_run_watcher().watch_active_runs(user_id):
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
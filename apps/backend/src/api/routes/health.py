@@ -2,9 +2,13 @@
 
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+
+from src.state.pool import check_database
+from src.utils import get_logger
 
 router = APIRouter()
+logger = get_logger(__name__)
 
 
 @router.get("/health")
@@ -25,3 +29,18 @@ async def readiness_check() -> dict[str, str]:
         "status": "ready",
         "timestamp": datetime.now().isoformat(),
     }
+
+
+@router.get("/health/db")
+async def database_health_check() -> dict[str, str]:
+    """Database health check through the shared Supabase connection pool."""
+    try:
+        await check_database()
+    except Exception as e:
+        logger.error("Database health check failed", error=str(e))
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+    }
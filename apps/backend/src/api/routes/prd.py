@@ -3,7 +3,7 @@
 Endpoints for generating Product Requirement Documents using AI agents.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from pydantic import BaseModel, Field
 from typing import Any, Optional
 from pathlib import Path
@@ -11,12 +11,27 @@ import json
 
 from src.agents.prd import PRDOrchestrator
 from src.state.events import AgentEventPublisher
+from src.state.supabase import SupabaseStateStore
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/prd", tags=["prd"])
 
 
+def get_state_store() -> SupabaseStateStore:
+    """Dependency to get the state store holding PRD agent runs.
+
+    Raises:
+        HTTPException: 500 if the store cannot be created, as the routes
+            did when they built it themselves
+    """
+    try:
+        return SupabaseStateStore()
+    except Exception as e:
+        logger.error("Failed to create state store", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 class GeneratePRDRequest(BaseModel):
     """Request to generate PRD."""
 
@@ -62,7 +77,8 @@ class PRDStatusResponse(BaseModel):
 @router.post("/generate", response_model=GeneratePRDResponse)
 async def generate_prd(
     request: GeneratePRDRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    store: SupabaseStateStore = Depends(get_state_store),
 ) -> GeneratePRDResponse:
     """Generate comprehensive PRD from requirements.
 
@@ -103,7 +119,7 @@ async def generate_prd(
         prd_id = f"prd_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
         # Initialize event publisher for real-time updates
-        publisher = AgentEventPublisher()
+        publisher = AgentEventPublisher(store)
 
         # Start agent run tracking
         run_id = await publisher.start_run(
@@ -144,7 +160,10 @@ async def generate_prd(
 
 
 @router.get("/status/{run_id}", response_model=PRDStatusResponse)
-async def get_prd_status(run_id: str) -> PRDStatusResponse:
+async def get_prd_status(
+    run_id: str,
+    store: SupabaseStateStore = Depends(get_state_store),
+) -> PRDStatusResponse:
     """Get PRD generation status by run ID.
 
     Use this endpoint to poll for status if not using real-time updates.
@@ -157,9 +176,6 @@ async def get_prd_status(run_id: str) -> PRDStatusResponse:
     - Error (if failed)
     """
     try:
-        from src.state.supabase import SupabaseStateStore
-
-        store = SupabaseStateStore()
         run = await store.get_agent_run(run_id)
 
         if not run:
@@ -187,7 +203,10 @@ async def get_prd_status(run_id: str) -> PRDStatusResponse:
 
 
 @router.get("/result/{prd_id}")
-async def get_prd_result(prd_id: str) -> dict[str, Any]:
+async def get_prd_result(
+    prd_id: str,
+    store: SupabaseStateStore = Depends(get_state_store),
+) -> dict[str, Any]:
     """Get complete PRD result by PRD ID.
 
     Returns the full PRD generation result including all analysis,
@@ -196,9 +215,6 @@ async def get_prd_result(prd_id: str) -> dict[str, Any]:
     try:
         # In production, you'd store PRD results in database
         # For now, we'll get it from agent run metadata
-        from src.state.supabase import SupabaseStateStore
-
-        store = SupabaseStateStore()
         runs = await store.get_task_agent_runs(prd_id)
 
         if not runs:
@@ -234,13 +250,16 @@ async def get_prd_result(prd_id: str) -> dict[str, Any]:
 
 
 @router.get("/documents/{prd_id}")
-async def list_prd_documents(prd_id: str) -> dict[str, Any]:
+async def list_prd_documents(
+    prd_id: str,
+    store: SupabaseStateStore = Depends(get_state_store),
+) -> dict[str, Any]:
     """List generated PRD documents.
 
     Returns paths to all generated document files if output_dir was specified.
     """
     try:
-        result = await get_prd_result(prd_id)
+        result = await get_prd_result(prd_id, store)
 
         documents = result.get("documents_generated", [])
 
@@ -299,10 +318,7 @@ async def execute_prd_generation(
 
         if result["success"]:
             # Store result in metadata for retrieval
-            from src.state.supabase import SupabaseStateStore
-            store = SupabaseStateStore()
-
-            await store.update_agent_run(
+            await publisher.store.update_agent_run(
                 run_id=run_id,
                 status="completed",
                 progress_percent=100.0,
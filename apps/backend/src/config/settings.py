@@ -33,6 +33,12 @@ class Settings(BaseSettings):
     supabase_service_role_key: str = Field(default="")
     supabase_jwt_secret: str = Field(default="")
 
+    # Supabase connection pool (shared HTTP connections to PostgREST)
+    supabase_pool_max_connections: int = Field(default=5)
+    supabase_pool_max_keepalive: int = Field(default=3)
+    supabase_pool_keepalive_expiry: float = Field(default=300.0)
+    supabase_pool_timeout: float = Field(default=30.0)
+
     # AI Models
     anthropic_api_key: str = Field(default="")
     google_ai_api_key: str = Field(default="")
@@ -324,6 +324,7 @@ class MemoryStore:
         user_id: Optional[str] = None,
         similarity_threshold: float = 0.7,
         limit: int = 10,
+        query_embedding: Optional[list[float]] = None,
     ) -> list[dict[str, Any]]:
         """Find similar memories using vector search.
 
@@ -333,15 +334,17 @@ class MemoryStore:
             user_id: Optional user filter
             similarity_threshold: Minimum similarity score (0-1)
             limit: Maximum number of results
+            query_embedding: Embedding of query_text, if the caller already has it
 
         Returns:
             List of dicts with memory data and similarity scores
         """
-        if not self.embedding_provider:
-            raise Exception("Embedding provider not initialized")
+        if query_embedding is None:
+            if not self.embedding_provider:
+                raise Exception("Embedding provider not initialized")
 
-        # Generate embedding for query
-        query_embedding = await self.embedding_provider.get_embedding(query_text)
+            # Generate embedding for query
+            query_embedding = await self.embedding_provider.get_embedding(query_text)
 
         # Call database function for vector search
         result = self.client.rpc(
@@ -618,7 +621,8 @@ class MemoryStore:
         task_description: str,
         domain: Optional[MemoryDomain] = None,
         user_id: Optional[str] = None,
-        limit: int = 5
+        limit: int = 5,
+        query_embedding: Optional[list[float]] = None
     ) -> list[dict[str, Any]]:
         """Retrieve relevant past work for a new task.
 
@@ -627,6 +631,7 @@ class MemoryStore:
             domain: Optional domain filter
             user_id: Optional user filter
             limit: Max results
+            query_embedding: Embedding of task_description, if already computed
 
         Returns:
             List of relevant memory entries with similarity scores
@@ -637,7 +642,8 @@ class MemoryStore:
             domain=domain,
             user_id=user_id,
             similarity_threshold=0.7,
-            limit=limit
+            limit=limit,
+            query_embedding=query_embedding
         )
 
         logger.debug(
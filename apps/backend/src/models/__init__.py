@@ -2,7 +2,7 @@
 
 from .anthropic import AnthropicClient
 from .google import GoogleClient
-from .openrouter import OpenRouterClient
+from .openrouter import ChatSession, OpenRouterClient
 from .selector import ModelSelector
 
-__all__ = ["AnthropicClient", "GoogleClient", "OpenRouterClient", "ModelSelector"]
+__all__ = ["AnthropicClient", "GoogleClient", "OpenRouterClient", "ChatSession", "ModelSelector"]
@@ -1,6 +1,17 @@
 """OpenRouter API client for multi-model access."""
 
-from openai import AsyncOpenAI
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
 
 from src.config import get_settings
 from src.utils import get_logger
@@ -8,6 +19,71 @@ from src.utils import get_logger
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Errors worth retrying; APITimeoutError is a subclass of APIConnectionError
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a model's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` consecutive failures and rejects calls
+    until ``reset_timeout`` seconds have passed. It then lets exactly one trial
+    call through (half-open) while still rejecting the rest; the trial's
+    success closes the breaker and its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        if self._opened_at is None:
+            return False
+        if self._trial_in_flight:
+            return True
+        return time.monotonic() - self._opened_at < self.reset_timeout
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the breaker is open.
+
+        When the reset timeout has expired, the calling request becomes the
+        single half-open trial.
+        """
+        if self.is_open:
+            raise CircuitOpenError("Circuit breaker is open")
+        if self._opened_at is not None:
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure and open the breaker at the threshold."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed transiently.
+
+        Frees the half-open slot without changing the breaker state, so a
+        cancelled or rejected trial does not block later trials.
+        """
+        self._trial_in_flight = False
+
 
 class OpenRouterClient:
     """Client for OpenRouter API (OpenAI-compatible)."""
@@ -17,15 +93,74 @@ class OpenRouterClient:
     CLAUDE_SONNET = "anthropic/claude-sonnet-4-5"
     GEMINI_PRO = "google/gemini-2.0-flash-exp"
 
+    # Retry policy for transient API errors
+    MAX_ATTEMPTS = 3
+    RETRY_MIN_WAIT = 0.2
+    RETRY_MAX_WAIT = 4.0
+
+    # Breakers are shared by all clients for the same model
+    _breakers: dict[str, CircuitBreaker] = {}
+
     def __init__(self, model: str | None = None) -> None:
         self.client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=settings.openrouter_api_key,
+            # Retries are handled by _create so they count against the breaker
+            max_retries=0,
         )
         self.model = model or self.CLAUDE_SONNET
         self.max_tokens = settings.max_tokens
         self.temperature = settings.temperature
 
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Circuit breaker for this client's model."""
+        if self.model not in self._breakers:
+            self._breakers[self.model] = CircuitBreaker()
+        return self._breakers[self.model]
+
+    async def _create(self, **kwargs: Any) -> Any:
+        """Create a chat completion with retries and circuit breaking.
+
+        Transient errors are retried with full-jitter exponential backoff.
+        Each failed attempt counts against the model's circuit breaker, and
+        an open breaker fails fast with CircuitOpenError.
+
+        Args:
+            **kwargs: Arguments for ``chat.completions.create``
+
+        Returns:
+            The completion (or stream) returned by the API
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            try:
+                response = await self.client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                wait = random.uniform(
+                    self.RETRY_MIN_WAIT,
+                    min(self.RETRY_MAX_WAIT, self.RETRY_MIN_WAIT * 2**attempt),
+                )
+                logger.warning(
+                    "OpenRouter request failed, retrying",
+                    model=self.model,
+                    attempt=attempt,
+                    wait=wait,
+                    error=str(e),
+                )
+                await asyncio.sleep(wait)
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return response
+
     async def complete(
         self,
         prompt: str,
@@ -44,20 +179,56 @@ class OpenRouterClient:
         Returns:
             The model's response text
         """
+        chunks = [
+            delta
+            async for delta in self.stream(
+                prompt,
+                system=system,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        ]
+        return "".join(chunks)
+
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion via OpenRouter as it is generated.
+
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+
+        Yields:
+            Text deltas of the model's response, in order
+        """
         try:
             messages = []
             if system:
                 messages.append({"role": "system", "content": system})
             messages.append({"role": "user", "content": prompt})
 
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 max_tokens=max_tokens or self.max_tokens,
                 temperature=temperature or self.temperature,
                 messages=messages,
+                stream=True,
             )
 
-            return response.choices[0].message.content or ""
+            async with response:
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
 
         except Exception as e:
             logger.error("OpenRouter API error", error=str(e))
@@ -83,7 +254,7 @@ class OpenRouterClient:
                 full_messages.append({"role": "system", "content": system})
             full_messages.extend(messages)
 
-            response = await self.client.chat.completions.create(
+            response = await self._create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
@@ -95,3 +266,82 @@ class OpenRouterClient:
         except Exception as e:
             logger.error("OpenRouter chat error", error=str(e))
             raise
+
+
+class ChatSession:
+    """Multi-turn conversation held against a single OpenRouterClient.
+
+    Turns are only ever appended, so consecutive requests share an identical
+    prefix (system prompt first, then history in order) that provider-side
+    prompt caches can reuse. When the estimated history size exceeds the
+    token budget, the oldest user/assistant pairs are rolled off.
+
+    The budget is measured with ``estimate_tokens``, not a model tokenizer:
+    OpenRouter fronts many model families with different tokenizers, so
+    leave headroom below the model's real context limit.
+    """
+
+    def __init__(
+        self,
+        client: OpenRouterClient | None = None,
+        system: str | None = None,
+        budget_tokens: int | None = None,
+    ) -> None:
+        self.client = client or OpenRouterClient()
+        self.system = system
+        self._budget_tokens = budget_tokens
+        self._messages: list[dict[str, str]] = []
+
+    @property
+    def messages(self) -> list[dict[str, str]]:
+        """Current conversation history (excluding the system prompt)."""
+        return list(self._messages)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (4 chars per token), not a model tokenizer."""
+        return len(text) // 4
+
+    async def send(self, user: str) -> str:
+        """Send a user turn and record the assistant's reply.
+
+        Args:
+            user: The user message content
+
+        Returns:
+            The model's response text
+        """
+        # Trim a copy; history only changes once the request succeeds, so a
+        # failed turn can be retried against the same prefix
+        messages = self._trim_to_budget([*self._messages, {"role": "user", "content": user}])
+        reply = await self.client.chat(list(messages), system=self.system)
+
+        self._messages = [*messages, {"role": "assistant", "content": reply}]
+        return reply
+
+    def reset(self) -> None:
+        """Clear the conversation history."""
+        self._messages.clear()
+
+    def _trim_to_budget(self, messages: list[dict[str, str]]) -> list[dict[str, str]]:
+        """Drop the oldest user/assistant pairs until history fits the budget.
+
+        Args:
+            messages: History including the new user turn; not modified
+
+        Returns:
+            The messages that fit
+        """
+        if self._budget_tokens is None:
+            return messages
+
+        used = sum(self.estimate_tokens(m["content"]) for m in messages)
+        if self.system:
+            used += self.estimate_tokens(self.system)
+
+        # Always keep the latest user turn
+        start = 0
+        while used > self._budget_tokens and len(messages) - start > 1:
+            used -= sum(self.estimate_tokens(m["content"]) for m in messages[start : start + 2])
+            start += 2
+        return messages[start:]
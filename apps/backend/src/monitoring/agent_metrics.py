@@ -9,9 +9,11 @@ Tracks:
 - Cost tracking
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Any
 
+from postgrest.types import ReturnMethod
 from pydantic import BaseModel
 
 from src.state.supabase import SupabaseStateStore
@@ -36,6 +38,23 @@ class TaskMetrics(BaseModel):
     pr_merged: bool = False
     cost_estimate: float = 0.0
 
+    def to_record(self) -> dict[str, Any]:
+        """Serialize to a plain dict for storage.
+
+        All fields are flat JSON scalars, so a shallow copy of the field
+        values is equivalent to ``model_dump()`` without a serializer pass.
+        """
+        return dict(self.__dict__)
+
+
+def _build_task_metrics(**fields: Any) -> TaskMetrics:
+    """Build TaskMetrics from trusted internal values without validation.
+
+    Only use this for values produced by the agents themselves; metrics
+    arriving from API input should go through ``TaskMetrics(...)``.
+    """
+    return TaskMetrics.model_construct(**fields)
+
 
 class AgentHealthReport(BaseModel):
     """Health report for an agent."""
@@ -56,6 +75,11 @@ class AgentHealthReport(BaseModel):
 class AgentMetrics:
     """Track agent performance and reliability."""
 
+    # Columns needed by the per-agent health metrics
+    RUN_COLUMNS = "agent_type,metadata,started_at"
+    DEFAULT_WINDOW_DAYS = 30
+    DEFAULT_RUN_LIMIT = 10_000
+
     def __init__(self) -> None:
         """Initialize agent metrics."""
         self.store = SupabaseStateStore()
@@ -76,7 +100,7 @@ class AgentMetrics:
             agent_type: Type of agent
             metrics: Metrics dict
         """
-        task_metrics = TaskMetrics(
+        task_metrics = _build_task_metrics(
             task_id=task_id,
             agent_id=agent_id,
             agent_type=agent_type,
@@ -109,9 +133,10 @@ class AgentMetrics:
                 "id": metrics.task_id,
                 "agent_type": metrics.agent_type,
                 "status": "completed" if metrics.verified else "failed",
-                "metadata": metrics.model_dump()
+                "metadata": metrics.to_record()
             },
-            on_conflict="id"
+            on_conflict="id",
+            returning=ReturnMethod.minimal,
         ).execute()
 
     async def track_verification_rate(
@@ -128,17 +153,18 @@ class AgentMetrics:
         Returns:
             Current verification pass rate
         """
-        # Query past verifications
+        # Query all past verifications; this rate is all-time, not windowed
         results = self.client.table("agent_runs").select("metadata").eq(
             "metadata->>agent_id", agent_id
         ).execute()
+        runs = results.data or []
 
-        total = len(results.data)
+        total = len(runs)
         if total == 0:
             return 1.0 if passed else 0.0
 
         passed_count = sum(
-            1 for r in results.data
+            1 for r in runs
             if r.get("metadata", {}).get("verified", False)
         )
 
@@ -211,7 +237,8 @@ class AgentMetrics:
         """
         # Store iteration count
         self.client.table("agent_runs").update(
-            {"metadata": {"iterations": iterations}}
+            {"metadata": {"iterations": iterations}},
+            returning=ReturnMethod.minimal,
         ).eq("id", task_id).execute()
 
         # Get average iterations across all tasks
@@ -233,22 +260,36 @@ class AgentMetrics:
 
     async def get_agent_health(
         self,
-        agent_id: str
+        agent_id: str,
+        since: datetime | None = None,
+        limit: int = DEFAULT_RUN_LIMIT,
     ) -> AgentHealthReport:
         """Get comprehensive health report for an agent.
 
         Args:
             agent_id: Agent identifier
+            since: Only include runs started after this time (default: 30 days ago)
+            limit: Maximum number of runs to include, newest first
 
         Returns:
             Health report with statistics
         """
-        # Query all tasks for this agent
-        results = self.client.table("agent_runs").select("*").eq(
-            "metadata->>agent_id", agent_id
-        ).execute()
+        if since is None:
+            since = datetime.now() - timedelta(days=self.DEFAULT_WINDOW_DAYS)
+
+        # Query recent tasks for this agent
+        results = (
+            self.client.table("agent_runs")
+            .select(self.RUN_COLUMNS)
+            .eq("metadata->>agent_id", agent_id)
+            .gte("started_at", since.isoformat())
+            .order("started_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        runs = results.data or []
 
-        if not results.data:
+        if not runs:
             return AgentHealthReport(
                 agent_id=agent_id,
                 agent_type="unknown",
@@ -263,29 +304,29 @@ class AgentMetrics:
             )
 
         # Calculate metrics
-        total_tasks = len(results.data)
+        total_tasks = len(runs)
         successful_tasks = sum(
-            1 for r in results.data
+            1 for r in runs
             if r.get("metadata", {}).get("verified", False)
         )
         failed_tasks = total_tasks - successful_tasks
 
         iterations = [
             r.get("metadata", {}).get("iterations", 1)
-            for r in results.data
+            for r in runs
         ]
         avg_iterations = sum(iterations) / len(iterations) if iterations else 0.0
 
         durations = [
             r.get("metadata", {}).get("duration_seconds", 0)
-            for r in results.data
+            for r in runs
             if r.get("metadata", {}).get("duration_seconds")
         ]
         avg_duration = sum(durations) / len(durations) if durations else 0.0
 
         verification_attempts = [
             r.get("metadata", {}).get("verification_attempts", 1)
-            for r in results.data
+            for r in runs
         ]
         verified_count = successful_tasks
         verification_pass_rate = (
@@ -295,23 +336,23 @@ class AgentMetrics:
         )
 
         prs_created = sum(
-            1 for r in results.data
+            1 for r in runs
             if r.get("metadata", {}).get("pr_created", False)
         )
         prs_merged = sum(
-            1 for r in results.data
+            1 for r in runs
             if r.get("metadata", {}).get("pr_merged", False)
         )
         pr_merge_rate = prs_merged / prs_created if prs_created > 0 else 0.0
 
         # Get last active timestamp
         last_active = max(
-            (r.get("created_at") for r in results.data),
+            (r.get("started_at") for r in runs),
             default=None
         )
 
         # Get agent type from first result
-        agent_type = results.data[0].get("agent_type", "unknown")
+        agent_type = runs[0].get("agent_type", "unknown")
 
         report = AgentHealthReport(
             agent_id=agent_id,
@@ -361,25 +402,27 @@ class AgentMetrics:
                 "failed_tasks": 0
             }
 
-        total = len(results.data)
-        successful = sum(
-            1 for r in results.data
-            if r.get("metadata", {}).get("verified", False)
-        )
-        failed = total - successful
-
-        # Group by agent type
-        by_type: dict[str, Any] = {}
+        # Group by agent type in a single pass
+        totals: Counter[str] = Counter()
+        successes: Counter[str] = Counter()
         for result in results.data:
             agent_type = result.get("agent_type", "unknown")
-            if agent_type not in by_type:
-                by_type[agent_type] = {"total": 0, "successful": 0, "failed": 0}
-
-            by_type[agent_type]["total"] += 1
+            totals[agent_type] += 1
             if result.get("metadata", {}).get("verified", False):
-                by_type[agent_type]["successful"] += 1
-            else:
-                by_type[agent_type]["failed"] += 1
+                successes[agent_type] += 1
+
+        by_type: dict[str, Any] = {
+            agent_type: {
+                "total": count,
+                "successful": successes[agent_type],
+                "failed": count - successes[agent_type],
+            }
+            for agent_type, count in totals.items()
+        }
+
+        total = len(results.data)
+        successful = sum(successes.values())
+        failed = total - successful
 
         return {
             "time_range_days": time_range_days,
@@ -3,6 +3,8 @@
 from datetime import datetime
 from typing import Any
 
+from postgrest.types import ReturnMethod
+
 from src.memory.embeddings import get_embedding_provider
 from src.rag.models import DocumentChunk, DocumentSource, ProcessingStatus
 from src.state.supabase import SupabaseStateStore
@@ -68,7 +70,9 @@ class RAGStore:
         if status == ProcessingStatus.COMPLETED:
             data["processed_at"] = datetime.now().isoformat()
 
-        self.client.table("document_sources").update(data).eq("id", source_id).execute()
+        self.client.table("document_sources").update(
+            data, returning=ReturnMethod.minimal
+        ).eq("id", source_id).execute()
 
     # Document Chunks
 
@@ -1,20 +1,77 @@
 """Skill executor for running SKILL.md defined logic."""
 
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from .loader import SkillLoader
-from .parser import extract_sections, extract_code_blocks
+from .parser import extract_sections, extract_code_blocks, extract_verification_steps
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Keywords to trigger mapping
+TRIGGER_KEYWORDS: dict[str, list[str]] = {
+    "frontend": ["frontend", "component", "ui", "react", "next"],
+    "backend": ["backend", "api", "python", "agent"],
+    "database": ["database", "sql", "migration", "supabase"],
+    "devops": ["docker", "deploy", "ci", "cd"],
+}
+
+
+def _build_keyword_matcher(
+    trigger_keywords: dict[str, list[str]],
+) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """Compile trigger keywords into a single-pass multi-pattern matcher.
+
+    The pattern is a zero-width lookahead over all keywords (longest first), so
+    ``finditer`` reports a match at every position, including overlapping ones.
+    Each keyword maps to the triggers of itself and of every keyword that is a
+    prefix of it, since the alternation only reports the longest keyword at a
+    given position.
+
+    Args:
+        trigger_keywords: Mapping of trigger name to its keywords
+
+    Returns:
+        Tuple of (compiled pattern, keyword -> triggers mapping)
+    """
+    keyword_triggers: dict[str, set[str]] = {}
+    for trigger, keywords in trigger_keywords.items():
+        for keyword in keywords:
+            keyword_triggers.setdefault(keyword, set()).add(trigger)
+
+    outputs = {
+        keyword: frozenset(
+            trigger
+            for other, triggers in keyword_triggers.items()
+            if keyword.startswith(other)
+            for trigger in triggers
+        )
+        for keyword in keyword_triggers
+    }
+
+    alternation = "|".join(
+        re.escape(keyword) for keyword in sorted(keyword_triggers, key=len, reverse=True)
+    )
+    return re.compile(f"(?=({alternation}))"), outputs
+
+
+_KEYWORD_PATTERN, _KEYWORD_TRIGGERS = _build_keyword_matcher(TRIGGER_KEYWORDS)
+
 
 class SkillExecutor:
     """Executes skills based on SKILL.md definitions."""
 
     def __init__(self, skill_loader: SkillLoader | None = None) -> None:
         self.loader = skill_loader or SkillLoader()
-        self._loaded_skills: dict[str, dict[str, Any]] = {}
+        # Copy-on-write snapshot, replaced wholesale on every insert
+        self._loaded_skills: Mapping[str, dict[str, Any]] = MappingProxyType({})
+
+    def _remember_skill(self, name: str, skill_data: dict[str, Any]) -> None:
+        """Publish a new loaded-skills snapshot that includes ``skill_data``."""
+        self._loaded_skills = MappingProxyType({**self._loaded_skills, name: skill_data})
 
     def load_skill(self, skill_path: str) -> bool:
         """Load a skill for execution.
@@ -27,10 +84,20 @@ class SkillExecutor:
         """
         skill_data = self.loader.load_skill(skill_path)
         if skill_data:
-            self._loaded_skills[skill_data["name"]] = skill_data
+            self._remember_skill(skill_data["name"], skill_data)
             return True
         return False
 
+    def _get_skill(self, skill_name: str) -> dict[str, Any] | None:
+        """Get loaded skill data, loading it by name on first use."""
+        skill_data = self._loaded_skills.get(skill_name)
+        if skill_data is None:
+            skill_data = self.loader.get_skill_by_name(skill_name)
+            if not skill_data:
+                return None
+            self._remember_skill(skill_name, skill_data)
+        return skill_data
+
     def get_skill_prompt(self, skill_name: str) -> str | None:
         """Get the prompt/instructions from a skill.
 
@@ -40,14 +107,9 @@ class SkillExecutor:
         Returns:
             The skill's content as a prompt
         """
-        if skill_name not in self._loaded_skills:
-            skill = self.loader.get_skill_by_name(skill_name)
-            if skill:
-                self._loaded_skills[skill_name] = skill
-            else:
-                return None
-
-        skill_data = self._loaded_skills[skill_name]
+        skill_data = self._get_skill(skill_name)
+        if skill_data is None:
+            return None
         return skill_data.get("content", "")
 
     def get_skill_sections(self, skill_name: str) -> dict[str, str]:
@@ -67,38 +129,21 @@ class SkillExecutor:
     def get_verification_steps(self, skill_name: str) -> list[str]:
         """Extract verification steps from a skill.
 
+        Steps are parsed once when the skill file is loaded.
+
         Args:
             skill_name: Name of the skill
 
         Returns:
             List of verification step descriptions
         """
-        sections = self.get_skill_sections(skill_name)
-
-        # Look for verification-related sections
-        verification_content = ""
-        for key in ["verification", "verification_checklist", "checklist"]:
-            if key in sections:
-                verification_content = sections[key]
-                break
-
-        if not verification_content:
+        skill_data = self._get_skill(skill_name)
+        if skill_data is None:
             return []
 
-        # Extract checklist items
-        steps = []
-        for line in verification_content.split("\n"):
-            line = line.strip()
-            if line.startswith("- [ ]") or line.startswith("- [x]"):
-                step = line[5:].strip()
-                if step:
-                    steps.append(step)
-            elif line.startswith("- "):
-                step = line[2:].strip()
-                if step:
-                    steps.append(step)
-
-        return steps
+        if "verification_steps" not in skill_data:
+            return extract_verification_steps(skill_data.get("content", ""))
+        return list(skill_data["verification_steps"])
 
     def get_code_examples(self, skill_name: str) -> list[dict[str, str]]:
         """Extract code examples from a skill.
@@ -125,18 +170,12 @@ class SkillExecutor:
         """
         task_lower = task_description.lower()
 
-        # Keywords to trigger mapping
-        trigger_keywords = {
-            "frontend": ["frontend", "component", "ui", "react", "next"],
-            "backend": ["backend", "api", "python", "agent"],
-            "database": ["database", "sql", "migration", "supabase"],
-            "devops": ["docker", "deploy", "ci", "cd"],
-        }
-
-        matching_triggers = []
-        for trigger, keywords in trigger_keywords.items():
-            if any(kw in task_lower for kw in keywords):
-                matching_triggers.append(trigger)
+        matched: set[str] = set()
+        for match in _KEYWORD_PATTERN.finditer(task_lower):
+            matched |= _KEYWORD_TRIGGERS[match.group(1)]
+
+        # Preserve declaration order of triggers
+        matching_triggers = [t for t in TRIGGER_KEYWORDS if t in matched]
 
         if not matching_triggers:
             matching_triggers = ["any_task"]
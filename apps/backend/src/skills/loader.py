@@ -1,6 +1,10 @@
 """Skill file loader."""
 
+import asyncio
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from .parser import parse_skill_frontmatter
@@ -19,7 +23,13 @@ class SkillLoader:
         else:
             self.skills_dir = Path(skills_dir)
 
-        self._cache: dict[str, dict[str, Any]] = {}
+        # Copy-on-write snapshot: readers never see a partially updated cache
+        self._cache: Mapping[str, dict[str, Any]] = MappingProxyType({})
+
+    def _publish(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Swap in a new cache snapshot containing ``entries``."""
+        if entries:
+            self._cache = MappingProxyType({**self._cache, **entries})
 
     def load_skill(self, skill_path: str) -> dict[str, Any] | None:
         """Load a single skill file.
@@ -40,12 +50,33 @@ class SkillLoader:
             return None
 
         try:
-            content = full_path.read_text(encoding="utf-8")
+            raw = full_path.read_bytes()
+        except Exception as e:
+            logger.error("Failed to load skill", path=skill_path, error=str(e))
+            return None
+
+        skill_data = self._parse_skill(skill_path, full_path, raw)
+        if skill_data:
+            self._publish({skill_path: skill_data})
+        return skill_data
+
+    def _parse_skill(self, skill_path: str, full_path: Path, raw: bytes) -> dict[str, Any] | None:
+        """Parse raw skill file bytes.
+
+        Args:
+            skill_path: Path relative to skills directory
+            full_path: Absolute path of the skill file
+            raw: Undecoded file contents
+
+        Returns:
+            Parsed skill data or None if parsing failed
+        """
+        try:
+            content = raw.decode("utf-8")
             skill_data = parse_skill_frontmatter(content)
             skill_data["path"] = skill_path
             skill_data["full_path"] = str(full_path)
 
-            self._cache[skill_path] = skill_data
             logger.info("Loaded skill", name=skill_data.get("name"), path=skill_path)
             return skill_data
 
@@ -53,28 +84,93 @@ class SkillLoader:
             logger.error("Failed to load skill", path=skill_path, error=str(e))
             return None
 
+    def _skill_files(self) -> list[tuple[str, Path]]:
+        """List all skill files in the skills directory.
+
+        Returns:
+            List of (relative path, absolute path) tuples
+        """
+        return [
+            (str(skill_file.relative_to(self.skills_dir)), skill_file)
+            for skill_file in self.skills_dir.rglob("*.md")
+        ]
+
+    def _pending(self, files: list[tuple[str, Path]]) -> list[tuple[str, Path]]:
+        """Filter skill files down to those that are not cached yet."""
+        cache = self._cache
+        return [(rel_path, path) for rel_path, path in files if rel_path not in cache]
+
+    def _collect_skills(self, files: list[tuple[str, Path]]) -> list[dict[str, Any]]:
+        """Return the cached skills for ``files``, sorted by priority.
+
+        Lower priority number = higher priority.
+        """
+        cache = self._cache
+        skills = [cache[rel_path] for rel_path, _ in files if rel_path in cache]
+        skills.sort(key=lambda s: s.get("priority", 99))
+        return skills
+
+    @staticmethod
+    def _read_or_error(path: Path) -> bytes | Exception:
+        """Read a file, returning the exception instead of raising it."""
+        try:
+            return path.read_bytes()
+        except Exception as e:
+            return e
+
+    def _ingest(self, pending: list[tuple[str, Path]], results: list[bytes | Exception]) -> None:
+        """Parse a batch of file reads and publish them in one cache swap."""
+        loaded: dict[str, dict[str, Any]] = {}
+        for (rel_path, full_path), raw in zip(pending, results):
+            if isinstance(raw, Exception):
+                logger.error("Failed to load skill", path=rel_path, error=str(raw))
+                continue
+            skill_data = self._parse_skill(rel_path, full_path, raw)
+            if skill_data:
+                loaded[rel_path] = skill_data
+        self._publish(loaded)
+
     def load_all_skills(self) -> list[dict[str, Any]]:
         """Load all skill files in the skills directory.
 
+        Uncached files are read concurrently on a thread pool, then decoded
+        and parsed on the calling thread.
+
         Returns:
             List of parsed skill data
         """
-        skills = []
-
         if not self.skills_dir.exists():
             logger.warning("Skills directory not found", path=str(self.skills_dir))
-            return skills
+            return []
 
-        for skill_file in self.skills_dir.rglob("*.md"):
-            rel_path = skill_file.relative_to(self.skills_dir)
-            skill_data = self.load_skill(str(rel_path))
-            if skill_data:
-                skills.append(skill_data)
+        files = self._skill_files()
+        pending = self._pending(files)
+        if pending:
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(self._read_or_error, (p for _, p in pending)))
+            self._ingest(pending, results)
 
-        # Sort by priority (lower number = higher priority)
-        skills.sort(key=lambda s: s.get("priority", 99))
+        return self._collect_skills(files)
 
-        return skills
+    async def aload_all_skills(self) -> list[dict[str, Any]]:
+        """Load all skill files without blocking the event loop.
+
+        Returns:
+            List of parsed skill data
+        """
+        if not self.skills_dir.exists():
+            logger.warning("Skills directory not found", path=str(self.skills_dir))
+            return []
+
+        files = await asyncio.to_thread(self._skill_files)
+        pending = self._pending(files)
+        if pending:
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._read_or_error, p) for _, p in pending)
+            )
+            self._ingest(pending, list(results))
+
+        return self._collect_skills(files)
 
     def get_skill_by_name(self, name: str) -> dict[str, Any] | None:
         """Find a skill by its name.
@@ -10,6 +10,10 @@ from src.utils import get_logger
 logger = get_logger(__name__)
 
 FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+CODE_BLOCK_PATTERN = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+
+# Section names holding verification steps, in order of preference
+VERIFICATION_SECTIONS = ("verification", "verification_checklist", "checklist")
 
 
 def parse_skill_frontmatter(content: str) -> dict[str, Any]:
@@ -30,6 +34,7 @@ def parse_skill_frontmatter(content: str) -> dict[str, Any]:
         "triggers": [],
         "requires": [],
         "content": "",
+        "verification_steps": [],
     }
 
     match = FRONTMATTER_PATTERN.match(content)
@@ -49,6 +54,8 @@ def parse_skill_frontmatter(content: str) -> dict[str, Any]:
         # No frontmatter, entire content is markdown
         result["content"] = content.strip()
 
+    result["verification_steps"] = extract_verification_steps(result["content"])
+
     return result
 
 
@@ -84,6 +91,38 @@ def extract_sections(content: str) -> dict[str, str]:
     return sections
 
 
+def extract_verification_steps(content: str) -> list[str]:
+    """Extract verification checklist items from skill content.
+
+    Args:
+        content: The markdown content (without frontmatter)
+
+    Returns:
+        List of verification step descriptions
+    """
+    sections = extract_sections(content)
+
+    verification_content = ""
+    for key in VERIFICATION_SECTIONS:
+        if key in sections:
+            verification_content = sections[key]
+            break
+
+    steps = []
+    for line in verification_content.split("\n"):
+        line = line.strip()
+        if line.startswith("- [ ]") or line.startswith("- [x]"):
+            step = line[5:].strip()
+        elif line.startswith("- "):
+            step = line[2:].strip()
+        else:
+            continue
+        if step:
+            steps.append(step)
+
+    return steps
+
+
 def extract_code_blocks(content: str) -> list[dict[str, str]]:
     """Extract code blocks from markdown content.
 
@@ -94,9 +133,8 @@ def extract_code_blocks(content: str) -> list[dict[str, str]]:
         List of code blocks with 'language' and 'code' keys
     """
     code_blocks: list[dict[str, str]] = []
-    pattern = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
 
-    for match in pattern.finditer(content):
+    for match in CODE_BLOCK_PATTERN.finditer(content):
         code_blocks.append({
             "language": match.group(1) or "text",
             "code": match.group(2).strip(),
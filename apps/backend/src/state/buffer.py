@@ -0,0 +1,200 @@
+"""Coalescing write buffer for Supabase upserts.
+
+Saving state after every message turns a burst of writes into one PostgREST
+round-trip per row. The buffer queues upserts per table and a background
+worker flushes them as a single bulk upsert. The first row of a quiet period
+is sent immediately; only when more rows are already waiting does the worker
+hold the batch open for up to ``max_wait_ms`` to collect the burst.
+
+Callers still await their own write, so errors propagate exactly as they did
+with direct upserts.
+"""
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from postgrest.types import ReturnMethod
+
+from src.utils import get_logger
+
+from .pool import get_async_client
+
+logger = get_logger(__name__)
+
+Row = dict[str, Any]
+Item = tuple[Row, "asyncio.Future[None]"]
+QueueKey = tuple[str, str]
+Flush = Callable[[str, list[Row], str], Awaitable[None]]
+
+
+async def _upsert(table: str, rows: list[Row], on_conflict: str) -> None:
+    """Bulk upsert rows through the shared async client.
+
+    Callers never read the written rows back, so ask PostgREST not to
+    return them.
+    """
+    client = await get_async_client()
+    await client.table(table).upsert(
+        rows, on_conflict=on_conflict, returning=ReturnMethod.minimal
+    ).execute()
+
+
+class WriteBuffer:
+    """Per-table upsert queues flushed by background workers.
+
+    Workers run on the event loop that made the first write, so a buffer
+    serves one loop; ``get_write_buffer`` hands out one per loop.
+    """
+
+    def __init__(
+        self,
+        flush: Flush = _upsert,
+        max_items: int = 256,
+        max_wait_ms: float = 50,
+    ) -> None:
+        self._flush = flush
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Keyed by (table, on_conflict) so each upsert uses its own target
+        self._queues: dict[QueueKey, asyncio.Queue[Item | None]] = {}
+        self._workers: dict[QueueKey, asyncio.Task[None]] = {}
+
+    async def enqueue(self, table: str, row: Row, on_conflict: str = "id") -> None:
+        """Queue an upsert and wait until it has been written.
+
+        Args:
+            table: Table to upsert into
+            row: Row to upsert
+            on_conflict: Conflict target column(s) for the upsert
+
+        Raises:
+            RuntimeError: If the buffer is already serving another event loop
+            Exception: Whatever the bulk upsert containing this row raised
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None or not self._workers:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("WriteBuffer is bound to a different event loop")
+
+        key = (table, on_conflict)
+        if key not in self._queues:
+            self._queues[key] = asyncio.Queue()
+            self._workers[key] = asyncio.create_task(self._run(key))
+
+        future: asyncio.Future[None] = loop.create_future()
+        await self._queues[key].put((row, future))
+        await future
+
+    async def _drain(self, queue: asyncio.Queue[Item | None], batch: list[Item]) -> bool:
+        """Wait for one item, then collect any burst queued behind it.
+
+        Items are appended to ``batch`` as they are taken, so the caller
+        still holds them if the worker is interrupted mid-drain.
+
+        Returns:
+            Whether the close sentinel was reached
+        """
+        first = await queue.get()
+        if first is None:
+            return True
+        batch.append(first)
+        while not queue.empty() and len(batch) < self.max_items:
+            item = queue.get_nowait()
+            if item is None:
+                return True
+            batch.append(item)
+
+        if len(batch) == 1:
+            return False
+
+        # A burst is in progress: keep the batch open briefly for stragglers
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_items:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+            if item is None:
+                return True
+            batch.append(item)
+        return False
+
+    async def _run(self, key: QueueKey) -> None:
+        """Flush batches for one queue until the close sentinel arrives."""
+        queue = self._queues[key]
+        batch: list[Item] = []
+        closing = False
+        try:
+            while not closing:
+                closing = await self._drain(queue, batch)
+                if batch:
+                    await self._write(key, batch)
+                batch = []
+        except BaseException as e:
+            # Don't leave callers waiting on a worker that no longer runs
+            error = e if isinstance(e, Exception) else RuntimeError("Write buffer worker stopped")
+            logger.error("Write buffer worker died", table=key[0], error=str(e))
+            if self._queues.get(key) is queue:
+                del self._queues[key]
+                del self._workers[key]
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+
+    async def _write(self, key: QueueKey, batch: list[Item]) -> None:
+        """Write one batch and resolve its futures."""
+        table, on_conflict = key
+        # Keep the last write per id; one upsert cannot touch a row twice
+        rows = list({row.get(on_conflict, id(row)): row for row, _ in batch}.values())
+        try:
+            await self._flush(table, rows, on_conflict)
+        except Exception as e:
+            logger.error("Buffered upsert failed", table=table, rows=len(rows), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            logger.debug("Flushed buffered upserts", table=table, rows=len(rows))
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def aclose(self) -> None:
+        """Flush anything still queued and stop the workers."""
+        for queue in self._queues.values():
+            queue.put_nowait(None)
+        await asyncio.gather(*self._workers.values())
+        self._workers.clear()
+        self._queues.clear()
+
+
+_write_buffers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, WriteBuffer] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_write_buffer() -> WriteBuffer:
+    """Get the write buffer for the running event loop.
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    buffer = _write_buffers.get(loop)
+    if buffer is None:
+        buffer = _write_buffers[loop] = WriteBuffer()
+    return buffer
@@ -27,10 +27,16 @@ Usage:
     )
 """
 
+import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 from uuid import uuid4
 
-from .supabase import SupabaseStateStore
+from realtime._async.channel import AsyncRealtimeChannel
+from realtime.types import PostgresChangesPayload, RealtimePostgresChangesListenEvent
+
+from .pool import get_async_client
+from .supabase import ACTIVE_RUN_STATUSES, SupabaseStateStore
 from src.utils import get_logger
 
 logger = get_logger(__name__)
@@ -43,8 +49,8 @@ class AgentEventPublisher:
     Now includes local caching for improved performance.
     """
 
-    def __init__(self) -> None:
-        self.store = SupabaseStateStore()
+    def __init__(self, store: SupabaseStateStore | None = None) -> None:
+        self.store = store or SupabaseStateStore()
         self.local_cache: dict[str, dict[str, Any]] = {}
 
     async def start_run(
@@ -86,14 +92,15 @@ class AgentEventPublisher:
         # Cache the run locally
         self.local_cache[run["id"]] = run
 
+        run_id: str = run["id"]
         logger.info(
             "Started agent run",
-            run_id=run["id"],
+            run_id=run_id,
             agent=agent_name,
             task_id=task_id,
         )
 
-        return run["id"]
+        return run_id
 
     async def update_progress(
         self,
@@ -310,3 +317,118 @@ class AgentEventPublisher:
             List of active agent runs
         """
         return await self.store.get_active_agent_runs(user_id)
+
+
+class AgentRunWatcher:
+    """Streams agent run changes to backend subscribers via Supabase Realtime.
+
+    One Realtime channel per process listens to every change on agent_runs
+    and fans events out to per-subscriber queues, so watching active runs
+    costs no database queries after the initial snapshot.
+
+    With RLS on agent_runs, a DELETE's ``old_record`` carries only the
+    primary key, so the watcher remembers the owner of each run it has
+    routed to a subscriber and looks deletes up by id.
+    """
+
+    def __init__(self) -> None:
+        self.store = SupabaseStateStore()
+        self._channel: AsyncRealtimeChannel | None = None
+        self._start_lock = asyncio.Lock()
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = {}
+        self._run_owners: dict[str, str] = {}
+
+    async def _ensure_started(self) -> None:
+        """Subscribe to agent_runs changes on first use."""
+        async with self._start_lock:
+            if self._channel is not None:
+                return
+            client = await get_async_client()
+            channel = client.channel("agent_runs_changes").on_postgres_changes(
+                RealtimePostgresChangesListenEvent.All,
+                schema="public",
+                table="agent_runs",
+                callback=self._dispatch,
+            )
+            await channel.subscribe()
+            self._channel = channel
+            logger.info("Subscribed to agent run changes")
+
+    def _dispatch(self, payload: PostgresChangesPayload) -> None:
+        """Forward a Realtime change to the owning user's subscribers."""
+        data = payload["data"]
+        event_type = str(data["type"])
+        run = data.get("record") or data.get("old_record") or {}
+        run_id: str | None = run.get("id")
+
+        user_id: str | None = run.get("user_id")
+        if event_type == "DELETE" and run_id:
+            user_id = self._run_owners.pop(run_id, user_id)
+        if not user_id or not self._subscribers.get(user_id):
+            return
+        queues = self._subscribers[user_id]
+        if event_type != "DELETE" and run_id:
+            self._run_owners[run_id] = user_id
+
+        event = {
+            "type": event_type,
+            "run": run,
+            "active": event_type != "DELETE" and run.get("status") in ACTIVE_RUN_STATUSES,
+        }
+        for queue in queues:
+            queue.put_nowait(event)
+
+    async def watch_active_runs(self, user_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield a snapshot of a user's active runs, then each change.
+
+        The first event is ``{"type": "snapshot", "runs": [...]}``. Later
+        events carry the change type, the run row, and whether the run is
+        still active.
+
+        Args:
+            user_id: ID of the user
+
+        Yields:
+            Snapshot and change events
+        """
+        await self._ensure_started()
+
+        # Register before the snapshot so no change slips in between
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            runs = await self.store.get_active_agent_runs(user_id)
+            for run in runs:
+                self._run_owners[run["id"]] = user_id
+            yield {"type": "snapshot", "runs": runs}
+            while True:
+                yield await queue.get()
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+                    self._run_owners = {
+                        run_id: owner
+                        for run_id, owner in self._run_owners.items()
+                        if owner != user_id
+                    }
+
+    async def aclose(self) -> None:
+        """Unsubscribe from agent_runs changes."""
+        if self._channel is not None:
+            await self._channel.unsubscribe()
+            self._channel = None
+
+
+_watcher: AgentRunWatcher | None = None
+
+
+def get_agent_run_watcher() -> AgentRunWatcher:
+    """Get the process-wide agent run watcher."""
+    global _watcher
+
+    if _watcher is None:
+        _watcher = AgentRunWatcher()
+    return _watcher
@@ -1,45 +1,69 @@
 """State management for conversations and tasks."""
 
+from collections import defaultdict
+from datetime import UTC, datetime
 from typing import Any
-from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
-from src.utils import get_logger
+from src.utils import get_logger, iso_now
 
 logger = get_logger(__name__)
 
 
+def _now() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(UTC)
+
+
 class ConversationState(BaseModel):
-    """State for a conversation."""
+    """State for a conversation.
+
+    Messages are appended in place by StateManager; assignments are not
+    re-validated.
+    """
+
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
 
     id: str
     user_id: str | None = None
-    messages: list[dict[str, Any]] = []
-    context: dict[str, Any] = {}
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    messages: list[dict[str, Any]] = Field(default_factory=list)
+    context: dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=_now)
+    updated_at: datetime = Field(default_factory=_now)
 
 
 class TaskState(BaseModel):
     """State for a task."""
 
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     id: str
     conversation_id: str | None = None
     description: str
     status: str = "pending"
     result: Any = None
     error: str | None = None
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=_now)
+    updated_at: datetime = Field(default_factory=_now)
 
 
 class StateManager:
-    """Manages conversation and task state."""
+    """Manages conversation and task state.
+
+    Conversations keep their full history in memory unless ``max_messages``
+    is set. With a cap, only the most recent messages are kept and nothing
+    backfills older ones, so only set it where those live elsewhere (see
+    ``SupabaseStateStore.append_conversation_messages``).
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, max_messages: int | None = None) -> None:
+        self.max_messages = max_messages
         self._conversations: dict[str, ConversationState] = {}
         self._tasks: dict[str, TaskState] = {}
+        # conversation_id -> task ids, kept in creation order, so lookups
+        # don't scan every task
+        self._conversation_tasks: defaultdict[str | None, dict[str, None]] = defaultdict(dict)
 
     def get_conversation(self, conversation_id: str) -> ConversationState | None:
         """Get a conversation by ID."""
@@ -73,12 +97,18 @@ class StateManager:
         conversation.messages.append({
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
         })
-        conversation.updated_at = datetime.now()
+        if self.max_messages is not None:
+            # Keep only the most recent messages in memory
+            del conversation.messages[:-self.max_messages]
+        conversation.updated_at = _now()
 
     def get_messages(self, conversation_id: str) -> list[dict[str, Any]]:
-        """Get all messages for a conversation."""
+        """Get the in-memory messages for a conversation.
+
+        This is the full history unless ``max_messages`` caps it.
+        """
         conversation = self._conversations.get(conversation_id)
         if conversation:
             return conversation.messages
@@ -93,7 +123,7 @@ class StateManager:
         conversation = self._conversations.get(conversation_id)
         if conversation:
             conversation.context.update(context)
-            conversation.updated_at = datetime.now()
+            conversation.updated_at = _now()
 
     def get_task(self, task_id: str) -> TaskState | None:
         """Get a task by ID."""
@@ -111,7 +141,11 @@ class StateManager:
             description=description,
             conversation_id=conversation_id,
         )
+        previous = self._tasks.get(task_id)
+        if previous is not None:
+            self._conversation_tasks[previous.conversation_id].pop(task_id, None)
         self._tasks[task_id] = task
+        self._conversation_tasks[conversation_id][task_id] = None
         logger.info("Created task", id=task_id)
         return task
 
@@ -128,12 +162,10 @@ class StateManager:
             task.status = status
             task.result = result
             task.error = error
-            task.updated_at = datetime.now()
+            task.updated_at = _now()
             logger.info("Updated task", id=task_id, status=status)
 
     def get_conversation_tasks(self, conversation_id: str) -> list[TaskState]:
         """Get all tasks for a conversation."""
-        return [
-            task for task in self._tasks.values()
-            if task.conversation_id == conversation_id
-        ]
+        task_ids = self._conversation_tasks.get(conversation_id, ())
+        return [self._tasks[task_id] for task_id in task_ids]
@@ -0,0 +1,144 @@
+"""Shared, process-wide Supabase clients.
+
+Creating a Supabase client per request also creates a fresh HTTP connection
+pool, so every query pays TCP and TLS setup. The clients here are created
+once per process and reused over HTTP/2 keep-alive connections.
+
+The async client serves conversation queries, agent_runs reads and buffered
+writes without blocking the event loop. The sync client backs the remaining
+SupabaseStateStore methods and AgentMetrics. Each client has its own
+connection pool with the configured limits.
+"""
+
+import httpx
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    acreate_client,
+    create_client,
+)
+
+from src.config import get_settings
+from src.utils import get_logger
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+_async_client: AsyncClient | None = None
+_async_http: httpx.AsyncClient | None = None
+_sync_client: Client | None = None
+_sync_http: httpx.Client | None = None
+
+
+def _require_credentials() -> None:
+    """Raise ValueError if Supabase credentials are not configured."""
+    if not settings.supabase_url or not settings.supabase_service_role_key:
+        raise ValueError("Supabase credentials not configured")
+
+
+def _pool_limits() -> httpx.Limits:
+    """Connection limits for the shared Supabase HTTP pool.
+
+    Keeping the pool small bounds concurrent PostgREST requests, which in turn
+    keeps bursts from exhausting the pooled Postgres connections behind it.
+    """
+    return httpx.Limits(
+        max_connections=settings.supabase_pool_max_connections,
+        max_keepalive_connections=settings.supabase_pool_max_keepalive,
+        keepalive_expiry=settings.supabase_pool_keepalive_expiry,
+    )
+
+
+def _pool_timeout() -> httpx.Timeout:
+    """Request timeouts, including how long to wait for a free connection."""
+    return httpx.Timeout(
+        settings.supabase_pool_timeout,
+        pool=settings.supabase_pool_timeout,
+    )
+
+
+async def get_async_client() -> AsyncClient:
+    """Get the shared async Supabase client, creating it on first use.
+
+    Returns:
+        The process-wide AsyncClient
+
+    Raises:
+        ValueError: If Supabase credentials are not configured
+    """
+    global _async_client, _async_http
+
+    if _async_client is None:
+        _require_credentials()
+
+        http_client = httpx.AsyncClient(
+            http2=True, limits=_pool_limits(), timeout=_pool_timeout()
+        )
+        client = await acreate_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(httpx_client=http_client),
+        )
+        # Another task may have finished creating the client while we awaited
+        if _async_client is None:
+            _async_client = client
+            _async_http = http_client
+            logger.info(
+                "Created shared async Supabase client",
+                max_connections=settings.supabase_pool_max_connections,
+            )
+        else:
+            await http_client.aclose()
+
+    return _async_client
+
+
+def get_sync_client() -> Client:
+    """Get the shared sync Supabase client, creating it on first use.
+
+    Returns:
+        The process-wide Client
+
+    Raises:
+        ValueError: If Supabase credentials are not configured
+    """
+    global _sync_client, _sync_http
+
+    if _sync_client is None:
+        _require_credentials()
+
+        _sync_http = httpx.Client(http2=True, limits=_pool_limits(), timeout=_pool_timeout())
+        _sync_client = create_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=ClientOptions(httpx_client=_sync_http),
+        )
+        logger.info(
+            "Created shared sync Supabase client",
+            max_connections=settings.supabase_pool_max_connections,
+        )
+
+    return _sync_client
+
+
+async def aclose() -> None:
+    """Close the shared clients' connection pools at process shutdown."""
+    global _async_client, _async_http, _sync_client, _sync_http
+
+    if _async_http is not None:
+        await _async_http.aclose()
+    if _sync_http is not None:
+        _sync_http.close()
+    _async_client = _async_http = _sync_client = _sync_http = None
+
+
+async def check_database() -> None:
+    """Run a minimal query to verify the pool can reach the database.
+
+    Raises:
+        Exception: If the database is unreachable or credentials are invalid
+    """
+    client = await get_async_client()
+    await client.table("conversations").select("id").limit(1).execute()
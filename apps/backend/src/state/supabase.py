@@ -1,16 +1,61 @@
 """Supabase state persistence."""
 
+import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from datetime import datetime
+from uuid import uuid4
 
-from supabase import create_client, Client
+from supabase import Client
 
-from src.config import get_settings
-from src.utils import get_logger
+from src.utils import get_logger, iso_now
+
+from .buffer import get_write_buffer
+from .cache import TTLCache
+from .pool import get_async_client, get_sync_client
 
-settings = get_settings()
 logger = get_logger(__name__)
 
+# Agent run statuses that count as in progress. Must match the predicate of
+# the idx_agent_runs_active_user_started_at partial index.
+ACTIVE_RUN_STATUSES = [
+    "pending",
+    "in_progress",
+    "awaiting_verification",
+    "verification_in_progress",
+]
+
+# Statuses that end a run and stamp completed_at
+TERMINAL_RUN_STATUSES = frozenset({"completed", "failed", "escalated_to_human"})
+
+# Process-wide read caches keyed by (table, id). Stores are created per
+# request, so the caches live at module level to be shared between them.
+# Rows go in and come out as copies, so callers may mutate what they get.
+_read_cache = TTLCache(maxsize=4096, ttl=5.0)
+# Run status changes quickly, so active-run lists are only reused briefly
+_active_runs_cache = TTLCache(maxsize=1024, ttl=1.0)
+
+# Runs blocking sync-client requests off the event loop
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="supabase")
+
+# Conversation columns without the (potentially large) messages array
+CONVERSATION_META_COLUMNS = ("id", "user_id", "context", "created_at", "updated_at")
+
+
+def _cached_row(key: tuple[str, str], columns: Sequence[str] | None) -> dict[str, Any] | None:
+    """Get a cached full row, projected to ``columns`` if given."""
+    row = _read_cache.get(key)
+    if row is None:
+        return None
+    if not columns:
+        return dict(row)
+    return {column: row.get(column) for column in columns}
+
+
+def _cache_row(key: tuple[str, str], row: dict[str, Any]) -> None:
+    """Cache a copy of a full row, so later edits to ``row`` don't leak in."""
+    _read_cache.set(key, dict(row))
+
 
 class SupabaseStateStore:
     """Persistent state storage using Supabase."""
@@ -20,17 +65,26 @@ class SupabaseStateStore:
 
     @property
     def client(self) -> Client:
-        """Lazy-initialize Supabase client."""
+        """Lazy-initialize Supabase client (shared by all stores)."""
         if self._client is None:
-            if not settings.supabase_url or not settings.supabase_service_role_key:
-                raise ValueError("Supabase credentials not configured")
-
-            self._client = create_client(
-                settings.supabase_url,
-                settings.supabase_service_role_key,
-            )
+            self._client = get_sync_client()
         return self._client
 
+    async def _exec(self, query: Any) -> Any:
+        """Execute a sync-client query on the thread pool.
+
+        The sync client blocks for the whole HTTP round-trip, so running it
+        on the event loop would stall every other coroutine.
+
+        Args:
+            query: A query or RPC builder, without ``.execute()``
+
+        Returns:
+            The query response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, query.execute)
+
     async def save_conversation(
         self,
         conversation_id: str,
@@ -38,15 +92,22 @@ class SupabaseStateStore:
         messages: list[dict[str, Any]],
         context: dict[str, Any] | None = None,
     ) -> None:
-        """Save conversation to Supabase."""
+        """Save conversation to Supabase.
+
+        Concurrent saves are coalesced into one bulk upsert by the shared
+        write buffer.
+        """
+        _read_cache.pop(("conversations", conversation_id))
         try:
-            self.client.table("conversations").upsert({
+            await get_write_buffer().enqueue("conversations", {
                 "id": conversation_id,
                 "user_id": user_id,
                 "messages": messages,
                 "context": context or {},
-                "updated_at": datetime.now().isoformat(),
-            }).execute()
+                "updated_at": iso_now(),
+            })
+            # Drop any copy a concurrent read cached while the write was queued
+            _read_cache.pop(("conversations", conversation_id))
 
             logger.info("Saved conversation", id=conversation_id)
 
@@ -54,22 +115,82 @@ class SupabaseStateStore:
             logger.error("Failed to save conversation", error=str(e))
             raise
 
+    async def append_conversation_messages(
+        self,
+        conversation_id: str,
+        messages: list[dict[str, Any]],
+    ) -> None:
+        """Append new messages to a saved conversation.
+
+        Sends only the new messages; the database appends them to the stored
+        array in place, so the payload does not grow with the history.
+
+        Args:
+            conversation_id: ID of an existing conversation
+            messages: Messages to append, oldest first
+        """
+        if not messages:
+            return
+
+        _read_cache.pop(("conversations", conversation_id))
+        try:
+            client = await get_async_client()
+            await client.rpc("append_conversation_messages", {
+                "p_conversation_id": conversation_id,
+                "p_messages": messages,
+            }).execute()
+            _read_cache.pop(("conversations", conversation_id))
+
+            logger.info("Appended conversation messages", id=conversation_id, count=len(messages))
+
+        except Exception as e:
+            logger.error("Failed to append conversation messages", error=str(e))
+            raise
+
     async def load_conversation(
         self,
         conversation_id: str,
+        columns: Sequence[str] | None = None,
     ) -> dict[str, Any] | None:
-        """Load conversation from Supabase."""
+        """Load conversation from Supabase.
+
+        Args:
+            conversation_id: ID of the conversation
+            columns: Columns to fetch (default: all). Only full rows are
+                cached; projections are served from a cached full row when
+                one is available.
+
+        Returns:
+            Conversation row or None if not found
+        """
+        key = ("conversations", conversation_id)
+        cached = _cached_row(key, columns)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.client.table("conversations").select("*").eq(
-                "id", conversation_id
-            ).single().execute()
+            client = await get_async_client()
+            result = await client.table("conversations").select(
+                ",".join(columns) if columns else "*"
+            ).eq("id", conversation_id).single().execute()
 
+            if result.data and not columns:
+                _cache_row(key, result.data)
             return result.data
 
         except Exception as e:
             logger.error("Failed to load conversation", error=str(e))
             return None
 
+    async def load_conversation_meta(self, conversation_id: str) -> dict[str, Any] | None:
+        """Load a conversation without its messages."""
+        return await self.load_conversation(conversation_id, CONVERSATION_META_COLUMNS)
+
+    async def load_conversation_messages(self, conversation_id: str) -> list[dict[str, Any]]:
+        """Load only a conversation's messages."""
+        row = await self.load_conversation(conversation_id, ("id", "messages"))
+        return (row or {}).get("messages") or []
+
     async def save_task(
         self,
         task_id: str,
@@ -79,17 +200,23 @@ class SupabaseStateStore:
         result: Any = None,
         error: str | None = None,
     ) -> None:
-        """Save task to Supabase."""
+        """Save task to Supabase.
+
+        Concurrent saves are coalesced into one bulk upsert by the shared
+        write buffer.
+        """
+        _read_cache.pop(("tasks", task_id))
         try:
-            self.client.table("tasks").upsert({
+            await get_write_buffer().enqueue("tasks", {
                 "id": task_id,
                 "conversation_id": conversation_id,
                 "description": description,
                 "status": status,
                 "result": result,
                 "error": error,
-                "updated_at": datetime.now().isoformat(),
-            }).execute()
+                "updated_at": iso_now(),
+            })
+            _read_cache.pop(("tasks", task_id))
 
             logger.info("Saved task", id=task_id, status=status)
 
@@ -97,13 +224,32 @@ class SupabaseStateStore:
             logger.error("Failed to save task", error=str(e))
             raise
 
-    async def load_task(self, task_id: str) -> dict[str, Any] | None:
-        """Load task from Supabase."""
+    async def load_task(
+        self,
+        task_id: str,
+        columns: Sequence[str] | None = None,
+    ) -> dict[str, Any] | None:
+        """Load task from Supabase.
+
+        Args:
+            task_id: ID of the task
+            columns: Columns to fetch (default: all)
+
+        Returns:
+            Task row or None if not found
+        """
+        key = ("tasks", task_id)
+        cached = _cached_row(key, columns)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.client.table("tasks").select("*").eq(
-                "id", task_id
-            ).single().execute()
+            result = await self._exec(self.client.table("tasks").select(
+                ",".join(columns) if columns else "*"
+            ).eq("id", task_id).single())
 
+            if result.data and not columns:
+                _cache_row(key, result.data)
             return result.data
 
         except Exception as e:
@@ -117,7 +263,8 @@ class SupabaseStateStore:
     ) -> list[dict[str, Any]]:
         """Get all conversations for a user."""
         try:
-            result = self.client.table("conversations").select("*").eq(
+            client = await get_async_client()
+            result = await client.table("conversations").select("*").eq(
                 "user_id", user_id
             ).order("updated_at", desc=True).limit(limit).execute()
 
@@ -133,9 +280,9 @@ class SupabaseStateStore:
     ) -> list[dict[str, Any]]:
         """Get all tasks for a conversation."""
         try:
-            result = self.client.table("tasks").select("*").eq(
+            result = await self._exec(self.client.table("tasks").select("*").eq(
                 "conversation_id", conversation_id
-            ).order("created_at", desc=True).execute()
+            ).order("created_at", desc=True))
 
             return result.data
 
@@ -158,6 +305,9 @@ class SupabaseStateStore:
         """Create a new agent run.
 
         This will trigger a Realtime event that frontend can subscribe to.
+        The run ID is generated client-side and the insert is batched with
+        other concurrent run creations on the write buffer, so the row is
+        built locally instead of being read back from the database.
 
         Args:
             task_id: ID of the task being executed
@@ -167,32 +317,48 @@ class SupabaseStateStore:
             metadata: Additional metadata
 
         Returns:
-            Created agent run record
+            Created agent run record. It holds only the columns sent in the
+            insert, with ``started_at`` and ``updated_at`` from this host's
+            clock; columns left to the database (e.g. ``agent_type``) are
+            missing. ``get_agent_run`` serves this same row from the read
+            cache until it expires.
         """
-        try:
-            result = self.client.table("agent_runs").insert({
-                "task_id": task_id,
-                "user_id": user_id,
-                "agent_name": agent_name,
-                "agent_id": agent_id,
-                "status": "pending",
-                "metadata": metadata or {},
-            }).execute()
-
-            run = result.data[0] if result.data else None
-            if run:
-                logger.info(
-                    "Created agent run",
-                    run_id=run["id"],
-                    agent=agent_name,
-                    task_id=task_id,
-                )
-            return run
+        now = iso_now()
+        run: dict[str, Any] = {
+            "id": str(uuid4()),
+            "task_id": task_id,
+            "user_id": user_id,
+            "agent_name": agent_name,
+            "agent_id": agent_id,
+            "status": "pending",
+            "current_step": None,
+            "progress_percent": 0.0,
+            "result": None,
+            "error": None,
+            "metadata": metadata or {},
+            "verification_attempts": 0,
+            "verification_evidence": [],
+            "started_at": now,
+            "completed_at": None,
+            "updated_at": now,
+        }
 
+        try:
+            await get_write_buffer().enqueue("agent_runs", run)
         except Exception as e:
             logger.error("Failed to create agent run", error=str(e))
             raise
 
+        _active_runs_cache.pop(user_id)
+        _cache_row(("agent_runs", run["id"]), run)
+        logger.info(
+            "Created agent run",
+            run_id=run["id"],
+            agent=agent_name,
+            task_id=task_id,
+        )
+        return run
+
     async def update_agent_run(
         self,
         run_id: str,
@@ -223,6 +389,7 @@ class SupabaseStateStore:
         Returns:
             Updated agent run record
         """
+        _read_cache.pop(("agent_runs", run_id))
         try:
             update_data: dict[str, Any] = {}
 
@@ -230,8 +397,8 @@ class SupabaseStateStore:
                 update_data["status"] = status
 
                 # Auto-set completed_at when reaching terminal states
-                if status in ["completed", "failed", "escalated_to_human"]:
-                    update_data["completed_at"] = datetime.now().isoformat()
+                if status in TERMINAL_RUN_STATUSES:
+                    update_data["completed_at"] = iso_now()
 
             if current_step is not None:
                 update_data["current_step"] = current_step
@@ -252,30 +419,30 @@ class SupabaseStateStore:
                 update_data["verification_evidence"] = verification_evidence
 
             if metadata is not None:
-                # Fetch current metadata and merge
-                current = self.client.table("agent_runs").select("metadata").eq(
-                    "id", run_id
-                ).single().execute()
-
-                current_metadata = current.data.get("metadata", {}) if current.data else {}
-                update_data["metadata"] = {**current_metadata, **metadata}
-
-            if update_data:
-                result = self.client.table("agent_runs").update(update_data).eq(
-                    "id", run_id
-                ).execute()
-
-                run = result.data[0] if result.data else None
-                if run:
-                    logger.info(
-                        "Updated agent run",
-                        run_id=run_id,
-                        status=status,
-                        step=current_step,
-                    )
-                return run
+                # Merge metadata server-side in the same statement as the update
+                result = await self._exec(self.client.rpc("update_agent_run", {
+                    "p_run_id": run_id,
+                    "p_updates": update_data,
+                    "p_metadata": metadata,
+                }))
+            elif update_data:
+                result = await self._exec(
+                    self.client.table("agent_runs").update(update_data).eq("id", run_id)
+                )
+            else:
+                return None
 
-            return None
+            run = result.data[0] if result.data else None
+            if run:
+                _cache_row(("agent_runs", run_id), run)
+                _active_runs_cache.pop(run.get("user_id"))
+                logger.info(
+                    "Updated agent run",
+                    run_id=run_id,
+                    status=status,
+                    step=current_step,
+                )
+            return run
 
         except Exception as e:
             logger.error("Failed to update agent run", run_id=run_id, error=str(e))
@@ -283,11 +450,19 @@ class SupabaseStateStore:
 
     async def get_agent_run(self, run_id: str) -> dict[str, Any] | None:
         """Get agent run by ID."""
+        key = ("agent_runs", run_id)
+        cached = _cached_row(key, None)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.client.table("agent_runs").select("*").eq(
+            client = await get_async_client()
+            result = await client.table("agent_runs").select("*").eq(
                 "id", run_id
             ).single().execute()
 
+            if result.data:
+                _cache_row(key, result.data)
             return result.data
 
         except Exception as e:
@@ -301,7 +476,8 @@ class SupabaseStateStore:
     ) -> list[dict[str, Any]]:
         """Get all agent runs for a task."""
         try:
-            result = self.client.table("agent_runs").select("*").eq(
+            client = await get_async_client()
+            result = await client.table("agent_runs").select("*").eq(
                 "task_id", task_id
             ).order("started_at", desc=True).limit(limit).execute()
 
@@ -316,14 +492,19 @@ class SupabaseStateStore:
         user_id: str,
     ) -> list[dict[str, Any]]:
         """Get all active (in-progress) agent runs for a user."""
+        cached = _active_runs_cache.get(user_id)
+        if cached is not None:
+            return [dict(run) for run in cached]
+
         try:
-            result = self.client.table("agent_runs").select("*").eq(
+            client = await get_async_client()
+            result = await client.table("agent_runs").select("*").eq(
                 "user_id", user_id
             ).in_(
-                "status",
-                ["pending", "in_progress", "awaiting_verification", "verification_in_progress"]
+                "status", ACTIVE_RUN_STATUSES
             ).order("started_at", desc=True).execute()
 
+            _active_runs_cache.set(user_id, [dict(run) for run in result.data])
             return result.data
 
         except Exception as e:
@@ -361,7 +542,7 @@ class SupabaseStateStore:
             Created memory entry
         """
         try:
-            result = self.client.table("domain_memories").insert({
+            result = await self._exec(self.client.table("domain_memories").insert({
                 "domain": domain,
                 "category": category,
                 "key": key,
@@ -370,7 +551,7 @@ class SupabaseStateStore:
                 "embedding": embedding,
                 "source": source,
                 "tags": tags or [],
-            }).execute()
+            }))
 
             memory = result.data[0] if result.data else None
             if memory:
@@ -390,9 +571,9 @@ class SupabaseStateStore:
     async def get_memory(self, memory_id: str) -> dict[str, Any] | None:
         """Get a memory entry by ID."""
         try:
-            result = self.client.table("domain_memories").select("*").eq(
+            result = await self._exec(self.client.table("domain_memories").select("*").eq(
                 "id", memory_id
-            ).single().execute()
+            ).single())
 
             return result.data
 
@@ -415,9 +596,9 @@ class SupabaseStateStore:
             Updated memory entry
         """
         try:
-            result = self.client.table("domain_memories").update(updates).eq(
+            result = await self._exec(self.client.table("domain_memories").update(updates).eq(
                 "id", memory_id
-            ).execute()
+            ))
 
             memory = result.data[0] if result.data else None
             if memory:
@@ -438,9 +619,9 @@ class SupabaseStateStore:
             True if deleted, False if not found
         """
         try:
-            result = self.client.table("domain_memories").delete().eq(
+            result = await self._exec(self.client.table("domain_memories").delete().eq(
                 "id", memory_id
-            ).execute()
+            ))
 
             success = bool(result.data)
             if success:
@@ -488,7 +669,7 @@ class SupabaseStateStore:
 
             query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
 
-            result = query.execute()
+            result = await self._exec(query)
             return result.data
 
         except Exception as e:
@@ -518,7 +699,7 @@ class SupabaseStateStore:
         try:
             import json
 
-            result = self.client.rpc(
+            result = await self._exec(self.client.rpc(
                 "find_similar_memories",
                 {
                     "query_embedding": json.dumps(query_embedding),
@@ -527,7 +708,7 @@ class SupabaseStateStore:
                     "filter_domain": domain,
                     "filter_user_id": user_id,
                 },
-            ).execute()
+            ))
 
             return result.data or []
 
@@ -3,6 +3,8 @@
 from decimal import Decimal
 from typing import Any
 
+from postgrest.types import ReturnMethod
+
 from src.state.supabase import SupabaseStateStore
 from src.utils import get_logger
 
@@ -77,7 +79,9 @@ class UsageTracker:
                 "metadata": metadata or {},
             }
 
-            self.supabase.client.table("api_usage").insert(data).execute()
+            self.supabase.client.table("api_usage").insert(
+                data, returning=ReturnMethod.minimal
+            ).execute()
 
             logger.debug(
                 "API usage tracked",
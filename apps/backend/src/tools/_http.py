@@ -0,0 +1,126 @@
+"""Shared HTTP client for tool integrations.
+
+Opening an ``httpx.AsyncClient`` per call pays a TCP and TLS handshake on
+every request. Tools instead share one process-wide client whose HTTP/2
+keep-alive connections are reused across calls, and go through ``request``
+to retry rate-limited and transient server errors with backoff. HTTP/2
+needs the ``h2`` package, which the ``httpx[http2]`` extra installs.
+"""
+
+import asyncio
+from typing import Any
+
+import httpx
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+MAX_RETRY_DELAY = 30.0
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client, creating it on first use.
+
+    Returns:
+        The process-wide AsyncClient
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared client's connection pool at process shutdown."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def _retry_delay(response: httpx.Response | None, attempt: int, backoff: float) -> float:
+    """Seconds to wait before the next attempt, honouring Retry-After if sent."""
+    if response is not None:
+        retry_after: str = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+    return min(backoff * 2.0**attempt, MAX_RETRY_DELAY)
+
+
+def _should_retry(error: httpx.TransportError, idempotent: bool) -> bool:
+    """Whether a failed attempt may be resent without risking a duplicate."""
+    # A connect failure means the request never reached the server
+    return idempotent or isinstance(error, httpx.ConnectError | httpx.ConnectTimeout)
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    retries: int = 3,
+    backoff: float = 0.5,
+    idempotent: bool | None = None,
+    client: httpx.AsyncClient | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request, retrying on 429, 5xx and transport errors.
+
+    Requests that aren't idempotent are only retried when they failed to
+    connect, since any other failure may have reached the server.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        retries: Extra attempts after the first one fails
+        backoff: Base delay in seconds, doubled on each retry
+        idempotent: Whether resending is safe; defaults by method, so pass
+            True for a POST that only reads
+        client: Client to send with (the shared one if omitted)
+        **kwargs: Passed through to ``httpx.AsyncClient.request``
+
+    Returns:
+        The final response; its status is not checked
+
+    Raises:
+        httpx.TransportError: If the last attempt failed to connect or read,
+            or a non-idempotent request failed after connecting
+    """
+    client = client or get_client()
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    for attempt in range(retries):
+        response: httpx.Response | None = None
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if not _should_retry(e, idempotent):
+                raise
+            reason = str(e)
+        else:
+            if not idempotent or response.status_code not in RETRY_STATUSES:
+                return response
+            reason = str(response.status_code)
+
+        delay = _retry_delay(response, attempt, backoff)
+        logger.warning(
+            "Retrying HTTP request",
+            url=url,
+            attempt=attempt + 1,
+            reason=reason,
+            delay=delay,
+        )
+        await asyncio.sleep(delay)
+
+    return await client.request(method, url, **kwargs)
@@ -11,13 +11,15 @@ class PlaywrightTool:
     """Browser automation using Playwright MCP.
 
     This is a placeholder that interfaces with the Playwright MCP server.
-    Actual browser operations are handled by the MCP server.
+    Actual browser operations are handled by the MCP server. Until that
+    bridge exists every method returns immediately, so they are plain
+    synchronous stubs rather than coroutines.
     """
 
     def __init__(self) -> None:
         self._initialized = False
 
-    async def initialize(self) -> bool:
+    def initialize(self) -> bool:
         """Initialize the Playwright browser.
 
         Returns:
@@ -28,7 +30,7 @@ class PlaywrightTool:
         self._initialized = True
         return True
 
-    async def navigate(self, url: str) -> dict[str, Any]:
+    def navigate(self, url: str) -> dict[str, Any]:
         """Navigate to a URL.
 
         Args:
@@ -43,7 +45,7 @@ class PlaywrightTool:
             "status": "navigated",
         }
 
-    async def screenshot(self, path: str | None = None) -> bytes | None:
+    def screenshot(self, path: str | None = None) -> bytes | None:
         """Take a screenshot of the current page.
 
         Args:
@@ -55,7 +57,7 @@ class PlaywrightTool:
         logger.info("Taking screenshot", path=path)
         return None
 
-    async def click(self, selector: str) -> bool:
+    def click(self, selector: str) -> bool:
         """Click an element.
 
         Args:
@@ -67,7 +69,7 @@ class PlaywrightTool:
         logger.info("Clicking element", selector=selector)
         return True
 
-    async def type_text(self, selector: str, text: str) -> bool:
+    def type_text(self, selector: str, text: str) -> bool:
         """Type text into an input.
 
         Args:
@@ -80,7 +82,7 @@ class PlaywrightTool:
         logger.info("Typing text", selector=selector)
         return True
 
-    async def get_text(self, selector: str) -> str:
+    def get_text(self, selector: str) -> str:
         """Get text content of an element.
 
         Args:
@@ -92,7 +94,7 @@ class PlaywrightTool:
         logger.info("Getting text", selector=selector)
         return ""
 
-    async def evaluate(self, script: str) -> Any:
+    def evaluate(self, script: str) -> Any:
         """Evaluate JavaScript in the page.
 
         Args:
@@ -104,7 +106,7 @@ class PlaywrightTool:
         logger.info("Evaluating script")
         return None
 
-    async def close(self) -> None:
+    def close(self) -> None:
         """Close the browser."""
         logger.info("Closing browser")
         self._initialized = False
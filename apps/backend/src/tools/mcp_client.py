@@ -1,22 +1,39 @@
 """MCP Client - Client for interacting with MCP servers.
 
 Handles:
-- Connecting to MCP servers via stdio
+- Connecting to MCP servers via stdio or streamable HTTP
 - Listing tools and resources
 - Calling tools
 - Reading resources
+- Spilling large results to an on-disk content store
+
+Each server is spawned once and its session is kept open until it is
+disconnected, so tool calls reuse the same stdio streams instead of paying
+for a process spawn and MCP handshake every time. Sessions come from the
+process-wide McpInstancePool, so clients with identical server configs
+share one process. Requires the MCP Python SDK (``mcp``), which is
+imported when the first server is connected.
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic, perf_counter
 from typing import Any
-
-from pydantic import BaseModel
+from urllib.parse import unquote, urlparse
 
 from src.utils import get_logger
 
+from .mcp_pool import McpInstancePool, compute_mcp_config_hash, get_mcp_pool
+
 logger = get_logger(__name__)
 
 
-class MCPServerConnection(BaseModel):
+@dataclass(slots=True)
+class MCPServerConnection:
     """Active connection to an MCP server."""
 
     server_name: str
@@ -25,13 +42,59 @@ class MCPServerConnection(BaseModel):
     connected: bool = False
     error: str | None = None
 
+    # Pool key and pooled instance for the open session
+    config_hash: str | None = field(default=None, repr=False)
+    instance: Any = field(default=None, repr=False)
+
+    @property
+    def session(self) -> Any:
+        """Current client session; follows respawns of the pooled server."""
+        return self.instance.session if self.instance is not None else None
+
+
+def _write_once(path: Path, data: bytes) -> None:
+    """Write a content-addressed file unless it already exists."""
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
 
 class MCPClient:
-    """Client for interacting with MCP servers via stdio."""
+    """Client for interacting with MCP servers via stdio or streamable HTTP."""
 
-    def __init__(self) -> None:
-        """Initialize MCP client."""
+    def __init__(
+        self,
+        pool: McpInstancePool | None = None,
+        cache: bool = True,
+        cache_ttl_seconds: float = 300,
+        content_store: str | Path | None = None,
+        spill_threshold_bytes: int = 32 * 1024
+    ) -> None:
+        """Initialize MCP client.
+
+        Args:
+            pool: Instance pool to share server sessions through
+            cache: Whether to cache tool listings per server
+            cache_ttl_seconds: How long a cached tool listing stays valid
+            content_store: Directory that large tool results and resources
+                are written to; they are returned as handles instead of
+                inline content. None keeps everything inline.
+            spill_threshold_bytes: Serialized size above which content is
+                written to the content store
+        """
+        self._pool = pool or get_mcp_pool()
+        self._content_store = Path(content_store) if content_store is not None else None
+        self.spill_threshold_bytes = spill_threshold_bytes
         self._connections: dict[str, MCPServerConnection] = {}
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # server_name -> (fetched_at, tools); tool metadata is static between restarts
+        self._tools_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        # (server, tool, serialized args) -> result of the call in flight
+        self._inflight: dict[tuple[str, str, str], asyncio.Future[dict[str, Any]]] = {}
 
     async def connect_to_server(
         self,
@@ -41,21 +104,22 @@ class MCPClient:
 
         Args:
             server_config: Server configuration with command, args, env
+                (stdio) or url, headers (streamable HTTP), and optionally
+                ``no_share`` to get a private server process and
+                ``max_concurrent`` to limit in-flight requests to it
 
         Returns:
-            Connection object
-
-        Note:
-            Full implementation would use:
-            from mcp import StdioServerParameters, stdio_client
-
-            async with stdio_client(server_params) as (read, write):
-                # Interact with server
+            Connection object. An already open connection to the same
+            server is returned as-is.
         """
         server_name = server_config.get("name", "unknown")
         command = server_config.get("command", "")
         args = server_config.get("args", [])
 
+        existing = self._connections.get(server_name)
+        if existing is not None and existing.connected:
+            return existing
+
         logger.info(
             "Connecting to MCP server",
             server=server_name,
@@ -63,20 +127,21 @@ class MCPClient:
         )
 
         try:
-            # Placeholder for actual connection
-            # Would use MCP SDK:
-            # server_params = StdioServerParameters(
-            #     command=command,
-            #     args=args,
-            #     env=server_config.get("env", {})
-            # )
-            # await stdio_client(server_params)
+            config_hash = compute_mcp_config_hash(server_config)
+            if server_config.get("no_share"):
+                config_hash = f"{config_hash}:{id(self)}:{server_name}"
+
+            instance = await self._pool.acquire(
+                config_hash, server_config, (id(self), server_name)
+            )
 
             connection = MCPServerConnection(
                 server_name=server_name,
                 command=command,
                 args=args,
-                connected=True
+                connected=True,
+                config_hash=config_hash,
+                instance=instance
             )
 
             self._connections[server_name] = connection
@@ -113,10 +178,8 @@ class MCPClient:
             server_name: Name of server
 
         Returns:
-            List of tool definitions
-
-        Note:
-            Full implementation would call MCP list_tools() method
+            List of tool definitions. Listings are served from the cache
+            for ``cache_ttl_seconds`` after they were fetched.
         """
         if server_name not in self._connections:
             logger.warning(
@@ -134,23 +197,83 @@ class MCPClient:
             )
             return []
 
+        if self.cache:
+            cached = self._tools_cache.get(server_name)
+            if cached is not None and monotonic() - cached[0] < self.cache_ttl_seconds:
+                return cached[1]
+
         try:
-            # Placeholder for actual MCP protocol call
-            # Would use:
-            # tools = await client.list_tools()
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug(
+                    "Listing tools from server",
+                    server=server_name
+                )
+
+            result = await connection.session.list_tools()
+
+            tools = [
+                {
+                    "name": tool.name,
+                    "description": tool.description or "",
+                    "input_schema": tool.inputSchema,
+                    "annotations": (
+                        tool.annotations.model_dump(exclude_none=True)
+                        if tool.annotations else {}
+                    )
+                }
+                for tool in result.tools
+            ]
+
+            if self.cache:
+                self._tools_cache[server_name] = (monotonic(), tools)
+
+            return tools
 
-            logger.debug(
-                "Listing tools from server",
-                server=server_name
+        except Exception as e:
+            logger.error(
+                "Failed to list server tools",
+                server=server_name,
+                error=str(e)
             )
+            return []
+
+    async def list_server_resources(
+        self,
+        server_name: str
+    ) -> list[dict[str, Any]]:
+        """List resources available from an MCP server.
 
-            # Return empty list for now
-            # Full implementation would return actual tools
+        Args:
+            server_name: Name of server
+
+        Returns:
+            List of resource definitions
+        """
+        connection = self._connections.get(server_name)
+
+        if connection is None or not connection.connected:
+            logger.warning(
+                "Not connected to server",
+                server=server_name
+            )
             return []
 
+        try:
+            result = await connection.session.list_resources()
+
+            return [
+                {
+                    "uri": str(resource.uri),
+                    "name": resource.name,
+                    "description": resource.description or "",
+                    "mime_type": resource.mimeType
+                }
+                for resource in result.resources
+            ]
+
         except Exception as e:
             logger.error(
-                "Failed to list server tools",
+                "Failed to list server resources",
                 server=server_name,
                 error=str(e)
             )
@@ -160,7 +283,8 @@ class MCPClient:
         self,
         server_name: str,
         tool_name: str,
-        args: dict[str, Any]
+        args: dict[str, Any],
+        coalesce: bool = False
     ) -> dict[str, Any]:
         """Call a tool on an MCP server.
 
@@ -168,13 +292,53 @@ class MCPClient:
             server_name: Name of server
             tool_name: Name of tool to call
             args: Tool arguments
+            coalesce: Share the result of an identical call already in
+                flight instead of issuing another RPC. Only safe for
+                read-only or idempotent tools.
 
         Returns:
-            Tool result
-
-        Note:
-            Full implementation would use MCP call_tool() method
+            Tool result. A result larger than the spill threshold is
+            replaced by a handle, see fetch_handle. Coalesced callers
+            receive the same dict, so it must not be mutated.
         """
+        if not coalesce:
+            return await self._call_tool(server_name, tool_name, args)
+
+        try:
+            key = (server_name, tool_name, json.dumps(args, sort_keys=True))
+        except TypeError:
+            # Arguments that can't be serialized can't be compared either
+            return await self._call_tool(server_name, tool_name, args)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._call_tool(server_name, tool_name, args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved; the caller gets the error through the raise below
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        args: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Issue a tools/call RPC on a connected server."""
         if server_name not in self._connections:
             raise ValueError(f"Not connected to server: {server_name}")
 
@@ -183,24 +347,26 @@ class MCPClient:
         if not connection.connected:
             raise RuntimeError(f"Connection to {server_name} not established")
 
-        logger.info(
-            "Calling MCP tool",
-            server=server_name,
-            tool=tool_name
-        )
-
+        started = perf_counter()
         try:
-            # Placeholder for actual MCP protocol call
-            # Would use:
-            # result = await client.call_tool(tool_name, args)
-
-            logger.info(
-                "MCP tool called successfully",
-                server=server_name,
-                tool=tool_name
-            )
-
-            return {"status": "success", "result": None}
+            async with connection.instance.semaphore:
+                result = await connection.session.call_tool(tool_name, args)
+
+            # MCPIntegration logs each execution at info level already
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug(
+                    "MCP tool called successfully",
+                    server=server_name,
+                    tool=tool_name,
+                    duration_ms=round((perf_counter() - started) * 1000, 2)
+                )
+
+            return {
+                "status": "error" if result.isError else "success",
+                "result": await self._maybe_spill(
+                    [item.model_dump(mode="json") for item in result.content]
+                )
+            }
 
         except Exception as e:
             logger.error(
@@ -223,32 +389,35 @@ class MCPClient:
             uri: Resource URI
 
         Returns:
-            Resource content
-
-        Note:
-            Full implementation would use MCP read_resource() method
+            Resource content. Content larger than the spill threshold is
+            replaced by a handle, see fetch_handle.
         """
         if server_name not in self._connections:
             raise ValueError(f"Not connected to server: {server_name}")
 
-        logger.info(
-            "Reading MCP resource",
-            server=server_name,
-            uri=uri
-        )
+        connection = self._connections[server_name]
+
+        if not connection.connected:
+            raise RuntimeError(f"Connection to {server_name} not established")
 
+        started = perf_counter()
         try:
-            # Placeholder for actual MCP protocol call
-            # Would use:
-            # content = await client.read_resource(uri)
+            async with connection.instance.semaphore:
+                result = await connection.session.read_resource(uri)
 
-            logger.debug(
-                "Resource read from server",
+            logger.info(
+                "MCP resource read",
                 server=server_name,
-                uri=uri
+                uri=uri,
+                duration_ms=round((perf_counter() - started) * 1000, 2)
             )
 
-            return {"uri": uri, "content": None}
+            return {
+                "uri": uri,
+                "content": await self._maybe_spill(
+                    [item.model_dump(mode="json") for item in result.contents]
+                )
+            }
 
         except Exception as e:
             logger.error(
@@ -271,16 +440,67 @@ class MCPClient:
         Returns:
             True if disconnected, False if not connected
         """
-        if server_name not in self._connections:
+        connection = self._connections.pop(server_name, None)
+        if connection is None:
             return False
 
-        # Remove connection
-        del self._connections[server_name]
+        await self._teardown(connection)
 
         logger.info("Disconnected from MCP server", server=server_name)
 
         return True
 
+    async def _teardown(self, connection: MCPServerConnection) -> None:
+        """Release a removed connection's cache entry and pooled session."""
+        self._tools_cache.pop(connection.server_name, None)
+
+        if connection.config_hash is not None:
+            # Terminates the server process once no other client holds it
+            await self._pool.release(
+                connection.config_hash, (id(self), connection.server_name)
+            )
+
+    async def _maybe_spill(self, content: Any) -> Any:
+        """Write large content to the content store and return a handle.
+
+        Files are named by content hash, so identical payloads are stored once.
+
+        Args:
+            content: JSON-serializable tool result or resource content
+
+        Returns:
+            The content itself, or ``{"handle": uri, "size": bytes}``
+        """
+        if self._content_store is None:
+            return content
+
+        data = json.dumps(content).encode()
+        if len(data) <= self.spill_threshold_bytes:
+            return content
+
+        path = self._content_store / f"{hashlib.sha256(data).hexdigest()[:16]}.json"
+        await asyncio.to_thread(_write_once, path, data)
+
+        return {"handle": path.resolve().as_uri(), "size": len(data)}
+
+    async def fetch_handle(self, uri: str) -> Any:
+        """Load content previously replaced by a handle.
+
+        Args:
+            uri: Handle URI from a tool result or resource read
+
+        Returns:
+            The original content
+
+        Raises:
+            ValueError: If the handle does not point into the content store
+        """
+        path = Path(unquote(urlparse(uri).path)).resolve()
+        if self._content_store is None or path.parent != self._content_store.resolve():
+            raise ValueError(f"Not a content store handle: {uri}")
+
+        return json.loads(await asyncio.to_thread(path.read_bytes))
+
     async def get_connection_status(self) -> dict[str, bool]:
         """Get connection status for all servers.
 
@@ -293,10 +513,21 @@ class MCPClient:
         }
 
     async def cleanup(self) -> None:
-        """Clean up all connections."""
-        server_names = list(self._connections.keys())
+        """Clean up all connections, tearing them down concurrently."""
+        connections = list(self._connections.values())
+        self._connections.clear()
+
+        results = await asyncio.gather(
+            *(self._teardown(connection) for connection in connections),
+            return_exceptions=True
+        )
 
-        for server_name in server_names:
-            await self.disconnect_from_server(server_name)
+        for connection, result in zip(connections, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Failed to disconnect from MCP server",
+                    server=connection.server_name,
+                    error=str(result)
+                )
 
-        logger.info("MCP client cleanup complete", servers_disconnected=len(server_names))
+        logger.info("MCP client cleanup complete", servers_disconnected=len(connections))
@@ -9,36 +9,58 @@ Implements the MCP (Model Context Protocol) for tool integration:
 MCP allows agents to use a standardized ecosystem of tools from external servers.
 """
 
-from typing import Any
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
 from src.utils import get_logger
 
+from .mcp_client import MCPClient
+
 logger = get_logger(__name__)
 
+ToolCaller = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
 
 class MCPServer(BaseModel):
     """Representation of an MCP server."""
 
     name: str
-    command: str
+    command: str = ""
     args: list[str] = Field(default_factory=list)
     env: dict[str, str] = Field(default_factory=dict)
+    transport: Literal["stdio", "http"] = "stdio"
+    url: str | None = None  # Streamable HTTP endpoint for remote servers
+    headers: dict[str, str] = Field(default_factory=dict)
     enabled: bool = Field(default=True)
+    no_share: bool = Field(default=False)  # Stateful servers get a private process
+    max_concurrent: int = Field(default=8, ge=1)  # In-flight requests per server
 
 
-class MCPTool(BaseModel):
-    """Tool exposed by an MCP server."""
+@dataclass(slots=True, frozen=True)
+class MCPTool:
+    """Tool exposed by an MCP server.
+
+    Plain dataclass: its fields come from the MCP SDK's already validated
+    tool listing, so it isn't validated again on construction.
+    """
 
     name: str
     server: str  # Server providing this tool
     description: str
     input_schema: dict[str, Any]
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
 
-class MCPResource(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MCPResource:
     """Resource exposed by an MCP server."""
 
     uri: str
@@ -51,11 +73,35 @@ class MCPResource(BaseModel):
 class MCPIntegration:
     """Full MCP protocol support for tool orchestration."""
 
-    def __init__(self) -> None:
-        """Initialize MCP integration."""
+    def __init__(
+        self,
+        client: MCPClient | None = None,
+        cache: bool = True,
+        cache_ttl_seconds: float = 300
+    ) -> None:
+        """Initialize MCP integration.
+
+        Args:
+            client: MCP client holding the server sessions
+            cache: Whether to cache tool listings per server
+            cache_ttl_seconds: How long a cached tool listing stays valid
+        """
+        self._client = client or MCPClient()
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # server_name -> (fetched_at, tools)
+        self._tools_cache: dict[str, tuple[float, list[MCPTool]]] = {}
         self._servers: dict[str, MCPServer] = {}
+        # Enabled subset of _servers; kept in sync by _register_server
+        self._enabled_servers: dict[str, MCPServer] = {}
         self._tools: dict[str, MCPTool] = {}  # tool_name -> MCPTool
+        self._tool_callers: dict[str, ToolCaller] = {}  # tool_name -> specialized caller
         self._resources: dict[str, MCPResource] = {}  # uri -> MCPResource
+        # Servers whose tools have been loaded, and per-server load locks
+        self._loaded_servers: set[str] = set()
+        # Servers a load has been tried for, whether or not it succeeded
+        self._attempted_servers: set[str] = set()
+        self._load_locks: dict[str, asyncio.Lock] = {}
 
     async def discover_mcp_servers(
         self,
@@ -69,10 +115,10 @@ class MCPIntegration:
         Returns:
             List of discovered MCP servers
         """
-        import json
-        import os
-
-        if not os.path.exists(config_path):
+        try:
+            # Read the file off the event loop; json.loads accepts the raw bytes
+            data = await asyncio.to_thread(Path(config_path).read_bytes)
+        except FileNotFoundError:
             logger.warning(
                 "MCP config not found",
                 path=config_path
@@ -80,8 +126,7 @@ class MCPIntegration:
             return []
 
         try:
-            with open(config_path) as f:
-                config = json.load(f)
+            config = json.loads(data)
 
             servers = []
             mcp_servers = config.get("mcpServers", {})
@@ -92,11 +137,16 @@ class MCPIntegration:
                     command=server_config.get("command", ""),
                     args=server_config.get("args", []),
                     env=server_config.get("env", {}),
-                    enabled=server_config.get("enabled", True)
+                    transport="http" if server_config.get("url") else "stdio",
+                    url=server_config.get("url"),
+                    headers=server_config.get("headers", {}),
+                    enabled=server_config.get("enabled", True),
+                    no_share=server_config.get("no_share", False),
+                    max_concurrent=server_config.get("max_concurrent", 8)
                 )
 
                 servers.append(server)
-                self._servers[name] = server
+                self._register_server(server)
 
             logger.info(
                 "MCP servers discovered",
@@ -114,6 +164,18 @@ class MCPIntegration:
             )
             return []
 
+    def _register_server(self, server: MCPServer) -> None:
+        """Add or replace a server, keeping the enabled index in sync.
+
+        Args:
+            server: MCP server configuration
+        """
+        self._servers[server.name] = server
+        if server.enabled:
+            self._enabled_servers[server.name] = server
+        else:
+            self._enabled_servers.pop(server.name, None)
+
     async def load_mcp_tools(
         self,
         server_name: str
@@ -144,13 +206,13 @@ class MCPIntegration:
             return []
 
         try:
-            # In real implementation, would connect to MCP server and list tools
-            # For now, return placeholder
             tools = await self._connect_and_list_tools(server)
 
             # Register tools
             for tool in tools:
                 self._tools[tool.name] = tool
+                self._tool_callers[tool.name] = self._compile_caller(tool)
+            self._loaded_servers.add(server_name)
 
             logger.info(
                 "MCP tools loaded",
@@ -168,6 +230,9 @@ class MCPIntegration:
             )
             return []
 
+        finally:
+            self._attempted_servers.add(server_name)
+
     async def _connect_and_list_tools(
         self,
         server: MCPServer
@@ -180,20 +245,62 @@ class MCPIntegration:
         Returns:
             List of tools from server
 
-        Note:
-            In full implementation, would use MCP client protocol.
-            This is a simplified version for the agentic layer.
+        Raises:
+            RuntimeError: If the server could not be connected
         """
-        # Placeholder for actual MCP protocol implementation
-        # Would use: mcp.StdioServerParameters, mcp.stdio_client
-        logger.debug(
-            "Connecting to MCP server",
-            server=server.name,
-            command=server.command
-        )
+        if self.cache:
+            cached = self._tools_cache.get(server.name)
+            if cached is not None and monotonic() - cached[0] < self.cache_ttl_seconds:
+                return cached[1]
 
-        # Return empty for now - full implementation would connect via stdio
-        return []
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Connecting to MCP server",
+                server=server.name,
+                command=server.command
+            )
+
+        await self._connect(server)
+        tools = [
+            MCPTool(
+                name=tool["name"],
+                server=server.name,
+                description=tool["description"],
+                input_schema=tool["input_schema"],
+                metadata={"annotations": tool["annotations"]}
+            )
+            for tool in await self._client.list_server_tools(server.name)
+        ]
+
+        if self.cache:
+            self._tools_cache[server.name] = (monotonic(), tools)
+
+        return tools
+
+    async def _connect(self, server: MCPServer) -> None:
+        """Open (or reuse) the client session for a server.
+
+        Args:
+            server: MCP server configuration
+
+        Raises:
+            RuntimeError: If the server could not be connected
+        """
+        connection = await self._client.connect_to_server({
+            "name": server.name,
+            "command": server.command,
+            "args": server.args,
+            "env": server.env,
+            "url": server.url if server.transport == "http" else None,
+            "headers": server.headers,
+            "no_share": server.no_share,
+            "max_concurrent": server.max_concurrent
+        })
+
+        if not connection.connected:
+            raise RuntimeError(
+                f"Could not connect to MCP server {server.name}: {connection.error}"
+            )
 
     async def execute_mcp_tool(
         self,
@@ -207,27 +314,22 @@ class MCPIntegration:
             params: Tool parameters
 
         Returns:
-            Tool execution result
+            Tool execution result. The providing server is loaded on first
+            use, see aget_tool.
         """
-        if tool_name not in self._tools:
+        tool = await self.aget_tool(tool_name)
+        if tool is None:
             raise ValueError(f"MCP tool not found: {tool_name}")
 
-        tool = self._tools[tool_name]
-
-        logger.info(
-            "Executing MCP tool",
-            tool=tool_name,
-            server=tool.server
-        )
-
+        started = perf_counter()
         try:
-            # In real implementation, would call MCP server
             result = await self._call_mcp_server(tool, params)
 
             logger.info(
                 "MCP tool executed",
                 tool=tool_name,
-                success=True
+                server=tool.server,
+                duration_ms=round((perf_counter() - started) * 1000, 2)
             )
 
             return result
@@ -253,18 +355,50 @@ class MCPIntegration:
 
         Returns:
             Execution result
+        """
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Calling MCP server",
+                tool=tool.name,
+                server=tool.server
+            )
+
+        caller = self._tool_callers.get(tool.name)
+        if caller is None:
+            caller = self._tool_callers[tool.name] = self._compile_caller(tool)
+
+        return await caller(params)
 
-        Note:
-            Full implementation would use MCP client protocol.
+    def _compile_caller(self, tool: MCPTool) -> ToolCaller:
+        """Build a call function specialized to one tool.
+
+        Everything that depends only on the tool (its required parameters
+        and whether calls may be coalesced) is worked out here once,
+        instead of on every execution.
+
+        Args:
+            tool: Tool to build the caller for
+
+        Returns:
+            Coroutine function taking the tool parameters
         """
-        # Placeholder for actual MCP call
-        logger.debug(
-            "Calling MCP server",
-            tool=tool.name,
-            server=tool.server
-        )
+        client = self._client
+        server, name = tool.server, tool.name
+        required = tuple(tool.input_schema.get("required", ()))
+
+        # Identical concurrent calls to tools that don't change state share one RPC
+        annotations = tool.metadata.get("annotations", {})
+        coalesce = bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+
+        async def call(params: dict[str, Any]) -> dict[str, Any]:
+            missing = [key for key in required if key not in params]
+            if missing:
+                raise ValueError(
+                    f"Missing required parameters for MCP tool {name}: {', '.join(missing)}"
+                )
+            return await client.call_tool(server, name, params, coalesce=coalesce)
 
-        return {"status": "success", "result": None}
+        return call
 
     async def handle_mcp_resources(
         self,
@@ -278,49 +412,79 @@ class MCPIntegration:
         Returns:
             List of available resources
         """
+        return [resource async for resource in self.iter_mcp_resources(server_name)]
+
+    async def iter_mcp_resources(
+        self,
+        server_name: str | None = None
+    ) -> AsyncIterator[MCPResource]:
+        """Yield resources from MCP servers as each server responds.
+
+        All servers are queried concurrently and a server's resources are
+        yielded (and registered) as soon as it answers, so callers can start
+        on them while slower servers are still listing. Stopping early
+        cancels the outstanding queries.
+
+        Args:
+            server_name: Optional server filter
+
+        Yields:
+            Available resources, in the order servers respond
+        """
         if server_name and server_name not in self._servers:
             logger.warning(
                 "MCP server not found",
                 server=server_name
             )
-            return []
+            return
 
         # Filter servers
-        servers_to_query = (
-            [self._servers[server_name]]
-            if server_name
-            else list(self._servers.values())
-        )
-
-        all_resources = []
-
-        for server in servers_to_query:
-            if not server.enabled:
-                continue
-
-            try:
-                resources = await self._list_server_resources(server)
-                all_resources.extend(resources)
+        if server_name:
+            enabled_servers = (
+                [self._enabled_servers[server_name]]
+                if server_name in self._enabled_servers
+                else []
+            )
+        else:
+            enabled_servers = list(self._enabled_servers.values())
 
-                # Register resources
-                for resource in resources:
-                    self._resources[resource.uri] = resource
+        # Query all servers concurrently; one failing server doesn't stop the rest
+        tasks = {
+            asyncio.create_task(self._list_server_resources(server)): server
+            for server in enabled_servers
+        }
+        pending = set(tasks)
+        resource_count = 0
 
-            except Exception as e:
-                logger.error(
-                    "Failed to list resources from server",
-                    server=server.name,
-                    error=str(e)
-                )
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        logger.error(
+                            "Failed to list resources from server",
+                            server=tasks[task].name,
+                            error=str(error)
+                        )
+                        continue
+
+                    for resource in task.result():
+                        # Register resources
+                        self._resources[resource.uri] = resource
+                        resource_count += 1
+                        yield resource
+        finally:
+            for task in pending:
+                task.cancel()
 
         logger.info(
             "MCP resources listed",
-            server_count=len(servers_to_query),
-            resource_count=len(all_resources)
+            server_count=len(enabled_servers),
+            resource_count=resource_count
         )
 
-        return all_resources
-
     async def _list_server_resources(
         self,
         server: MCPServer
@@ -333,20 +497,36 @@ class MCPIntegration:
         Returns:
             List of resources
         """
-        # Placeholder for actual MCP protocol
-        logger.debug(
-            "Listing resources from server",
-            server=server.name
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Listing resources from server",
+                server=server.name
+            )
 
-        return []
+        await self._connect(server)
+        resources = await self._client.list_server_resources(server.name)
+
+        return [
+            MCPResource(
+                uri=resource["uri"],
+                server=server.name,
+                name=resource["name"],
+                description=resource["description"],
+                mime_type=resource["mime_type"]
+            )
+            for resource in resources
+        ]
 
     def get_available_tools(self) -> list[MCPTool]:
         """Get all available MCP tools.
 
         Returns:
             List of all registered MCP tools
+
+        Raises:
+            RuntimeError: If an enabled server's tools have not been loaded
         """
+        self._require_loaded()
         return list(self._tools.values())
 
     def get_tool(self, tool_name: str) -> MCPTool | None:
@@ -357,24 +537,119 @@ class MCPIntegration:
 
         Returns:
             MCPTool if found, None otherwise
+
+        Raises:
+            RuntimeError: If the tool isn't loaded and an enabled server's
+                tools have not been loaded yet
         """
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            self._require_loaded()
+        return tool
+
+    def _require_loaded(self) -> None:
+        """Fail loudly instead of answering from a partly loaded registry.
+
+        Tools load lazily, and the sync getters cannot start a server, so
+        until every enabled server has been tried they would silently miss
+        tools.
+
+        Raises:
+            RuntimeError: If an enabled server has not been loaded yet
+        """
+        unloaded = [name for name in self._enabled_servers if name not in self._attempted_servers]
+        if unloaded:
+            raise RuntimeError(
+                f"MCP tools not loaded for servers: {', '.join(unloaded)}. "
+                "Use aget_tool() or initialize(preload=True) first."
+            )
+
+    async def aget_tool(self, tool_name: str) -> MCPTool | None:
+        """Get an MCP tool, loading its server on first use.
+
+        A ``server/tool`` name loads only that server. A bare tool name
+        loads the remaining enabled servers until one provides it.
+
+        Args:
+            tool_name: Name of tool, optionally prefixed with its server
+
+        Returns:
+            MCPTool if found, None otherwise
+        """
+        tool = self._tools.get(tool_name)
+        if tool is not None:
+            return tool
+
+        server_name, _, bare_name = tool_name.rpartition("/")
+        if server_name:
+            if server_name not in self._enabled_servers:
+                return None
+            await self._ensure_loaded(server_name)
+            tool = self._tools.get(bare_name)
+            return tool if tool is not None and tool.server == server_name else None
+
+        pending = [name for name in self._enabled_servers if name not in self._loaded_servers]
+        await asyncio.gather(*(self._ensure_loaded(name) for name in pending))
         return self._tools.get(tool_name)
 
-    async def initialize(self, config_path: str = "mcp_config.json") -> None:
+    async def _ensure_loaded(self, server_name: str) -> None:
+        """Load a server's tools once, even under concurrent first use.
+
+        Args:
+            server_name: Name of server to load
+        """
+        if server_name in self._loaded_servers:
+            return
+
+        lock = self._load_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            if server_name not in self._loaded_servers:
+                await self.load_mcp_tools(server_name)
+
+    async def initialize(
+        self,
+        config_path: str = "mcp_config.json",
+        preload: bool = False
+    ) -> None:
         """Initialize MCP integration.
 
+        Servers are only discovered here; their tools are loaded on first
+        use (see aget_tool), so unused servers are never started. The sync
+        get_tool and get_available_tools raise until servers are loaded,
+        so pass ``preload=True`` if you rely on them.
+
         Args:
             config_path: Path to MCP configuration
+            preload: Load tools from every enabled server up front
         """
         logger.info("Initializing MCP integration")
 
         # Discover servers
         servers = await self.discover_mcp_servers(config_path)
 
-        # Load tools from each enabled server
-        for server in servers:
-            if server.enabled:
-                await self.load_mcp_tools(server.name)
+        if not preload:
+            logger.info(
+                "MCP integration initialized",
+                servers=len(servers),
+                tools=len(self._tools)
+            )
+            return
+
+        # Load tools from all enabled servers concurrently, so startup takes
+        # as long as the slowest server rather than the sum of them
+        enabled_servers = list(self._enabled_servers.values())
+        results = await asyncio.gather(
+            *(self._ensure_loaded(server.name) for server in enabled_servers),
+            return_exceptions=True
+        )
+
+        for server, result in zip(enabled_servers, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Failed to load MCP tools",
+                    server=server.name,
+                    error=str(result)
+                )
 
         logger.info(
             "MCP integration initialized",
@@ -390,7 +665,7 @@ class MCPIntegration:
         """
         return {
             "servers_configured": len(self._servers),
-            "servers_enabled": sum(1 for s in self._servers.values() if s.enabled),
+            "servers_enabled": len(self._enabled_servers),
             "tools_available": len(self._tools),
             "resources_available": len(self._resources),
             "servers": [
@@ -402,3 +677,8 @@ class MCPIntegration:
                 for s in self._servers.values()
             ]
         }
+
+    async def close(self) -> None:
+        """Close all MCP server sessions."""
+        self._tools_cache.clear()
+        await self._client.cleanup()
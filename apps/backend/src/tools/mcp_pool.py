@@ -0,0 +1,317 @@
+"""MCP Instance Pool - Process-wide sharing of MCP server sessions.
+
+Clients that connect to servers with identical configurations (command,
+args and env, or url and headers) share one server process and session. Each consumer holds a
+reference, and the process is only terminated when the last one releases
+it. Servers flagged ``no_share`` get a private instance per consumer.
+Requests to each instance are limited to ``max_concurrent`` at a time
+across all consumers, so callers queue instead of flooding one stdio pipe.
+
+Usage:
+    pool = get_mcp_pool()
+    config_hash = compute_mcp_config_hash(server_config)
+    instance = await pool.acquire(config_hash, server_config, consumer_id=(id(self), server_name))
+    await instance.session.call_tool(...)
+    await pool.release(config_hash, consumer_id=(id(self), server_name))
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Hashable
+from contextlib import AsyncExitStack, suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+async def _serve(
+    server_config: dict[str, Any],
+    ready: "asyncio.Future[Any]",
+    stop: asyncio.Event
+) -> None:
+    """Run one MCP server session until asked to stop.
+
+    The SDK's transports must be entered and exited in the same task, so
+    each server gets an owner task that holds the contexts open.
+
+    Args:
+        server_config: Server configuration with command, args, env or url
+        ready: Resolved with the initialized session, or the startup error
+        stop: Set to close the session and terminate the server
+    """
+    try:
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+        from mcp.client.streamable_http import streamablehttp_client
+
+        if server_config.get("url"):
+            # Remote server: no subprocess, requests go over pooled HTTP connections
+            transport = streamablehttp_client(
+                server_config["url"],
+                headers=server_config.get("headers") or None
+            )
+        else:
+            transport = stdio_client(StdioServerParameters(
+                command=server_config.get("command", ""),
+                args=server_config.get("args", []),
+                env=server_config.get("env") or None
+            ))
+
+        async with transport as streams:
+            read, write = streams[0], streams[1]
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                ready.set_result(session)
+                await stop.wait()
+    except Exception as e:
+        if not ready.done():
+            ready.set_exception(e)
+            return
+        logger.warning(
+            "MCP server session ended with error",
+            server=server_config.get("name", "unknown"),
+            error=str(e)
+        )
+
+
+async def _open_session(server_config: dict[str, Any]) -> tuple[Any, AsyncExitStack]:
+    """Connect to an MCP server and initialize a client session.
+
+    Servers with a ``url`` are reached over streamable HTTP; all others are
+    spawned as subprocesses and spoken to over stdio.
+
+    Args:
+        server_config: Server configuration with command, args, env or url
+
+    Returns:
+        The initialized session and an exit stack that closes it
+    """
+    ready: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+    stop = asyncio.Event()
+    task = asyncio.create_task(_serve(server_config, ready, stop))
+
+    try:
+        session = await ready
+    except BaseException:
+        stop.set()
+        task.cancel()
+        raise
+
+    async def close() -> None:
+        stop.set()
+        await task
+
+    stack = AsyncExitStack()
+    stack.push_async_callback(close)
+    return session, stack
+
+
+def compute_mcp_config_hash(server_config: dict[str, Any]) -> str:
+    """Hash the parts of a server config that determine its process.
+
+    Argument order is significant; env and header ordering is not.
+
+    Args:
+        server_config: Server configuration with command, args, env or url
+
+    Returns:
+        Hex digest identifying the server instance
+    """
+    payload = json.dumps([
+        server_config.get("command", ""),
+        list(server_config.get("args", [])),
+        sorted((server_config.get("env") or {}).items()),
+        server_config.get("url"),
+        sorted((server_config.get("headers") or {}).items()),
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class PooledInstance:
+    """One running server and the consumers holding it.
+
+    ``session`` is replaced in place when the server is respawned, so
+    consumers should read it from the instance on every call.
+    """
+
+    server_name: str
+    server_config: dict[str, Any]
+    session: Any
+    exit_stack: AsyncExitStack
+    semaphore: asyncio.Semaphore = field(default_factory=lambda: asyncio.Semaphore(8))
+    consumers: set[Hashable] = field(default_factory=set)
+    heartbeat: "asyncio.Task[None] | None" = None
+
+
+class McpInstancePool:
+    """Reference-counted MCP server sessions keyed by config hash.
+
+    Each running server is pinged every ``heartbeat_interval`` seconds and
+    respawned if it stops answering, so a crashed process doesn't leave
+    consumers waiting on a dead session.
+    """
+
+    def __init__(
+        self,
+        heartbeat_interval: float | None = 30,
+        heartbeat_timeout: float = 5
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            heartbeat_interval: Seconds between pings (None disables them)
+            heartbeat_timeout: Seconds to wait for a ping response
+        """
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self._instances: dict[str, PooledInstance] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def acquire(
+        self,
+        config_hash: str,
+        server_config: dict[str, Any],
+        consumer_id: Hashable
+    ) -> PooledInstance:
+        """Get the instance for a config, spawning the server if needed.
+
+        Args:
+            config_hash: Hash from compute_mcp_config_hash
+            server_config: Server configuration with command, args, env
+            consumer_id: Identifier of the consumer taking a reference
+
+        Returns:
+            The pooled instance holding the shared client session
+        """
+        lock = self._locks.setdefault(config_hash, asyncio.Lock())
+        async with lock:
+            instance = self._instances.get(config_hash)
+            if instance is None:
+                session, exit_stack = await _open_session(server_config)
+                instance = PooledInstance(
+                    server_name=server_config.get("name", "unknown"),
+                    server_config=server_config,
+                    session=session,
+                    exit_stack=exit_stack,
+                    semaphore=asyncio.Semaphore(server_config.get("max_concurrent", 8))
+                )
+                if self.heartbeat_interval is not None:
+                    instance.heartbeat = asyncio.create_task(
+                        self._heartbeat(instance, self.heartbeat_interval)
+                    )
+                self._instances[config_hash] = instance
+                logger.info(
+                    "Spawned pooled MCP server",
+                    server=instance.server_name
+                )
+
+            instance.consumers.add(consumer_id)
+            return instance
+
+    async def release(self, config_hash: str, consumer_id: Hashable) -> bool:
+        """Drop a consumer's reference, stopping the server after the last one.
+
+        Args:
+            config_hash: Hash the session was acquired with
+            consumer_id: Identifier of the consumer releasing it
+
+        Returns:
+            True if the server was torn down
+        """
+        instance = self._instances.get(config_hash)
+        if instance is None:
+            return False
+
+        instance.consumers.discard(consumer_id)
+        if instance.consumers:
+            return False
+
+        del self._instances[config_hash]
+        self._locks.pop(config_hash, None)
+        if instance.heartbeat is not None:
+            instance.heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await instance.heartbeat
+        await instance.exit_stack.aclose()
+
+        logger.info(
+            "Stopped pooled MCP server",
+            server=instance.server_name
+        )
+
+        return True
+
+    async def _heartbeat(self, instance: PooledInstance, interval: float) -> None:
+        """Ping a server periodically and respawn it when it stops answering."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.wait_for(instance.session.send_ping(), self.heartbeat_timeout)
+            except Exception as e:
+                logger.warning(
+                    "MCP server heartbeat failed, respawning",
+                    server=instance.server_name,
+                    error=str(e)
+                )
+                try:
+                    await self._respawn(instance)
+                except Exception as e:
+                    logger.error(
+                        "Failed to respawn MCP server",
+                        server=instance.server_name,
+                        error=str(e)
+                    )
+
+    async def _respawn(self, instance: PooledInstance) -> None:
+        """Replace an instance's server process and session in place."""
+        try:
+            await instance.exit_stack.aclose()
+        except Exception as e:
+            logger.debug(
+                "Error closing dead MCP session",
+                server=instance.server_name,
+                error=str(e)
+            )
+
+        instance.session, instance.exit_stack = await _open_session(instance.server_config)
+
+        logger.info(
+            "Respawned MCP server",
+            server=instance.server_name
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics.
+
+        Returns:
+            Instance and consumer counts per pooled server
+        """
+        return {
+            "instances": len(self._instances),
+            "consumers": sum(len(i.consumers) for i in self._instances.values()),
+            "servers": [
+                {
+                    "name": instance.server_name,
+                    "config_hash": config_hash[:12],
+                    "consumers": len(instance.consumers)
+                }
+                for config_hash, instance in self._instances.items()
+            ]
+        }
+
+
+_pool: McpInstancePool | None = None
+
+
+def get_mcp_pool() -> McpInstancePool:
+    """Get the process-wide MCP instance pool."""
+    global _pool
+
+    if _pool is None:
+        _pool = McpInstancePool()
+    return _pool
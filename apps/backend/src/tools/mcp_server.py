@@ -13,14 +13,262 @@ This will start an MCP server that agents can connect to for:
 - Accessing knowledge base
 """
 
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from pydantic_core import to_json
+
 from src.memory.models import MemoryDomain, MemoryQuery
 from src.memory.store import MemoryStore
+from src.tools.semantic_cache import SemanticToolCache
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Domain argument values resolved without going through the enum constructor
+_DOMAINS: dict[str, MemoryDomain] = {d.value: d for d in MemoryDomain}
+
+# Resource and tool definitions are constant, so they are built once at import
+# and every list call returns the same objects instead of fresh lists of dicts.
+# Treat them as read-only. The JSON forms are for transports that take
+# pre-encoded payloads.
+RESOURCES: tuple[dict[str, Any], ...] = (
+    {
+        "uri": "memory://knowledge/architecture",
+        "name": "Architecture Patterns",
+        "description": "Stored architectural decisions and patterns"
+    },
+    {
+        "uri": "memory://knowledge/patterns",
+        "name": "Code Patterns",
+        "description": "Successful code patterns and approaches"
+    },
+    {
+        "uri": "memory://testing/failures",
+        "name": "Failure Patterns",
+        "description": "Known failure patterns to avoid"
+    },
+    {
+        "uri": "memory://preferences/user",
+        "name": "User Preferences",
+        "description": "User-specific preferences and settings"
+    },
+    {
+        "uri": "memory://debugging/sessions",
+        "name": "Debugging Sessions",
+        "description": "Past debugging sessions and solutions"
+    }
+)
+
+TOOLS: tuple[dict[str, Any], ...] = (
+    {
+        "name": "query_memory",
+        "description": "Query domain memories with filters",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "enum": list(_DOMAINS),
+                    "description": "Memory domain to query"
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Category filter (optional)"
+                },
+                "user_id": {
+                    "type": "string",
+                    "description": "User ID filter (optional)"
+                },
+                "limit": {
+                    "type": "number",
+                    "default": 10,
+                    "description": "Max results"
+                }
+            }
+        }
+    },
+    {
+        "name": "search_similar",
+        "description": "Semantic search through domain memories",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query text"
+                },
+                "domain": {
+                    "type": "string",
+                    "enum": list(_DOMAINS),
+                    "description": "Memory domain filter (optional)"
+                },
+                "similarity_threshold": {
+                    "type": "number",
+                    "default": 0.7,
+                    "description": "Minimum similarity score (0-1)"
+                },
+                "limit": {
+                    "type": "number",
+                    "default": 5,
+                    "description": "Max results"
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "store_pattern",
+        "description": "Store a successful pattern for future reuse",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "pattern_type": {
+                    "type": "string",
+                    "description": "Type of pattern (e.g., 'authentication', 'api_design')"
+                },
+                "pattern_data": {
+                    "type": "object",
+                    "description": "Pattern details"
+                },
+                "session_id": {
+                    "type": "string",
+                    "description": "Session ID where discovered (optional)"
+                }
+            },
+            "required": ["pattern_type", "pattern_data"]
+        }
+    },
+    {
+        "name": "store_failure",
+        "description": "Store a failure pattern to avoid repeating",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "failure_type": {
+                    "type": "string",
+                    "description": "Type of failure"
+                },
+                "context": {
+                    "type": "object",
+                    "description": "Context of what failed and why"
+                }
+            },
+            "required": ["failure_type", "context"]
+        }
+    },
+    {
+        "name": "get_relevant_context",
+        "description": "Get relevant past work for a new task",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "task_description": {
+                    "type": "string",
+                    "description": "Description of current task"
+                },
+                "domain": {
+                    "type": "string",
+                    "enum": list(_DOMAINS),
+                    "description": "Domain filter (optional)"
+                }
+            },
+            "required": ["task_description"]
+        }
+    }
+)
+
+RESOURCES_JSON = to_json(RESOURCES)
+TOOLS_JSON = to_json(TOOLS)
+
+# Read-only tools whose responses are cached, mapped to the argument holding
+# the free-text query matched by similarity (None: exact arguments only)
+CACHED_TOOLS: dict[str, str | None] = {
+    "query_memory": None,
+    "search_similar": "query",
+    "get_relevant_context": "task_description"
+}
+
+
+# Python types accepted for each JSON schema type used in tool inputSchemas
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,)
+}
+
+
+def _compile_validator(tool_name: str, schema: dict[str, Any]) -> Callable[[dict[str, Any]], None]:
+    """Build an argument validator specialized to one tool's inputSchema.
+
+    Covers the schema features the memory tools use: required properties,
+    property types and enums. Additional properties are allowed.
+
+    Args:
+        tool_name: Tool name, for error messages
+        schema: The tool's inputSchema
+
+    Returns:
+        Function raising ValueError for arguments that don't match
+    """
+    required = tuple(schema.get("required", ()))
+    properties = tuple(
+        (
+            key,
+            prop["type"],
+            _JSON_TYPES[prop["type"]],
+            frozenset(prop["enum"]) if "enum" in prop else None
+        )
+        for key, prop in schema.get("properties", {}).items()
+    )
+
+    def validate(arguments: dict[str, Any]) -> None:
+        missing = [key for key in required if key not in arguments]
+        if missing:
+            raise ValueError(
+                f"Missing required arguments for {tool_name}: {', '.join(missing)}"
+            )
+        for key, json_type, types, allowed in properties:
+            if key not in arguments:
+                continue
+            value = arguments[key]
+            # bool is an int subclass, but JSON keeps booleans and numbers apart
+            if not isinstance(value, types) or (isinstance(value, bool) and json_type != "boolean"):
+                raise ValueError(f"Argument {key!r} of {tool_name} must be a {json_type}")
+            if allowed is not None and value not in allowed:
+                raise ValueError(
+                    f"Argument {key!r} of {tool_name} must be one of "
+                    f"{', '.join(sorted(allowed))}, got {value!r}"
+                )
+
+    return validate
+
+
+_VALIDATORS: dict[str, Callable[[dict[str, Any]], None]] = {
+    tool["name"]: _compile_validator(tool["name"], tool["inputSchema"]) for tool in TOOLS
+}
+
+
+def _domain_arg(args: dict[str, Any]) -> MemoryDomain | None:
+    """Resolve the optional ``domain`` tool argument.
+
+    Raises:
+        ValueError: If the domain is not a MemoryDomain value
+    """
+    domain_str = args.get("domain")
+    if not domain_str:
+        return None
+    try:
+        return _DOMAINS[domain_str]
+    except KeyError:
+        raise ValueError(f"{domain_str!r} is not a valid MemoryDomain") from None
+
 
 class DomainMemoryMCPServer:
     """MCP server exposing domain memory operations.
@@ -40,10 +288,23 @@ class DomainMemoryMCPServer:
             stdio_server(server)
     """
 
-    def __init__(self) -> None:
-        """Initialize domain memory MCP server."""
+    def __init__(self, cache: SemanticToolCache | None = None) -> None:
+        """Initialize domain memory MCP server.
+
+        Args:
+            cache: Response cache for read-only tools (a default one if omitted)
+        """
         self.memory_store = MemoryStore()
+        self.cache = cache if cache is not None else SemanticToolCache()
         self._initialized = False
+        self._inflight: dict[tuple[Any, ...], asyncio.Future[dict[str, Any]]] = {}
+        self._handlers: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {
+            "query_memory": self._tool_query_memory,
+            "search_similar": self._tool_search_similar,
+            "store_pattern": self._tool_store_pattern,
+            "store_failure": self._tool_store_failure,
+            "get_relevant_context": self._tool_get_relevant_context
+        }
 
     async def initialize(self) -> None:
         """Initialize the memory store."""
@@ -52,167 +313,21 @@ class DomainMemoryMCPServer:
             self._initialized = True
             logger.info("Domain memory MCP server initialized")
 
-    async def list_resources(self) -> list[dict[str, Any]]:
+    async def list_resources(self) -> tuple[dict[str, Any], ...]:
         """List available memory resources.
 
         Returns:
             List of resource definitions for MCP clients
         """
-        resources = [
-            {
-                "uri": "memory://knowledge/architecture",
-                "name": "Architecture Patterns",
-                "description": "Stored architectural decisions and patterns"
-            },
-            {
-                "uri": "memory://knowledge/patterns",
-                "name": "Code Patterns",
-                "description": "Successful code patterns and approaches"
-            },
-            {
-                "uri": "memory://testing/failures",
-                "name": "Failure Patterns",
-                "description": "Known failure patterns to avoid"
-            },
-            {
-                "uri": "memory://preferences/user",
-                "name": "User Preferences",
-                "description": "User-specific preferences and settings"
-            },
-            {
-                "uri": "memory://debugging/sessions",
-                "name": "Debugging Sessions",
-                "description": "Past debugging sessions and solutions"
-            }
-        ]
-
-        return resources
+        return RESOURCES
 
-    async def list_tools(self) -> list[dict[str, Any]]:
+    async def list_tools(self) -> tuple[dict[str, Any], ...]:
         """List available memory operation tools.
 
         Returns:
             List of tool definitions for MCP clients
         """
-        tools = [
-            {
-                "name": "query_memory",
-                "description": "Query domain memories with filters",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "domain": {
-                            "type": "string",
-                            "enum": ["knowledge", "preferences", "testing", "debugging"],
-                            "description": "Memory domain to query"
-                        },
-                        "category": {
-                            "type": "string",
-                            "description": "Category filter (optional)"
-                        },
-                        "user_id": {
-                            "type": "string",
-                            "description": "User ID filter (optional)"
-                        },
-                        "limit": {
-                            "type": "number",
-                            "default": 10,
-                            "description": "Max results"
-                        }
-                    }
-                }
-            },
-            {
-                "name": "search_similar",
-                "description": "Semantic search through domain memories",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Search query text"
-                        },
-                        "domain": {
-                            "type": "string",
-                            "enum": ["knowledge", "preferences", "testing", "debugging"],
-                            "description": "Memory domain filter (optional)"
-                        },
-                        "similarity_threshold": {
-                            "type": "number",
-                            "default": 0.7,
-                            "description": "Minimum similarity score (0-1)"
-                        },
-                        "limit": {
-                            "type": "number",
-                            "default": 5,
-                            "description": "Max results"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            },
-            {
-                "name": "store_pattern",
-                "description": "Store a successful pattern for future reuse",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "pattern_type": {
-                            "type": "string",
-                            "description": "Type of pattern (e.g., 'authentication', 'api_design')"
-                        },
-                        "pattern_data": {
-                            "type": "object",
-                            "description": "Pattern details"
-                        },
-                        "session_id": {
-                            "type": "string",
-                            "description": "Session ID where discovered (optional)"
-                        }
-                    },
-                    "required": ["pattern_type", "pattern_data"]
-                }
-            },
-            {
-                "name": "store_failure",
-                "description": "Store a failure pattern to avoid repeating",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "failure_type": {
-                            "type": "string",
-                            "description": "Type of failure"
-                        },
-                        "context": {
-                            "type": "object",
-                            "description": "Context of what failed and why"
-                        }
-                    },
-                    "required": ["failure_type", "context"]
-                }
-            },
-            {
-                "name": "get_relevant_context",
-                "description": "Get relevant past work for a new task",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "task_description": {
-                            "type": "string",
-                            "description": "Description of current task"
-                        },
-                        "domain": {
-                            "type": "string",
-                            "enum": ["knowledge", "preferences", "testing", "debugging"],
-                            "description": "Domain filter (optional)"
-                        }
-                    },
-                    "required": ["task_description"]
-                }
-            }
-        ]
-
-        return tools
+        return TOOLS
 
     async def execute_tool(
         self,
@@ -231,24 +346,20 @@ class DomainMemoryMCPServer:
         if not self._initialized:
             await self.initialize()
 
-        logger.info(
-            "Executing memory tool",
-            tool=tool_name
-        )
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
+                "Executing memory tool",
+                tool=tool_name
+            )
 
         try:
-            if tool_name == "query_memory":
-                return await self._tool_query_memory(arguments)
-            elif tool_name == "search_similar":
-                return await self._tool_search_similar(arguments)
-            elif tool_name == "store_pattern":
-                return await self._tool_store_pattern(arguments)
-            elif tool_name == "store_failure":
-                return await self._tool_store_failure(arguments)
-            elif tool_name == "get_relevant_context":
-                return await self._tool_get_relevant_context(arguments)
-            else:
+            handler = self._handlers.get(tool_name)
+            if handler is None:
                 raise ValueError(f"Unknown tool: {tool_name}")
+            _VALIDATORS[tool_name](arguments)
+            if tool_name in CACHED_TOOLS:
+                return await self._execute_cached(tool_name, handler, arguments)
+            return await handler(arguments)
 
         except Exception as e:
             logger.error(
@@ -258,10 +369,116 @@ class DomainMemoryMCPServer:
             )
             return {"error": str(e), "success": False}
 
+    async def execute_tool_json(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any]
+    ) -> bytes:
+        """Execute a memory operation tool and encode its result as JSON.
+
+        For transports that write bytes. Encoding runs in pydantic-core, which
+        handles datetimes, UUIDs and models without a Python ``default`` hook.
+
+        Args:
+            tool_name: Name of tool to execute
+            arguments: Tool arguments
+
+        Returns:
+            UTF-8 JSON of the tool result
+        """
+        return to_json(await self.execute_tool(tool_name, arguments))
+
+    async def _execute_cached(
+        self,
+        tool_name: str,
+        handler: Callable[..., Awaitable[dict[str, Any]]],
+        arguments: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Execute a read-only tool, serving repeats and near-duplicates from cache.
+
+        Concurrent misses for the same query share one execution. The query
+        text is embedded once; the embedding is used both to look up similar
+        cached queries and, on a miss, for the memory search itself.
+
+        Args:
+            tool_name: Name of a tool in CACHED_TOOLS
+            handler: The tool's handler
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+        """
+        text_arg = CACHED_TOOLS[tool_name]
+        text = str(arguments.get(text_arg, "")) if text_arg else ""
+        filters = {k: v for k, v in arguments.items() if k != text_arg}
+        bucket = (tool_name, json.dumps(filters, sort_keys=True, default=str))
+
+        cached = self.cache.get(bucket, text)
+        if cached is not None:
+            return cached
+
+        # Keyed by cache generation so nobody joins a read started before a store
+        key = (bucket, text, self.cache.generation)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fill_cache(tool_name, handler, arguments, bucket, text)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved; the caller gets the error through the raise below
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _fill_cache(
+        self,
+        tool_name: str,
+        handler: Callable[..., Awaitable[dict[str, Any]]],
+        arguments: dict[str, Any],
+        bucket: tuple[str, str],
+        text: str
+    ) -> dict[str, Any]:
+        """Serve a similar cached query or run the tool and cache its result."""
+        generation = self.cache.generation
+        text_arg = CACHED_TOOLS[tool_name]
+
+        embedding = None
+        provider = self.memory_store.embedding_provider
+        if text_arg and provider is not None:
+            embedding = await provider.get_embedding(text)
+            cached = self.cache.search(bucket, embedding)
+            if cached is not None:
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug(
+                        "Semantic cache hit",
+                        tool=tool_name
+                    )
+                return cached
+
+        if text_arg:
+            result = await handler(arguments, embedding)
+        else:
+            result = await handler(arguments)
+
+        # A store during the search may have made this result stale
+        if self.cache.generation == generation:
+            self.cache.set(bucket, text, embedding, result)
+        return result
+
     async def _tool_query_memory(self, args: dict[str, Any]) -> dict[str, Any]:
         """Execute query_memory tool."""
-        domain_str = args.get("domain")
-        domain = MemoryDomain(domain_str) if domain_str else None
+        domain = _domain_arg(args)
 
         query = MemoryQuery(
             domain=domain,
@@ -274,21 +491,27 @@ class DomainMemoryMCPServer:
 
         return {
             "success": True,
-            "entries": [e.model_dump() for e in result.entries],
+            # Embedding vectors are useless to MCP clients and are most of
+            # each entry's size, so they are left out of the payload
+            "entries": [e.model_dump(exclude={"embedding"}) for e in result.entries],
             "total_count": result.total_count
         }
 
-    async def _tool_search_similar(self, args: dict[str, Any]) -> dict[str, Any]:
+    async def _tool_search_similar(
+        self,
+        args: dict[str, Any],
+        query_embedding: list[float] | None = None
+    ) -> dict[str, Any]:
         """Execute search_similar tool."""
-        domain_str = args.get("domain")
-        domain = MemoryDomain(domain_str) if domain_str else None
+        domain = _domain_arg(args)
 
         similar = await self.memory_store.find_similar(
             query_text=args["query"],
             domain=domain,
             user_id=args.get("user_id"),
             similarity_threshold=args.get("similarity_threshold", 0.7),
-            limit=args.get("limit", 5)
+            limit=args.get("limit", 5),
+            query_embedding=query_embedding
         )
 
         return {
@@ -305,6 +528,9 @@ class DomainMemoryMCPServer:
             user_id=args.get("user_id")
         )
 
+        # Stored memories can change any cached search result
+        self.cache.clear()
+
         return {
             "success": True,
             "memory_id": str(entry.id)
@@ -319,21 +545,27 @@ class DomainMemoryMCPServer:
             user_id=args.get("user_id")
         )
 
+        self.cache.clear()
+
         return {
             "success": True,
             "memory_id": str(entry.id)
         }
 
-    async def _tool_get_relevant_context(self, args: dict[str, Any]) -> dict[str, Any]:
+    async def _tool_get_relevant_context(
+        self,
+        args: dict[str, Any],
+        query_embedding: list[float] | None = None
+    ) -> dict[str, Any]:
         """Execute get_relevant_context tool."""
-        domain_str = args.get("domain")
-        domain = MemoryDomain(domain_str) if domain_str else None
+        domain = _domain_arg(args)
 
         context = await self.memory_store.retrieve_relevant_context(
             task_description=args["task_description"],
             domain=domain,
             user_id=args.get("user_id"),
-            limit=args.get("limit", 5)
+            limit=args.get("limit", 5),
+            query_embedding=query_embedding
         )
 
         return {
@@ -358,5 +590,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
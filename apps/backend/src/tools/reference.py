@@ -2,9 +2,8 @@
 
 from typing import Any
 
-import httpx
-
 from src.config import get_settings
+from src.tools import _http
 from src.utils import get_logger
 
 settings = get_settings()
@@ -58,15 +57,14 @@ class RefToolsTool:
         logger.info("Fetching documentation page", url=url)
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                return {
-                    "url": url,
-                    "content": response.text,
-                    "status": response.status_code,
-                }
+            response = await _http.request("GET", url)
+            response.raise_for_status()
+
+            return {
+                "url": url,
+                "content": response.text,
+                "status": response.status_code,
+            }
 
         except Exception as e:
             logger.error("Failed to fetch documentation", error=str(e))
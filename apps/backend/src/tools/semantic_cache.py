@@ -0,0 +1,126 @@
+"""Semantic cache for read-only memory tool responses.
+
+Memory search tools are often called with paraphrases of a query they have
+just answered. The cache keeps recent responses together with the embedding
+of the query text, and serves a stored response when a new query's embedding
+is close enough (cosine similarity at or above ``similarity_threshold``).
+That skips the vector search round-trip; exact repeats also skip embedding.
+
+Entries are grouped into buckets by everything except the query text (tool
+name, domain, limits, ...), so only queries with identical filters can
+share a response.
+
+All operations are synchronous and never await, so on the event loop they
+are atomic: lookups in different buckets, or in the same one, never wait
+on each other and no lock is needed.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from operator import mul
+from typing import Any
+
+
+@dataclass(slots=True)
+class _Entry:
+    """One cached response and the normalized embedding of its query."""
+
+    expires_at: float
+    vector: tuple[float, ...] | None
+    response: dict[str, Any]
+
+
+def _normalize(vector: Sequence[float]) -> tuple[float, ...]:
+    """Scale a vector to unit length so a dot product is its cosine."""
+    norm = math.sqrt(sum(map(mul, vector, vector)))
+    if norm == 0:
+        return tuple(vector)
+    return tuple(x / norm for x in vector)
+
+
+class SemanticToolCache:
+    """Per-bucket LRU cache of tool responses matched by query similarity."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.9,
+        max_entries_per_bucket: int = 128,
+        ttl: float = 300.0
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries_per_bucket: Entries kept per bucket before LRU eviction
+            ttl: Seconds a response stays valid
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries_per_bucket = max_entries_per_bucket
+        self.ttl = ttl
+        self._buckets: dict[Hashable, OrderedDict[str, _Entry]] = {}
+        # Bumped by clear(), so callers can tell a result predates a write
+        self.generation = 0
+
+    def get(self, bucket: Hashable, text: str) -> dict[str, Any] | None:
+        """Get the response for exactly this query text, if cached."""
+        entries = self._buckets.get(bucket)
+        if not entries:
+            return None
+        entry = entries.get(text)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del entries[text]
+            return None
+        entries.move_to_end(text)
+        return entry.response
+
+    def search(self, bucket: Hashable, vector: Sequence[float]) -> dict[str, Any] | None:
+        """Get the response of the most similar cached query, if close enough."""
+        entries = self._buckets.get(bucket)
+        if not entries:
+            return None
+
+        query = _normalize(vector)
+        now = time.monotonic()
+        best_text, best_score = None, self.similarity_threshold
+        for text, entry in list(entries.items()):
+            if entry.expires_at <= now:
+                del entries[text]
+                continue
+            if entry.vector is None or len(entry.vector) != len(query):
+                continue
+            score = sum(map(mul, query, entry.vector))
+            if score >= best_score:
+                best_text, best_score = text, score
+
+        if best_text is None:
+            return None
+        entries.move_to_end(best_text)
+        return entries[best_text].response
+
+    def set(
+        self,
+        bucket: Hashable,
+        text: str,
+        vector: Sequence[float] | None,
+        response: dict[str, Any]
+    ) -> None:
+        """Store a response, evicting the bucket's least recently used entry if full."""
+        entries = self._buckets.setdefault(bucket, OrderedDict())
+        entries[text] = _Entry(
+            expires_at=time.monotonic() + self.ttl,
+            vector=_normalize(vector) if vector is not None else None,
+            response=response
+        )
+        entries.move_to_end(text)
+        if len(entries) > self.max_entries_per_bucket:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries, e.g. after new memories were stored."""
+        self._buckets.clear()
+        self.generation += 1
@@ -1,23 +1,99 @@
 """Exa web search integration."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-import httpx
-
 from src.config import get_settings
+from src.tools import _http
 from src.utils import get_logger
 
 settings = get_settings()
 logger = get_logger(__name__)
 
 
+class _ContentsBatcher:
+    """Coalesces concurrent per-URL content requests into one upstream call.
+
+    URLs requested within ``window`` seconds of the first pending one are
+    sent together, deduplicated, and each caller gets back the results for
+    its own URLs in the order it asked for them.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[list[str]], Awaitable[list[dict[str, Any]]]],
+        window: float = 0.01,
+    ) -> None:
+        self._send = send
+        self.window = window
+        self._pending: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self._flush: asyncio.Task[None] | None = None
+
+    async def fetch(self, urls: list[str]) -> list[dict[str, Any]]:
+        """Get contents for URLs, sharing the request with concurrent callers.
+
+        Raises:
+            LookupError: If the response has no result for a requested URL
+            Exception: Whatever the batch's upstream request raised
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for url in urls:
+            future = self._pending.get(url)
+            if future is None:
+                future = self._pending[url] = loop.create_future()
+            futures.append(future)
+
+        if self._flush is None:
+            self._flush = asyncio.create_task(self._flush_after_window())
+
+        # Shielded so one caller's cancellation doesn't cancel a shared URL
+        return list(await asyncio.gather(*(asyncio.shield(f) for f in futures)))
+
+    async def _flush_after_window(self) -> None:
+        """Send every URL queued during the window in one request."""
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush = None
+
+        try:
+            results = await self._send(list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        urls = list(pending)
+        by_id = {r.get("id"): r for r in results}
+        if not all(url in by_id for url in urls) and len(results) == len(urls):
+            # Exa answers in request order; "url" may be normalized, so when
+            # the echoed ids don't cover the batch, match by position
+            by_id = dict(zip(urls, results, strict=True))
+
+        for url, future in pending.items():
+            if future.done():
+                continue
+            result = by_id.get(url)
+            if result is None:
+                future.set_exception(LookupError(f"Exa returned no contents for {url}"))
+            else:
+                future.set_result(result)
+
+
 class ExaSearchTool:
     """Web search using Exa API."""
 
     BASE_URL = "https://api.exa.ai"
 
-    def __init__(self) -> None:
-        self.api_key = settings.exa_api_key
+    def __init__(self, api_key: str | None = None) -> None:
+        self.api_key = api_key if api_key is not None else settings.exa_api_key
+        self._headers = {"x-api-key": self.api_key}
+        if not self.api_key:
+            # Warned once here; each call then just returns []
+            logger.warning("Exa API key not configured, web search disabled")
+        self._batchers: dict[bool, _ContentsBatcher] = {}
 
     async def search(
         self,
@@ -36,23 +112,23 @@ class ExaSearchTool:
             List of search results
         """
         if not self.api_key:
-            logger.warning("Exa API key not configured")
             return []
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/search",
-                    headers={"x-api-key": self.api_key},
-                    json={
-                        "query": query,
-                        "numResults": num_results,
-                        "useAutoprompt": use_autoprompt,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("results", [])
+            response = await _http.request(
+                "POST",
+                f"{self.BASE_URL}/search",
+                idempotent=True,
+                headers=self._headers,
+                json={
+                    "query": query,
+                    "numResults": num_results,
+                    "useAutoprompt": use_autoprompt,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("results", [])
 
         except Exception as e:
             logger.error("Exa search failed", error=str(e))
@@ -65,6 +141,9 @@ class ExaSearchTool:
     ) -> list[dict[str, Any]]:
         """Get contents of URLs.
 
+        Concurrent calls are batched into a single Exa request, so callers
+        can fetch URL by URL without paying a round trip for each.
+
         Args:
             urls: List of URLs to fetch
             text: Whether to extract text content
@@ -73,27 +152,37 @@ class ExaSearchTool:
             List of URL contents
         """
         if not self.api_key:
-            logger.warning("Exa API key not configured")
             return []
 
+        batcher = self._batchers.get(text)
+        if batcher is None:
+            batcher = self._batchers[text] = _ContentsBatcher(
+                lambda batch: self._post_contents(batch, text)
+            )
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/contents",
-                    headers={"x-api-key": self.api_key},
-                    json={
-                        "urls": urls,
-                        "text": text,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("results", [])
+            return await batcher.fetch(urls)
 
         except Exception as e:
             logger.error("Exa get contents failed", error=str(e))
             return []
 
+    async def _post_contents(self, urls: list[str], text: bool) -> list[dict[str, Any]]:
+        """Fetch contents for a batch of URLs in one request."""
+        response = await _http.request(
+            "POST",
+            f"{self.BASE_URL}/contents",
+            idempotent=True,
+            headers=self._headers,
+            json={
+                "urls": urls,
+                "text": text,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("results", [])
+
     async def find_similar(
         self,
         url: str,
@@ -109,22 +198,22 @@ class ExaSearchTool:
             List of similar pages
         """
         if not self.api_key:
-            logger.warning("Exa API key not configured")
             return []
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/findSimilar",
-                    headers={"x-api-key": self.api_key},
-                    json={
-                        "url": url,
-                        "numResults": num_results,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("results", [])
+            response = await _http.request(
+                "POST",
+                f"{self.BASE_URL}/findSimilar",
+                idempotent=True,
+                headers=self._headers,
+                json={
+                    "url": url,
+                    "numResults": num_results,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("results", [])
 
         except Exception as e:
             logger.error("Exa find similar failed", error=str(e))
@@ -1,5 +1,6 @@
 """Utility modules."""
 
 from .logging import get_logger, setup_logging
+from .timestamps import iso_now
 
-__all__ = ["get_logger", "setup_logging"]
+__all__ = ["get_logger", "iso_now", "setup_logging"]
@@ -0,0 +1,24 @@
+"""Fast ISO 8601 timestamps for hot write paths."""
+
+import time
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for the last second seen.
+# Stored as one tuple so concurrent callers never see a torn update.
+_second_cache: tuple[int, str] = (-1, "")
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds.
+
+    Produces the same text as ``datetime.now(timezone.utc).isoformat()``
+    (always including microseconds), but formats the date and time only
+    once per second.
+    """
+    global _second_cache
+
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _second_cache
+    if seconds != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _second_cache = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}+00:00"
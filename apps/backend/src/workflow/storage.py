@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from postgrest.types import ReturnMethod
+
 from src.state.supabase import SupabaseStateStore
 from src.utils import get_logger
 
@@ -44,7 +46,9 @@ class WorkflowStorage:
                 "created_by": workflow.created_by or user_id,
             }
 
-            _result = self.supabase.client.table("workflows").insert(data).execute()
+            self.supabase.client.table("workflows").insert(
+                data, returning=ReturnMethod.minimal
+            ).execute()
 
             logger.info(
                 "Created workflow",
@@ -219,9 +223,9 @@ class WorkflowStorage:
                 "started_at": context.started_at,
             }
 
-            _result = (
-                self.supabase.client.table("workflow_executions").insert(data).execute()
-            )
+            self.supabase.client.table("workflow_executions").insert(
+                data, returning=ReturnMethod.minimal
+            ).execute()
 
             logger.info(
                 "Created execution",
@@ -6,19 +6,32 @@ Implements:
 - Performance regression monitoring
 - Documentation gap detection
 - Automated improvement PRs
+
+Findings are plain slotted dataclasses rather than Pydantic models: scans
+can produce thousands of them, their fields are built here from already
+typed values, and nothing needs validating.
 """
 
-from datetime import datetime
+import ast
+import asyncio
+import io
+import json
+import re
+import shutil
+import time
+import tokenize
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
-
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
 
-class Issue(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Issue:
     """A tech debt or improvement issue."""
 
     issue_id: str
@@ -30,7 +43,8 @@ class Issue(BaseModel):
     estimated_effort: str  # small, medium, large
 
 
-class Refactoring(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Refactoring:
     """A refactoring opportunity."""
 
     refactoring_id: str
@@ -41,7 +55,8 @@ class Refactoring(BaseModel):
     risk_level: str  # low, medium, high
 
 
-class Regression(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Regression:
     """A performance regression."""
 
     regression_id: str
@@ -52,7 +67,8 @@ class Regression(BaseModel):
     introduced_in_commit: str | None = None
 
 
-class DocGap(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DocGap:
     """A documentation gap."""
 
     gap_id: str
@@ -62,12 +78,249 @@ class DocGap(BaseModel):
     suggested_content: str | None = None
 
 
+def _find_regressions(
+    baseline: dict[str, float],
+    current: dict[str, float],
+    threshold_pct: float
+) -> list[tuple[str, float, float, float]]:
+    """Compare metrics against a baseline in one pass.
+
+    Metrics missing from ``current`` count as unchanged, and metrics with a
+    non-positive baseline are skipped.
+
+    Returns:
+        (metric name, baseline, current, regression %) for each regression
+    """
+    found = []
+    get_current = current.get
+    for metric_name, baseline_value in baseline.items():
+        if baseline_value <= 0:
+            continue
+        current_value = get_current(metric_name, baseline_value)
+        regression_pct = (current_value - baseline_value) / baseline_value * 100
+        if regression_pct > threshold_pct:
+            found.append((metric_name, baseline_value, current_value, regression_pct))
+    return found
+
+
+# Directories never worth analysing
+_SKIP_DIRS = frozenset({".git", ".venv", "venv", "node_modules", "__pycache__", "build", "dist"})
+
+# Markers, but not mentions like "TODO/FIXME" in prose
+_TODO_PATTERN = re.compile(r"(?<!/)\b(TODO|FIXME)\b(?!/):?\s*(.*)")
+
+# Functions longer than this many lines are reported as a code smell
+LONG_FUNCTION_LINES = 80
+
+# Nodes that add a decision point to a function's cyclomatic complexity
+_BRANCH_NODES = (
+    ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While,
+    ast.ExceptHandler, ast.Assert, ast.comprehension, ast.match_case
+)
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass
+class _SourceAnalysis:
+    """Everything the source scanners need, gathered in one pass per file."""
+
+    todos: list[dict[str, Any]] = field(default_factory=list)
+    functions: list[dict[str, Any]] = field(default_factory=list)
+    tested_names: set[str] = field(default_factory=set)
+
+
+def _complexity(func: ast.FunctionDef | ast.AsyncFunctionDef) -> int:
+    """McCabe complexity of a function, not counting nested functions or classes."""
+    complexity = 1
+    stack = list(ast.iter_child_nodes(func))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _SCOPE_NODES):
+            continue
+        if isinstance(node, _BRANCH_NODES):
+            complexity += 1
+            if isinstance(node, ast.comprehension):
+                complexity += len(node.ifs)
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+        stack.extend(ast.iter_child_nodes(node))
+    return complexity
+
+
+class _AnalyzeVisitor(ast.NodeVisitor):
+    """Collects function records and, in test files, referenced names."""
+
+    def __init__(self, file: str, analysis: _SourceAnalysis, is_test: bool) -> None:
+        self.file = file
+        self.analysis = analysis
+        self.is_test = is_test
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        self.analysis.functions.append({
+            "file": self.file,
+            "line": node.lineno,
+            "name": node.name,
+            "complexity": _complexity(node),
+            "length": (node.end_lineno or node.lineno) - node.lineno + 1,
+            "has_docstring": ast.get_docstring(node) is not None,
+            "is_test": self.is_test
+        })
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.visit_FunctionDef(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if self.is_test:
+            self.analysis.tested_names.add(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if self.is_test:
+            self.analysis.tested_names.add(node.attr)
+        self.generic_visit(node)
+
+
+def _iter_python_files(paths: list[str]) -> list[Path]:
+    """Python files under the given paths, skipping vendored and build dirs."""
+    files = []
+    for root in map(Path, paths):
+        candidates = [root] if root.is_file() else root.rglob("*.py")
+        for path in candidates:
+            if path.suffix == ".py" and not _SKIP_DIRS.intersection(path.parts):
+                files.append(path)
+    return files
+
+
+def _comment_todos(
+    file: str,
+    source: str,
+    lines: set[int] | None = None
+) -> list[dict[str, Any]]:
+    """TODO/FIXME markers in the comments of a Python source.
+
+    Only real comment tokens count, so markers inside strings are ignored.
+
+    Args:
+        file: Path reported for each marker
+        source: The file's source code
+        lines: If given, only comments on these line numbers are checked
+    """
+    todos = []
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type != tokenize.COMMENT:
+            continue
+        if lines is not None and token.start[0] not in lines:
+            continue
+        match = _TODO_PATTERN.search(token.string)
+        if match:
+            todos.append({
+                "file": file,
+                "line": token.start[0],
+                "marker": match.group(1),
+                "text": match.group(2).strip()
+            })
+    return todos
+
+
+def _analyze_sources(paths: list[str]) -> _SourceAnalysis:
+    """Read and parse each Python file once, feeding every scanner's data.
+
+    TODO/FIXME comments are tokenized from the same in-memory source that
+    is parsed, and one AST walk records each function's complexity, length
+    and docstring.
+    """
+    analysis = _SourceAnalysis()
+    for path in _iter_python_files(paths):
+        file = str(path)
+        try:
+            source = path.read_text(encoding="utf-8")
+            tree = ast.parse(source, filename=file)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            logger.debug("Skipping unparseable file", file=file, error=str(e))
+            continue
+
+        analysis.todos.extend(_comment_todos(file, source))
+
+        is_test = path.name.startswith("test_")
+        _AnalyzeVisitor(file, analysis, is_test).visit(tree)
+
+    return analysis
+
+
+async def _ripgrep_todos(rg: str, paths: list[str]) -> list[dict[str, Any]]:
+    """Find TODO/FIXME comments in Python files with ripgrep.
+
+    ripgrep searches files in parallel in native code, which matters on
+    large trees, but its pattern can't tell a comment from a ``#`` inside
+    a string. Only files it reports are read, and their hits are confirmed
+    by tokenizing, so the result matches the ``todos`` of
+    ``_analyze_sources``.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        rg, "--json", "--type", "py",
+        *(f"--glob=!{d}" for d in sorted(_SKIP_DIRS)),
+        "-e", r"#.*\b(TODO|FIXME)\b", "--", *paths,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    assert proc.stdout is not None
+
+    hits: dict[str, set[int]] = {}
+    async for line in proc.stdout:
+        event = json.loads(line)
+        if event["type"] != "match":
+            continue
+        data = event["data"]
+        hits.setdefault(data["path"].get("text", ""), set()).add(data["line_number"])
+
+    # Exit status 1 means no matches; 2 means some files couldn't be read
+    if await proc.wait() == 2:
+        logger.debug("ripgrep skipped unreadable files", paths=paths)
+
+    return await asyncio.to_thread(_confirm_todos, hits)
+
+
+def _confirm_todos(hits: dict[str, set[int]]) -> list[dict[str, Any]]:
+    """Keep the ripgrep hits that are TODO/FIXME comments, file by file."""
+    todos = []
+    for file, lines in hits.items():
+        try:
+            source = Path(file).read_text(encoding="utf-8")
+            todos.extend(_comment_todos(file, source, lines))
+        except (OSError, SyntaxError, UnicodeDecodeError, tokenize.TokenError) as e:
+            logger.debug("Skipping unreadable file", file=file, error=str(e))
+    return todos
+
+
+# PR title prefix for each kind of opportunity, and how many go in one PR
+PR_THEMES: dict[type, str] = {
+    Issue: "chore: Resolve tech debt",
+    Refactoring: "refactor: Extract complex functions",
+    DocGap: "docs: Add missing docstrings"
+}
+PR_BATCH_SIZE = 20
+
+
 class ContinuousImprovement:
     """Agents that continuously monitor and improve codebase."""
 
     def __init__(self) -> None:
         """Initialize continuous improvement."""
-        pass
+        # Source analyses by scanned paths, shared by the scanners of one
+        # run; every public scan clears them so it sees the tree as it is now
+        self._analyses: dict[tuple[str, ...], asyncio.Task[_SourceAnalysis]] = {}
+
+    def _analyze(self, paths: list[str]) -> "asyncio.Task[_SourceAnalysis]":
+        """Get the source analysis for paths, starting it if not yet running.
+
+        Scanners running concurrently share one read and parse of the tree.
+        """
+        key = tuple(paths)
+        task = self._analyses.get(key)
+        if task is None:
+            task = asyncio.create_task(asyncio.to_thread(_analyze_sources, paths))
+            self._analyses[key] = task
+        return task
 
     async def scan_for_tech_debt(
         self,
@@ -83,28 +336,37 @@ class ContinuousImprovement:
         """
         logger.info("Scanning for technical debt", paths=paths)
 
-        issues = []
+        scan_paths = paths or ["."]
+        self._analyses.clear()
 
-        # Scan for TODO/FIXME comments
-        todo_issues = await self._scan_for_todos(paths or ["."])
-        issues.extend(todo_issues)
+        # TODO/FIXME comments, code smells and outdated dependencies touch
+        # disjoint resources, so scan them concurrently
+        scanners = {
+            "todos": self._scan_for_todos(scan_paths),
+            "code_smells": self._scan_for_code_smells(scan_paths),
+            "dependencies": self._scan_dependencies()
+        }
+        results = await asyncio.gather(*scanners.values(), return_exceptions=True)
 
-        # Scan for code smells
-        smell_issues = await self._scan_for_code_smells(paths or ["."])
-        issues.extend(smell_issues)
+        issues: list[Issue] = []
+        for scanner, result in zip(scanners, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Tech debt scanner failed",
+                    scanner=scanner,
+                    error=str(result)
+                )
+            else:
+                issues.extend(result)
 
-        # Scan for outdated dependencies
-        dep_issues = await self._scan_dependencies()
-        issues.extend(dep_issues)
+        severity_counts = Counter(i.severity for i in issues)
 
         logger.info(
             "Tech debt scan complete",
             issues_found=len(issues),
             by_severity={
-                "critical": sum(1 for i in issues if i.severity == "critical"),
-                "high": sum(1 for i in issues if i.severity == "high"),
-                "medium": sum(1 for i in issues if i.severity == "medium"),
-                "low": sum(1 for i in issues if i.severity == "low")
+                severity: severity_counts[severity]
+                for severity in ("critical", "high", "medium", "low")
             }
         )
 
@@ -112,15 +374,44 @@ class ContinuousImprovement:
 
     async def _scan_for_todos(self, paths: list[str]) -> list[Issue]:
         """Scan for TODO/FIXME comments."""
-        # Placeholder - would use grep/ripgrep to find TODOs
         logger.debug("Scanning for TODO/FIXME comments")
-        return []
+        rg = shutil.which("rg")
+        if rg is not None:
+            todos = await _ripgrep_todos(rg, paths)
+        else:
+            todos = (await self._analyze(paths)).todos
+
+        return [
+            Issue(
+                issue_id=f"todo_{todo['file']}_{todo['line']}",
+                category="tech_debt",
+                severity="medium" if todo["marker"] == "FIXME" else "low",
+                file_path=todo["file"],
+                description=f"{todo['marker']} at line {todo['line']}: {todo['text']}",
+                suggested_fix=f"Resolve the {todo['marker']} or track it as an issue",
+                estimated_effort="small"
+            )
+            for todo in todos
+        ]
 
     async def _scan_for_code_smells(self, paths: list[str]) -> list[Issue]:
         """Scan for code smells (long functions, complex conditionals, etc.)."""
-        # Placeholder - would use static analysis tools
         logger.debug("Scanning for code smells")
-        return []
+        analysis = await self._analyze(paths)
+
+        return [
+            Issue(
+                issue_id=f"smell_{func['file']}_{func['line']}",
+                category="tech_debt",
+                severity="medium",
+                file_path=func["file"],
+                description=f"Function '{func['name']}' is {func['length']} lines long",
+                suggested_fix="Split it into smaller functions",
+                estimated_effort="medium"
+            )
+            for func in analysis.functions
+            if func["length"] > LONG_FUNCTION_LINES and not func["is_test"]
+        ]
 
     async def _scan_dependencies(self) -> list[Issue]:
         """Scan for outdated or vulnerable dependencies."""
@@ -141,6 +432,7 @@ class ContinuousImprovement:
             List of refactoring opportunities
         """
         logger.info("Identifying refactoring opportunities")
+        self._analyses.clear()
 
         opportunities = []
 
@@ -166,46 +458,48 @@ class ContinuousImprovement:
 
     async def _find_complex_functions(self, threshold: int) -> list[dict[str, Any]]:
         """Find functions with high cyclomatic complexity."""
-        # Placeholder - would use complexity analysis tools
         logger.debug("Finding complex functions")
-        return []
+        analysis = await self._analyze(["."])
+
+        return [
+            {**func, "has_tests": func["name"] in analysis.tested_names}
+            for func in analysis.functions
+            if func["complexity"] >= threshold and not func["is_test"]
+        ]
 
     async def monitor_performance_regressions(
         self,
-        baseline: dict[str, float]
+        baseline: dict[str, float],
+        threshold_pct: float = 10
     ) -> list[Regression]:
         """Monitor for performance regressions.
 
         Args:
             baseline: Baseline performance metrics
+            threshold_pct: Minimum increase over baseline, in percent, to flag
 
         Returns:
             List of detected regressions
         """
         logger.info("Monitoring performance regressions")
 
-        regressions = []
-
         # Get current metrics
         current_metrics = await self._get_current_performance_metrics()
 
-        # Compare with baseline
-        for metric_name, baseline_value in baseline.items():
-            current_value = current_metrics.get(metric_name, baseline_value)
-
-            # Calculate regression percentage
-            if baseline_value > 0:
-                regression_pct = ((current_value - baseline_value) / baseline_value) * 100
-
-                # If regression > 10%, flag it
-                if regression_pct > 10:
-                    regressions.append(Regression(
-                        regression_id=f"regression_{metric_name}_{datetime.now().timestamp()}",
-                        metric_name=metric_name,
-                        baseline_value=baseline_value,
-                        current_value=current_value,
-                        regression_percentage=regression_pct
-                    ))
+        # Compare with baseline; models are only built for actual regressions
+        # One clock read per scan; metric names keep ids unique within it
+        detected_at = time.time_ns()
+        regressions = [
+            Regression(
+                regression_id=f"regression_{metric_name}_{detected_at}",
+                metric_name=metric_name,
+                baseline_value=baseline_value,
+                current_value=current_value,
+                regression_percentage=regression_pct
+            )
+            for metric_name, baseline_value, current_value, regression_pct
+            in _find_regressions(baseline, current_metrics, threshold_pct)
+        ]
 
         logger.info(
             "Performance monitoring complete",
@@ -230,6 +524,7 @@ class ContinuousImprovement:
             List of documentation gaps found
         """
         logger.info("Identifying documentation gaps")
+        self._analyses.clear()
 
         gaps = []
 
@@ -253,19 +548,32 @@ class ContinuousImprovement:
         return gaps
 
     async def _find_missing_docstrings(self) -> list[dict[str, Any]]:
-        """Find functions missing docstrings."""
-        # Placeholder - would parse Python/TS files
+        """Find public functions missing docstrings."""
         logger.debug("Finding missing docstrings")
-        return []
+        analysis = await self._analyze(["."])
+
+        return [
+            func
+            for func in analysis.functions
+            if not func["has_docstring"] and not func["is_test"]
+            and not func["name"].startswith("_")
+        ]
 
     async def create_improvement_prs(
         self,
-        opportunities: list[Issue | Refactoring | DocGap]
+        opportunities: list[Issue | Refactoring | DocGap],
+        max_concurrent: int = 8
     ) -> list[str]:
         """Create PRs for improvement opportunities.
 
+        Opportunities are grouped into themed PRs of up to PR_BATCH_SIZE
+        items each, which are created concurrently but at most
+        ``max_concurrent`` at a time to stay clear of GitHub's secondary
+        rate limits. A PR that fails to be created is logged and skipped.
+
         Args:
             opportunities: List of improvements to implement
+            max_concurrent: Maximum PRs being created at once
 
         Returns:
             List of created PR URLs
@@ -275,19 +583,38 @@ class ContinuousImprovement:
             count=len(opportunities)
         )
 
-        pr_urls = []
-
+        # Group by type into themed PRs, e.g. "docs: Add missing docstrings (batch 1)"
+        groups: dict[str, list[Issue | Refactoring | DocGap]] = {}
         for opportunity in opportunities:
-            # Group by type and create themed PRs
-            # e.g., "docs: Add missing docstrings (batch 1)"
-            # e.g., "refactor: Extract complex functions"
-            # e.g., "chore: Update dependencies"
-
-            # Placeholder - would actually create PRs
-            logger.debug(
-                "Would create PR for opportunity",
-                type=type(opportunity).__name__
-            )
+            groups.setdefault(PR_THEMES[type(opportunity)], []).append(opportunity)
+
+        batches = [
+            (f"{theme} (batch {n + 1})", group[start:start + PR_BATCH_SIZE])
+            for theme, group in groups.items()
+            for n, start in enumerate(range(0, len(group), PR_BATCH_SIZE))
+        ]
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def create(title: str, batch: list[Issue | Refactoring | DocGap]) -> str | None:
+            async with semaphore:
+                return await self._create_pr(title, batch)
+
+        results = await asyncio.gather(
+            *(create(title, batch) for title, batch in batches),
+            return_exceptions=True
+        )
+
+        pr_urls = []
+        for (title, _), result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Failed to create improvement PR",
+                    title=title,
+                    error=str(result)
+                )
+            elif result is not None:
+                pr_urls.append(result)
 
         logger.info(
             "Improvement PRs created",
@@ -295,3 +622,21 @@ class ContinuousImprovement:
         )
 
         return pr_urls
+
+    async def _create_pr(
+        self,
+        title: str,
+        opportunities: list[Issue | Refactoring | DocGap]
+    ) -> str | None:
+        """Create one PR for a batch of opportunities.
+
+        Returns:
+            The PR URL, or None if no PR was created
+        """
+        # Placeholder - would actually create PRs
+        logger.debug(
+            "Would create PR for opportunities",
+            title=title,
+            count=len(opportunities)
+        )
+        return None
@@ -0,0 +1,22 @@
+"""Helpers for mocking supabase-py query builder chains."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+
+def build_chain(root: MagicMock, methods: list[str], result: Any) -> MagicMock:
+    """Make ``root.<m1>(...).<m2>(...)...execute()`` return ``result``.
+
+    Args:
+        root: Mock to start from, usually the one returned by ``client.table()``
+        methods: Builder methods called before ``execute``, in order
+        result: Value ``execute()`` returns
+
+    Returns:
+        The ``execute`` mock, for call assertions or a ``side_effect``
+    """
+    node = root
+    for method in methods:
+        node = getattr(node, method).return_value
+    node.execute.return_value = result
+    return node.execute
@@ -0,0 +1,41 @@
+"""Fixtures shared by the agent tests."""
+
+from unittest.mock import patch
+
+import pytest
+from structlog.testing import ReturnLogger
+
+from src.agents.base_agent import BaseAgent
+
+
+class StubAgent(BaseAgent):
+    """Minimal concrete agent for exercising BaseAgent behaviour."""
+
+    async def execute(self, task_description, context=None):
+        return {"result": "test"}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def quiet_agent_logs():
+    """Give agents built in these tests a logger that drops events unrendered.
+
+    The retry loops log several events per attempt; rendering and printing
+    each one as JSON only feeds pytest's output capture.
+    """
+    with patch("src.agents.base_agent.get_logger", return_value=ReturnLogger()):
+        yield
+
+
+@pytest.fixture(scope="module")
+def shared_agent():
+    """One stub agent per test module."""
+    return StubAgent(name="test", capabilities=["test"])
+
+
+@pytest.fixture
+def agent(shared_agent):
+    """The module's stub agent, with task tracking reset after each test."""
+    yield shared_agent
+    shared_agent._current_task_id = None
+    shared_agent._current_outputs = []
+    shared_agent._completion_criteria = []
@@ -0,0 +1,49 @@
+"""Fixtures shared by the API route tests."""
+
+from collections.abc import Callable
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+_TASK_ROW_TEMPLATE = MappingProxyType({
+    "id": "test-uuid-123",
+    "title": "Test Task",
+    "description": "This is a test task for the agentic layer",
+    "task_type": "feature",
+    "priority": 5,
+    "status": "pending",
+    "assigned_agent_id": None,
+    "assigned_agent_type": None,
+    "started_at": None,
+    "completed_at": None,
+    "iterations": 0,
+    "verification_status": None,
+    "pr_url": None,
+    "created_by": None,
+    "created_at": "2025-12-30T15:00:00",
+    "updated_at": "2025-12-30T15:00:00",
+})
+
+
+@pytest.fixture
+def mocked_supabase(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Patch the task queue's SupabaseStateStore and return its table mock.
+
+    Every ``store.client.table(...)`` call in the routes returns this mock, so
+    tests configure query chains on it directly.
+    """
+    store_class = MagicMock()
+    monkeypatch.setattr("src.api.routes.task_queue.SupabaseStateStore", store_class)
+    return store_class.return_value.client.table.return_value
+
+
+@pytest.fixture
+def task_row_factory() -> Callable[..., dict[str, Any]]:
+    """Build agent_task_queue rows from a shared template."""
+
+    def make_task_row(**overrides: Any) -> dict[str, Any]:
+        return {**_TASK_ROW_TEMPLATE, **overrides}
+
+    return make_task_row
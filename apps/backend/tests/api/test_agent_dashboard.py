@@ -1,33 +1,60 @@
 """Tests for agent dashboard API routes."""
 
+from types import MappingProxyType
+
 import pytest
 from unittest.mock import patch, AsyncMock
-from fastapi.testclient import TestClient
-from src.api.main import app
 
-client = TestClient(app)
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+_EMPTY_STATS = MappingProxyType({
+    "total_tasks": 0,
+    "successful_tasks": 0,
+    "failed_tasks": 0,
+    "success_rate": 0.0,
+    "by_agent_type": {}
+})
+
+_DEFAULT_STATS = MappingProxyType({
+    "total_tasks": 100,
+    "successful_tasks": 85,
+    "failed_tasks": 15,
+    "success_rate": 0.85,
+    "by_agent_type": {
+        "frontend": {"total": 40, "successful": 35},
+        "backend": {"total": 60, "successful": 50}
+    }
+})
+
+_30DAY_STATS = MappingProxyType({
+    "total_tasks": 50,
+    "successful_tasks": 45,
+    "failed_tasks": 5,
+    "success_rate": 0.90,
+    "by_agent_type": {}
+})
+
+
+@pytest.fixture(autouse=True)
+def stub_agent_metrics():
+    """Keep every test off the metrics database unless it patches its own."""
+    with patch('src.api.routes.agent_dashboard.AgentMetrics') as mock_metrics_class:
+        mock_instance = mock_metrics_class.return_value
+        mock_instance.get_overall_statistics = AsyncMock(return_value=_EMPTY_STATS)
+        mock_instance.get_agent_health = AsyncMock()
+        yield mock_metrics_class
 
 
 class TestAgentDashboardAPI:
     """Tests for agent dashboard endpoints."""
 
-    @patch('src.api.routes.agent_dashboard.AgentMetrics')
-    def test_get_agent_stats(self, mock_metrics_class):
+    async def test_get_agent_stats(self, stub_agent_metrics, client):
         """Test GET /api/agents/stats endpoint."""
-        # Mock the get_overall_statistics method
-        mock_instance = mock_metrics_class.return_value
-        mock_instance.get_overall_statistics = AsyncMock(return_value={
-            "total_tasks": 100,
-            "successful_tasks": 85,
-            "failed_tasks": 15,
-            "success_rate": 0.85,
-            "by_agent_type": {
-                "frontend": {"total": 40, "successful": 35},
-                "backend": {"total": 60, "successful": 50}
-            }
-        })
-
-        response = client.get("/api/agents/stats")
+        mock_instance = stub_agent_metrics.return_value
+        mock_instance.get_overall_statistics.return_value = _DEFAULT_STATS
+
+        response = await client.get("/api/agents/stats")
 
         assert response.status_code == 200
         data = response.json()
@@ -44,28 +71,22 @@ class TestAgentDashboardAPI:
         assert data["total_tasks"] == 100
         assert data["success_rate"] == 0.85
 
-    @patch('src.api.routes.agent_dashboard.AgentMetrics')
-    def test_get_agent_stats_with_time_range(self, mock_metrics_class):
+    async def test_get_agent_stats_with_time_range(self, stub_agent_metrics, client):
         """Test stats endpoint with custom time range."""
-        mock_instance = mock_metrics_class.return_value
-        mock_instance.get_overall_statistics = AsyncMock(return_value={
-            "total_tasks": 50,
-            "successful_tasks": 45,
-            "failed_tasks": 5,
-            "success_rate": 0.90,
-            "by_agent_type": {}
-        })
+        mock_instance = stub_agent_metrics.return_value
+        mock_instance.get_overall_statistics.return_value = _30DAY_STATS
 
-        response = client.get("/api/agents/stats?time_range=30")
+        response = await client.get("/api/agents/stats?time_range=30")
 
         assert response.status_code == 200
         data = response.json()
         assert data["time_range_days"] == 30
+        mock_instance.get_overall_statistics.assert_awaited_once_with(time_range_days=30)
 
-    def test_list_agents(self):
+    async def test_list_agents(self, client):
         """Test GET /api/agents/list endpoint."""
         # This endpoint returns hardcoded data, no mocking needed
-        response = client.get("/api/agents/list")
+        response = await client.get("/api/agents/list")
 
         assert response.status_code == 200
         agents = response.json()
@@ -81,9 +102,9 @@ class TestAgentDashboardAPI:
         assert "task_count" in agent
         assert "success_rate" in agent
 
-    def test_list_agents_filtered_by_type(self):
+    async def test_list_agents_filtered_by_type(self, client):
         """Test listing agents with type filter."""
-        response = client.get("/api/agents/list?agent_type=frontend")
+        response = await client.get("/api/agents/list?agent_type=frontend")
 
         assert response.status_code == 200
         agents = response.json()
@@ -92,10 +113,10 @@ class TestAgentDashboardAPI:
         for agent in agents:
             assert agent["agent_type"] == "frontend"
 
-    def test_get_recent_tasks(self):
+    async def test_get_recent_tasks(self, client):
         """Test GET /api/agents/tasks/recent endpoint."""
         # This endpoint returns hardcoded data, no mocking needed
-        response = client.get("/api/agents/tasks/recent?limit=5")
+        response = await client.get("/api/agents/tasks/recent?limit=5")
 
         assert response.status_code == 200
         tasks = response.json()
@@ -112,9 +133,9 @@ class TestAgentDashboardAPI:
             assert "iterations" in task
             assert "verified" in task
 
-    def test_get_recent_tasks_filtered(self):
+    async def test_get_recent_tasks_filtered(self, client):
         """Test recent tasks with filters."""
-        response = client.get(
+        response = await client.get(
             "/api/agents/tasks/recent?agent_type=backend&status=completed&limit=10"
         )
 
@@ -126,10 +147,10 @@ class TestAgentDashboardAPI:
             assert task["agent_type"] == "backend"
             assert task["status"] == "completed"
 
-    def test_get_performance_trends(self):
+    async def test_get_performance_trends(self, client):
         """Test GET /api/agents/performance/trends endpoint."""
         # This endpoint returns hardcoded data, no mocking needed
-        response = client.get("/api/agents/performance/trends?days=7")
+        response = await client.get("/api/agents/performance/trends?days=7")
 
         assert response.status_code == 200
         data = response.json()
@@ -0,0 +1,29 @@
+"""Tests for health check API routes."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestDatabaseHealthAPI:
+    """Tests for the /health/db endpoint."""
+
+    @patch("src.api.routes.health.check_database", new_callable=AsyncMock)
+    async def test_database_healthy(self, mock_check, client):
+        """Test a reachable database returns 200."""
+        response = await client.get("/health/db")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+        mock_check.assert_awaited_once()
+
+    @patch("src.api.routes.health.check_database", new_callable=AsyncMock)
+    async def test_database_unavailable(self, mock_check, client):
+        """Test an unreachable database returns 503."""
+        mock_check.side_effect = ConnectionError("connection refused")
+
+        response = await client.get("/health/db")
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Database unavailable"
@@ -1,47 +1,24 @@
 """Tests for task queue API routes."""
 
 import pytest
-from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
-from src.api.main import app
+from pydantic import TypeAdapter, ValidationError
+from unittest.mock import MagicMock
 
-client = TestClient(app)
+from src.api.routes.task_queue import CreateTaskRequest, TaskResponse
+from tests._supabase_mocks import build_chain
 
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
 
+
+@pytest.mark.asyncio(loop_scope="session")
 class TestTaskQueueAPI:
     """Tests for task queue endpoints."""
 
-    @patch('src.api.routes.task_queue.SupabaseStateStore')
-    def test_create_task_success(self, mock_store_class):
+    async def test_create_task_success(self, mocked_supabase, task_row_factory, client):
         """Test creating a new task."""
-        # Mock Supabase client
-        mock_client = MagicMock()
-        mock_store = mock_store_class.return_value
-        mock_store.client = mock_client
-
-        # Mock insert response
-        mock_result = MagicMock()
-        mock_result.data = [{
-            "id": "test-uuid-123",
-            "title": "Test Task",
-            "description": "This is a test task for the agentic layer",
-            "task_type": "feature",
-            "priority": 5,
-            "status": "pending",
-            "assigned_agent_id": None,
-            "assigned_agent_type": None,
-            "started_at": None,
-            "completed_at": None,
-            "iterations": 0,
-            "verification_status": None,
-            "pr_url": None,
-            "created_by": None,
-            "created_at": "2025-12-30T15:00:00",
-            "updated_at": "2025-12-30T15:00:00"
-        }]
-        mock_client.table.return_value.insert.return_value.execute.return_value = mock_result
-
-        response = client.post(
+        build_chain(mocked_supabase, ["insert"], MagicMock(data=[task_row_factory()]))
+
+        response = await client.post(
             "/api/tasks/",
             json={
                 "title": "Test Task",
@@ -52,15 +29,15 @@ class TestTaskQueueAPI:
         )
 
         assert response.status_code == 201
-        data = response.json()
+        task = TaskResponse.model_validate(response.json())
 
-        assert data["title"] == "Test Task"
-        assert data["task_type"] == "feature"
-        assert data["status"] == "pending"
+        assert task.title == "Test Task"
+        assert task.task_type == "feature"
+        assert task.status == "pending"
 
-    def test_create_task_validation_short_title(self):
-        """Test that short titles are rejected."""
-        response = client.post(
+    async def test_create_task_invalid_payload_returns_422(self, mocked_supabase, client):
+        """Test that request model validation is wired to a 422 response."""
+        response = await client.post(
             "/api/tasks/",
             json={
                 "title": "AB",  # Too short (min 3)
@@ -71,126 +48,52 @@ class TestTaskQueueAPI:
         )
 
         assert response.status_code == 422  # Validation error
+        mocked_supabase.insert.assert_not_called()
 
-    def test_create_task_validation_invalid_type(self):
-        """Test that invalid task types are rejected."""
-        response = client.post(
-            "/api/tasks/",
-            json={
-                "title": "Valid Title",
-                "description": "Valid description",
-                "task_type": "invalid_type",
-                "priority": 5
-            }
-        )
+    async def test_list_tasks(self, mocked_supabase, task_row_factory, client):
+        """Test listing tasks."""
+        mock_result = MagicMock(data=[task_row_factory(id="task-1")], count=1)
 
-        assert response.status_code == 422  # Validation error
+        # Page query, then the count query
+        build_chain(mocked_supabase, ["select", "order", "order", "range"], mock_result)
+        build_chain(mocked_supabase, ["select"], mock_result)
 
-    @patch('src.api.routes.task_queue.SupabaseStateStore')
-    def test_list_tasks(self, mock_store_class):
-        """Test listing tasks."""
-        # Mock Supabase client
-        mock_client = MagicMock()
-        mock_store = mock_store_class.return_value
-        mock_store.client = mock_client
-
-        # Mock query response
-        mock_result = MagicMock()
-        mock_result.data = [{
-            "id": "task-1",
-            "title": "Test Task 1",
-            "description": "Description 1",
-            "task_type": "feature",
-            "priority": 5,
-            "status": "pending",
-            "assigned_agent_id": None,
-            "assigned_agent_type": None,
-            "started_at": None,
-            "completed_at": None,
-            "iterations": 0,
-            "verification_status": None,
-            "pr_url": None,
-            "created_by": None,
-            "created_at": "2025-12-30T15:00:00",
-            "updated_at": "2025-12-30T15:00:00"
-        }]
-        mock_result.count = 1
-
-        # Mock the query chain
-        mock_table = MagicMock()
-        mock_table.select.return_value.order.return_value.order.return_value.range.return_value.execute.return_value = mock_result
-        mock_table.select.return_value.execute.return_value = mock_result
-        mock_client.table.return_value = mock_table
-
-        response = client.get("/api/tasks/")
+        response = await client.get("/api/tasks/")
 
         assert response.status_code == 200
         data = response.json()
 
-        assert "tasks" in data
-        assert "total" in data
-        assert isinstance(data["tasks"], list)
-        assert len(data["tasks"]) == 1
+        tasks = _TASK_LIST_ADAPTER.validate_python(data["tasks"])
+        assert [task.id for task in tasks] == ["task-1"]
+        assert data["total"] == 1
 
-    @patch('src.api.routes.task_queue.SupabaseStateStore')
-    def test_list_tasks_with_filters(self, mock_store_class):
+    async def test_list_tasks_with_filters(self, mocked_supabase, task_row_factory, client):
         """Test listing tasks with status filter."""
-        mock_client = MagicMock()
-        mock_store = mock_store_class.return_value
-        mock_store.client = mock_client
-
-        mock_result = MagicMock()
-        mock_result.data = [{
-            "id": "task-pending",
-            "title": "Pending Task",
-            "description": "Desc",
-            "task_type": "feature",
-            "priority": 5,
-            "status": "pending",
-            "assigned_agent_id": None,
-            "assigned_agent_type": None,
-            "started_at": None,
-            "completed_at": None,
-            "iterations": 0,
-            "verification_status": None,
-            "pr_url": None,
-            "created_by": None,
-            "created_at": "2025-12-30T15:00:00",
-            "updated_at": "2025-12-30T15:00:00"
-        }]
-        mock_result.count = 1
-
-        mock_table = MagicMock()
-        mock_table.select.return_value.eq.return_value.order.return_value.order.return_value.range.return_value.execute.return_value = mock_result
-        mock_table.select.return_value.eq.return_value.execute.return_value = mock_result
-        mock_client.table.return_value = mock_table
-
-        response = client.get("/api/tasks/?status_filter=pending&page_size=10")
+        mock_result = MagicMock(data=[task_row_factory(id="task-pending")], count=1)
+
+        # Page query, then the count query
+        build_chain(mocked_supabase, ["select", "eq", "order", "order", "range"], mock_result)
+        build_chain(mocked_supabase, ["select", "eq"], mock_result)
+
+        response = await client.get("/api/tasks/?status_filter=pending&page_size=10")
 
         assert response.status_code == 200
         data = response.json()
 
         # All returned tasks should be pending
-        for task in data["tasks"]:
-            assert task["status"] == "pending"
+        tasks = _TASK_LIST_ADAPTER.validate_python(data["tasks"])
+        assert tasks
+        assert all(task.status == "pending" for task in tasks)
 
-    @patch('src.api.routes.task_queue.SupabaseStateStore')
-    def test_list_tasks_pagination(self, mock_store_class):
+    async def test_list_tasks_pagination(self, mocked_supabase, client):
         """Test task list pagination."""
-        mock_client = MagicMock()
-        mock_store = mock_store_class.return_value
-        mock_store.client = mock_client
-
-        mock_result = MagicMock()
-        mock_result.data = []
-        mock_result.count = 0
+        mock_result = MagicMock(data=[], count=0)
 
-        mock_table = MagicMock()
-        mock_table.select.return_value.order.return_value.order.return_value.range.return_value.execute.return_value = mock_result
-        mock_table.select.return_value.execute.return_value = mock_result
-        mock_client.table.return_value = mock_table
+        # Page query, then the count query
+        build_chain(mocked_supabase, ["select", "order", "order", "range"], mock_result)
+        build_chain(mocked_supabase, ["select"], mock_result)
 
-        response = client.get("/api/tasks/?page=1&page_size=5")
+        response = await client.get("/api/tasks/?page=1&page_size=5")
 
         assert response.status_code == 200
         data = response.json()
@@ -198,24 +101,16 @@ class TestTaskQueueAPI:
         assert data["page"] == 1
         assert data["page_size"] == 5
 
-    @patch('src.api.routes.task_queue.SupabaseStateStore')
-    def test_get_queue_stats(self, mock_store_class):
+    async def test_get_queue_stats(self, mocked_supabase, client):
         """Test getting queue statistics."""
-        mock_client = MagicMock()
-        mock_store = mock_store_class.return_value
-        mock_store.client = mock_client
-
-        mock_result = MagicMock()
-        mock_result.data = [
+        build_chain(mocked_supabase, ["select"], MagicMock(data=[
             {"status": "pending", "task_type": "feature"},
             {"status": "in_progress", "task_type": "bug"},
             {"status": "completed", "task_type": "feature"},
             {"status": "pending", "task_type": "docs"}
-        ]
-
-        mock_client.table.return_value.select.return_value.execute.return_value = mock_result
+        ]))
 
-        response = client.get("/api/tasks/stats/summary")
+        response = await client.get("/api/tasks/stats/summary")
 
         assert response.status_code == 200
         data = response.json()
@@ -227,17 +122,79 @@ class TestTaskQueueAPI:
         assert data["in_progress"] == 1
         assert data["completed"] == 1
 
-    def test_get_task_by_id(self):
-        """Test getting a specific task."""
-        # Skipping - requires database integration test
-        pass
+    async def test_task_lifecycle(self, mocked_supabase, task_row_factory, client):
+        """Test creating, getting, updating and cancelling one task."""
+        task = task_row_factory(
+            title="Lifecycle Task",
+            description="Task that goes through the whole lifecycle"
+        )
+        in_progress = {**task, "status": "in_progress", "assigned_agent_id": "agent-1"}
+
+        build_chain(mocked_supabase, ["insert"], MagicMock(data=[task]))
+        build_chain(mocked_supabase, ["select", "eq"], None).side_effect = [
+            MagicMock(data=[task]),
+            MagicMock(data=[{"status": "in_progress"}])
+        ]
+        build_chain(mocked_supabase, ["update", "eq"], None).side_effect = [
+            MagicMock(data=[in_progress]),
+            MagicMock(data=[{**in_progress, "status": "cancelled"}])
+        ]
+
+        response = await client.post(
+            "/api/tasks/",
+            json={
+                "title": task["title"],
+                "description": task["description"],
+                "task_type": "feature",
+                "priority": 5
+            }
+        )
+        assert response.status_code == 201
+        task_id = response.json()["id"]
 
-    def test_update_task_status(self):
-        """Test updating a task status."""
-        # Skipping - requires database integration test
-        pass
+        response = await client.get(f"/api/tasks/{task_id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Lifecycle Task"
 
-    def test_cancel_task(self):
-        """Test cancelling a task."""
-        # Skipping - requires database integration test
-        pass
+        response = await client.patch(
+            f"/api/tasks/{task_id}",
+            json={"status": "in_progress", "assigned_agent_id": "agent-1"}
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+        update_data = mocked_supabase.update.call_args_list[0].args[0]
+        assert update_data["assigned_agent_id"] == "agent-1"
+        assert "started_at" in update_data
+
+        response = await client.delete(f"/api/tasks/{task_id}")
+        assert response.status_code == 204
+        assert mocked_supabase.update.call_args_list[1].args[0]["status"] == "cancelled"
+        mocked_supabase.update.return_value.eq.assert_called_with("id", task_id)
+
+
+class TestCreateTaskRequest:
+    """Tests for task creation request validation."""
+
+    def test_create_task_validation_short_title(self):
+        """Test that short titles are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            CreateTaskRequest(
+                title="AB",  # Too short (min 3)
+                description="Valid description here",
+                task_type="feature",
+                priority=5
+            )
+
+        assert exc_info.value.errors()[0]["loc"] == ("title",)
+
+    def test_create_task_validation_invalid_type(self):
+        """Test that invalid task types are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            CreateTaskRequest(
+                title="Valid Title",
+                description="Valid description",
+                task_type="invalid_type",
+                priority=5
+            )
+
+        assert exc_info.value.errors()[0]["loc"] == ("task_type",)
@@ -1,10 +1,10 @@
 """Pytest configuration and fixtures."""
 
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport
 
-from src.api.main import app
-
 
 @pytest.fixture
 def anyio_backend() -> str:
@@ -12,9 +12,23 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
-@pytest.fixture
-async def client() -> AsyncClient:
-    """Create an async test client."""
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """Import the API app on first use rather than at collection time."""
+    from src.api.main import app
+
+    return app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(app: FastAPI) -> AsyncClient:
+    """Create one async test client for the whole session.
+
+    Requests are dispatched to the app in-process, inside its lifespan, so
+    startup and shutdown run once. Tests using it must run on the session
+    loop, e.g. with ``@pytest.mark.asyncio(loop_scope="session")``.
+    """
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
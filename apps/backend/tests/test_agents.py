@@ -31,7 +31,7 @@ class TestBaseAgent:
 class TestAgentRegistry:
     """Tests for agent registry."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def registry(self) -> AgentRegistry:
         """Create a registry instance."""
         return AgentRegistry()
@@ -70,25 +70,40 @@ class TestAgentRegistry:
         assert agent is not None
         assert agent.name == "frontend"
 
+    def test_get_agent_for_task_sees_newly_registered_agents(self) -> None:
+        """Test that registering an agent invalidates cached task lookups."""
+        registry = AgentRegistry()
+        assert registry.get_agent_for_task("Write a haiku").name == "general"
+
+        poet = GeneralAgent()
+        poet.name = "poet"
+        poet.capabilities = ["haiku"]
+        registry.register(poet)
+
+        assert registry.get_agent_for_task("Write a haiku") is poet
+
 
 class TestFrontendAgent:
     """Tests for frontend agent."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def agent(self) -> FrontendAgent:
         """Create a frontend agent."""
         return FrontendAgent()
 
-    def test_can_handle_frontend_tasks(self, agent: FrontendAgent) -> None:
-        """Test that frontend agent handles frontend tasks."""
-        assert agent.can_handle("Build a React component")
-        assert agent.can_handle("Create a Next.js page")
-        assert agent.can_handle("Style with Tailwind CSS")
-
-    def test_cannot_handle_backend_tasks(self, agent: FrontendAgent) -> None:
-        """Test that frontend agent doesn't handle backend tasks."""
-        assert not agent.can_handle("Create an API endpoint")
-        assert not agent.can_handle("Write a database migration")
+    @pytest.mark.parametrize(
+        ("description", "expected"),
+        [
+            ("Build a React component", True),
+            ("Create a Next.js page", True),
+            ("Style with Tailwind CSS", True),
+            ("Create an API endpoint", False),
+            ("Write a database migration", False),
+        ],
+    )
+    def test_can_handle(self, agent: FrontendAgent, description: str, expected: bool) -> None:
+        """Test that frontend agent handles frontend tasks only."""
+        assert agent.can_handle(description) is expected
 
     @pytest.mark.asyncio
     async def test_execute_task(self, agent: FrontendAgent) -> None:
@@ -100,16 +115,22 @@ class TestFrontendAgent:
 class TestBackendAgent:
     """Tests for backend agent."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def agent(self) -> BackendAgent:
         """Create a backend agent."""
         return BackendAgent()
 
-    def test_can_handle_backend_tasks(self, agent: BackendAgent) -> None:
+    @pytest.mark.parametrize(
+        "description",
+        [
+            "Create an API endpoint",
+            "Build a Python service",
+            "Implement a LangGraph agent",
+        ],
+    )
+    def test_can_handle_backend_tasks(self, agent: BackendAgent, description: str) -> None:
         """Test that backend agent handles backend tasks."""
-        assert agent.can_handle("Create an API endpoint")
-        assert agent.can_handle("Build a Python service")
-        assert agent.can_handle("Implement a LangGraph agent")
+        assert agent.can_handle(description)
 
     @pytest.mark.asyncio
     async def test_execute_task(self, agent: BackendAgent) -> None:
@@ -0,0 +1,334 @@
+"""Tests for continuous improvement scans."""
+
+import ast
+import asyncio
+import json
+import os
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.workflows import continuous_improvement
+from src.workflows.continuous_improvement import (
+    LONG_FUNCTION_LINES,
+    ContinuousImprovement,
+    DocGap,
+    Issue,
+)
+
+
+def _issue(issue_id: str, severity: str) -> Issue:
+    return Issue(
+        issue_id=issue_id,
+        category="tech_debt",
+        severity=severity,
+        file_path="src/app.py",
+        description="Needs work",
+        suggested_fix="Fix it",
+        estimated_effort="small",
+    )
+
+
+@pytest.fixture
+def improvement() -> ContinuousImprovement:
+    return ContinuousImprovement()
+
+
+class TestScanForTechDebt:
+    """Tests for the tech debt scan."""
+
+    async def test_scanners_run_concurrently(self, improvement: ContinuousImprovement) -> None:
+        """Each scanner waits for the others to start, so a serial scan would hang."""
+        started = 0
+        all_started = asyncio.Event()
+
+        async def scanner(*args: object) -> list[Issue]:
+            nonlocal started
+            started += 1
+            if started == 3:
+                all_started.set()
+            await all_started.wait()
+            return [_issue(f"issue_{started}", "high")]
+
+        improvement._scan_for_todos = scanner
+        improvement._scan_for_code_smells = scanner
+        improvement._scan_dependencies = scanner
+
+        issues = await asyncio.wait_for(improvement.scan_for_tech_debt(), 1)
+
+        assert len(issues) == 3
+
+    async def test_failed_scanner_is_skipped(self, improvement: ContinuousImprovement) -> None:
+        async def todos(paths: list[str]) -> list[Issue]:
+            return [_issue("todo_1", "low")]
+
+        async def broken(*args: object) -> list[Issue]:
+            raise RuntimeError("pip-audit not installed")
+
+        async def no_smells(paths: list[str]) -> list[Issue]:
+            return []
+
+        improvement._scan_for_todos = todos
+        improvement._scan_for_code_smells = no_smells
+        improvement._scan_dependencies = broken
+
+        issues = await improvement.scan_for_tech_debt(["src"])
+
+        assert [i.issue_id for i in issues] == ["todo_1"]
+
+
+class TestMonitorPerformanceRegressions:
+    """Tests for regression detection against a baseline."""
+
+    async def test_flags_only_regressions_over_threshold(
+        self, improvement: ContinuousImprovement
+    ) -> None:
+        async def current() -> dict[str, float]:
+            return {"api_latency_ms": 120.0, "bundle_size_kb": 105.0, "test_duration_s": 10.0}
+
+        improvement._get_current_performance_metrics = current
+        baseline = {
+            "api_latency_ms": 100.0,
+            "bundle_size_kb": 100.0,
+            "test_duration_s": 0.0,
+            "cold_start_ms": 50.0,
+        }
+
+        regressions = await improvement.monitor_performance_regressions(baseline)
+
+        assert [r.metric_name for r in regressions] == ["api_latency_ms"]
+        assert regressions[0].regression_percentage == pytest.approx(20.0)
+
+        regressions = await improvement.monitor_performance_regressions(baseline, threshold_pct=4)
+        assert [r.metric_name for r in regressions] == ["api_latency_ms", "bundle_size_kb"]
+
+    async def test_regression_ids_unique_within_scan(
+        self, improvement: ContinuousImprovement
+    ) -> None:
+        async def current() -> dict[str, float]:
+            return {"a": 200.0, "b": 200.0}
+
+        improvement._get_current_performance_metrics = current
+
+        regressions = await improvement.monitor_performance_regressions({"a": 100.0, "b": 100.0})
+
+        ids = [r.regression_id for r in regressions]
+        assert len(set(ids)) == 2
+        assert ids[0].startswith("regression_a_")
+
+
+class TestSourceAnalysis:
+    """Tests for the single-pass source analysis behind the scanners."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        (tmp_path / "app.py").write_text(textwrap.dedent('''
+            MESSAGE = "TODO: not a comment"
+
+
+            def route(request, user):
+                # TODO: cache this lookup
+                if request and user or not user:
+                    for item in request:
+                        if item:
+                            return item
+                return None
+
+
+            def documented():
+                """Has a docstring."""
+                return 1  # FIXME handle errors
+        '''))
+        (tmp_path / "test_app.py").write_text("def test_route():\n    assert route([1], None)\n")
+        (tmp_path / "broken.py").write_text("def (:\n")
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    async def test_todos_from_comments_only(
+        self, improvement: ContinuousImprovement, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PATH", "")
+
+        issues = await improvement._scan_for_todos(["."])
+
+        assert sorted((i.severity, i.description) for i in issues) == [
+            ("low", "TODO at line 6: cache this lookup"),
+            ("medium", "FIXME at line 16: handle errors"),
+        ]
+
+    @staticmethod
+    def _install_fake_rg(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch, file: str, lines: list[int]
+    ) -> None:
+        """Put an ``rg`` on PATH that reports the given lines of one file as matches."""
+        events = [{"type": "begin", "data": {"path": {"text": file}}}]
+        events += [
+            {"type": "match", "data": {
+                "path": {"text": file}, "lines": {"text": "..."}, "line_number": n,
+            }}
+            for n in lines
+        ]
+        events.append({"type": "end", "data": {"path": {"text": file}}})
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        rg = bin_dir / "rg"
+        rg.write_text(
+            "#!/bin/sh\ncat <<'EOF'\n" + "\n".join(json.dumps(e) for e in events) + "\nEOF\n"
+        )
+        rg.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    async def test_todos_from_ripgrep_when_installed(
+        self, improvement: ContinuousImprovement, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        source = tmp_path / "app.py"
+        source.write_text(
+            "import os\n\nx = 1  # FIXME: overflow\n\n\n\n\n\n# TODO/FIXME markers are reported\n"
+        )
+        self._install_fake_rg(tmp_path, monkeypatch, str(source), [3, 9])
+
+        issues = await improvement._scan_for_todos([str(tmp_path)])
+
+        assert [(i.issue_id, i.severity) for i in issues] == [(f"todo_{source}_3", "medium")]
+        assert issues[0].description == "FIXME at line 3: overflow"
+
+    async def test_ripgrep_and_tokenizer_agree_on_hashes_in_strings(
+        self, improvement: ContinuousImprovement, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        source = tmp_path / "app.py"
+        source.write_text('x = "#"  # TODO y\ns = "# TODO not a comment"\n')
+
+        # Both lines match rg's pattern, as they would for the real binary
+        self._install_fake_rg(tmp_path, monkeypatch, str(source), [1, 2])
+        ripgrep = await improvement._scan_for_todos([str(tmp_path)])
+        monkeypatch.setenv("PATH", "")
+        tokenized = await improvement._scan_for_todos([str(tmp_path)])
+
+        assert [i.description for i in tokenized] == ["TODO at line 1: y"]
+        assert ripgrep == tokenized
+
+    async def test_complexity_docstrings_and_tests(
+        self, improvement: ContinuousImprovement, project: Path
+    ) -> None:
+        complex_functions = await improvement._find_complex_functions(threshold=5)
+        missing = await improvement._find_missing_docstrings()
+
+        assert [(f["name"], f["complexity"], f["has_tests"]) for f in complex_functions] == [
+            ("route", 6, True)
+        ]
+        assert [f["name"] for f in missing] == ["route"]
+
+    async def test_scanners_share_one_analysis_per_scan(
+        self, improvement: ContinuousImprovement, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls = 0
+        analyze = continuous_improvement._analyze_sources
+
+        def counting(paths: list[str]) -> continuous_improvement._SourceAnalysis:
+            nonlocal calls
+            calls += 1
+            return analyze(paths)
+
+        monkeypatch.setattr(continuous_improvement, "_analyze_sources", counting)
+        monkeypatch.setenv("PATH", "")
+
+        await improvement.scan_for_tech_debt()
+        assert calls == 1
+
+        await improvement.identify_refactoring_opportunities()
+        await improvement.update_documentation_gaps()
+        assert calls == 3
+
+    async def test_later_scans_see_edited_files(
+        self, improvement: ContinuousImprovement, project: Path
+    ) -> None:
+        before = await improvement.update_documentation_gaps()
+
+        with (project / "app.py").open("a") as f:
+            f.write("\n\ndef added():\n    return 2\n")
+
+        after = await improvement.update_documentation_gaps()
+
+        assert [g.description for g in before] == ["Function 'route' missing docstring"]
+        assert sorted(g.description for g in after) == [
+            "Function 'added' missing docstring",
+            "Function 'route' missing docstring",
+        ]
+
+    async def test_long_functions_outside_tests_are_code_smells(
+        self, improvement: ContinuousImprovement, tmp_path: Path
+    ) -> None:
+        body = "".join(f"    x{n} = {n}\n" for n in range(LONG_FUNCTION_LINES))
+        (tmp_path / "big.py").write_text(f"def big():\n{body}\n\ndef small():\n    pass\n")
+        (tmp_path / "test_big.py").write_text(f"def test_big():\n{body}")
+
+        issues = await improvement._scan_for_code_smells([str(tmp_path)])
+
+        assert [i.description for i in issues] == [
+            f"Function 'big' is {LONG_FUNCTION_LINES + 1} lines long"
+        ]
+
+    def test_skipped_directories_are_not_analysed(self, tmp_path: Path) -> None:
+        (tmp_path / "app.py").write_text("# TODO: keep\n")
+        for skipped in (".venv", "node_modules", "__pycache__"):
+            (tmp_path / skipped).mkdir()
+            (tmp_path / skipped / "lib.py").write_text("# TODO: skip\n")
+
+        analysis = continuous_improvement._analyze_sources([str(tmp_path)])
+
+        assert [t["text"] for t in analysis.todos] == ["keep"]
+
+    @pytest.mark.parametrize(
+        ("source", "expected"),
+        [
+            ("def f():\n    return 1\n", 1),
+            ("def f(a, b, c):\n    return a and b and c\n", 3),
+            ("def f(xs):\n    return [x for x in xs if x if x > 1]\n", 4),
+            ("def f(x):\n    try:\n        pass\n    except ValueError:\n        pass\n", 2),
+            ("def f(x):\n    def g():\n        if x:\n            pass\n    return g\n", 1),
+        ],
+        ids=["straight", "bool_op", "comprehension", "except", "nested_function"],
+    )
+    def test_complexity(self, source: str, expected: int) -> None:
+        func = ast.parse(source).body[0]
+
+        assert continuous_improvement._complexity(func) == expected
+
+
+class TestCreateImprovementPRs:
+    """Tests for themed, rate-limited PR creation."""
+
+    async def test_batches_by_theme_with_bounded_concurrency(
+        self, improvement: ContinuousImprovement
+    ) -> None:
+        running = peak = 0
+        titles = []
+
+        async def create_pr(title: str, batch: list[object]) -> str | None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            titles.append((title, len(batch)))
+            if title.startswith("docs"):
+                raise RuntimeError("GitHub secondary rate limit")
+            return f"https://github.com/acme/app/pull/{len(titles)}"
+
+        improvement._create_pr = create_pr
+        opportunities = [_issue(f"issue_{n}", "low") for n in range(45)]
+        opportunities.append(DocGap(
+            gap_id="doc_1", type="missing_docstring", file_path="app.py", description="x"
+        ))
+
+        urls = await improvement.create_improvement_prs(opportunities, max_concurrent=2)
+
+        assert sorted(titles) == [
+            ("chore: Resolve tech debt (batch 1)", 20),
+            ("chore: Resolve tech debt (batch 2)", 20),
+            ("chore: Resolve tech debt (batch 3)", 5),
+            ("docs: Add missing docstrings (batch 1)", 1),
+        ]
+        assert len(urls) == 3
+        assert peak == 2
@@ -0,0 +1,712 @@
+"""Tests for the MCP client and integration."""
+
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.memory.models import MemoryEntry
+from src.tools.mcp_client import MCPClient
+from src.tools.mcp_integration import MCPIntegration, MCPResource, MCPServer, MCPTool
+from src.tools.mcp_pool import McpInstancePool, compute_mcp_config_hash
+from src.tools.mcp_server import TOOLS_JSON, DomainMemoryMCPServer
+
+
+def _fake_session() -> MagicMock:
+    """Session stub answering list_tools and call_tool like the MCP SDK."""
+    session = MagicMock()
+    session.list_tools = AsyncMock(return_value=SimpleNamespace(tools=[
+        SimpleNamespace(
+            name="echo",
+            description="Echo input",
+            inputSchema={"type": "object"},
+            annotations=MagicMock(**{"model_dump.return_value": {"readOnlyHint": True}}),
+        ),
+    ]))
+    content = MagicMock()
+    content.model_dump.return_value = {"type": "text", "text": "hi"}
+    session.call_tool = AsyncMock(return_value=SimpleNamespace(isError=False, content=[content]))
+    session.list_resources = AsyncMock(return_value=SimpleNamespace(resources=[]))
+    return session
+
+
+class _SessionFactory:
+    """Replacement for _open_session that counts spawned servers."""
+
+    def __init__(self) -> None:
+        self.spawned = 0
+        self.closed = AsyncMock()
+
+    async def __call__(self, server_config: dict[str, Any]) -> tuple[Any, AsyncExitStack]:
+        self.spawned += 1
+        stack = AsyncExitStack()
+        stack.push_async_callback(self.closed)
+        return _fake_session(), stack
+
+
+SERVER = {"name": "echo", "command": "echo-server", "args": []}
+
+
+# ============================================================================
+# MCP Client Tests
+# ============================================================================
+
+
+class TestMCPClient:
+    """Tests for MCPClient session handling."""
+
+    async def test_session_reused_across_calls(self) -> None:
+        """Tool calls share one spawned server and session."""
+        factory = _SessionFactory()
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            connection = await client.connect_to_server(SERVER)
+            again = await client.connect_to_server(SERVER)
+            for _ in range(3):
+                result = await client.call_tool("echo", "echo", {"text": "hi"})
+
+        assert again is connection
+        assert factory.spawned == 1
+        assert connection.session.call_tool.await_count == 3
+        assert result == {"status": "success", "result": [{"type": "text", "text": "hi"}]}
+
+    async def test_list_server_tools(self) -> None:
+        """Tools are listed from the open session."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            await client.connect_to_server(SERVER)
+            tools = await client.list_server_tools("echo")
+
+        assert tools == [{
+            "name": "echo",
+            "description": "Echo input",
+            "input_schema": {"type": "object"},
+            "annotations": {"readOnlyHint": True},
+        }]
+
+    async def test_concurrent_calls_limited_per_server(self) -> None:
+        """Calls beyond max_concurrent wait for a free slot."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+        in_flight = 0
+        peak = 0
+
+        async def call_tool(name: str, args: dict[str, Any]) -> Any:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return SimpleNamespace(isError=False, content=[])
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server({**SERVER, "max_concurrent": 2})
+            connection.session.call_tool = call_tool
+            await asyncio.gather(*(client.call_tool("echo", "echo", {}) for _ in range(6)))
+
+        assert peak == 2
+
+    async def test_identical_inflight_calls_coalesced(self) -> None:
+        """Concurrent identical calls share one RPC when coalescing is on."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        async def call_tool(name: str, args: dict[str, Any]) -> Any:
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(isError=False, content=[])
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+            connection.session.call_tool = AsyncMock(side_effect=call_tool)
+            results = await asyncio.gather(
+                *(client.call_tool("echo", "echo", {"a": 1, "b": 2}, coalesce=True)
+                  for _ in range(3)),
+                client.call_tool("echo", "echo", {"b": 2, "a": 1}, coalesce=True),
+                client.call_tool("echo", "echo", {"a": 2}, coalesce=True),
+                client.call_tool("echo", "echo", {"a": 1, "b": 2}),
+            )
+
+        assert connection.session.call_tool.await_count == 3
+        assert results[0] is results[3]
+        assert client._inflight == {}
+
+    async def test_coalesced_error_reaches_every_caller(self) -> None:
+        """A failed shared call raises in the leader and all followers."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        async def call_tool(name: str, args: dict[str, Any]) -> Any:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("tool crashed")
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+            connection.session.call_tool = AsyncMock(side_effect=call_tool)
+            results = await asyncio.gather(
+                *(client.call_tool("echo", "echo", {}, coalesce=True) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        assert connection.session.call_tool.await_count == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_large_results_spilled_to_content_store(self, tmp_path: Path) -> None:
+        """Results above the threshold come back as handles that resolve."""
+        client = MCPClient(
+            pool=McpInstancePool(heartbeat_interval=None),
+            content_store=tmp_path,
+            spill_threshold_bytes=64,
+        )
+        big = MagicMock(**{"model_dump.return_value": {"type": "text", "text": "x" * 100}})
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+            small = await client.call_tool("echo", "echo", {})
+            connection.session.call_tool.return_value = SimpleNamespace(
+                isError=False, content=[big]
+            )
+            spilled = await client.call_tool("echo", "echo", {})
+
+        assert small["result"] == [{"type": "text", "text": "hi"}]
+        assert spilled["result"]["handle"].startswith("file://")
+        assert await client.fetch_handle(spilled["result"]["handle"]) == [
+            {"type": "text", "text": "x" * 100}
+        ]
+
+    async def test_fetch_handle_rejects_paths_outside_store(self, tmp_path: Path) -> None:
+        """Handles can't be used to read arbitrary files."""
+        client = MCPClient(
+            pool=McpInstancePool(heartbeat_interval=None), content_store=tmp_path / "store"
+        )
+        outside = tmp_path / "secret.json"
+        outside.write_text("{}")
+
+        with pytest.raises(ValueError):
+            await client.fetch_handle(outside.as_uri())
+
+    async def test_tool_listing_cached_until_disconnect(self) -> None:
+        """Repeated listings skip the RPC; disconnecting drops the entry."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+            await client.list_server_tools("echo")
+            await client.list_server_tools("echo")
+            assert connection.session.list_tools.await_count == 1
+
+            await client.disconnect_from_server("echo")
+            connection = await client.connect_to_server(SERVER)
+            await client.list_server_tools("echo")
+            assert connection.session.list_tools.await_count == 1
+            assert client._tools_cache
+
+    async def test_tool_listing_cache_expires(self) -> None:
+        """Listings older than the TTL are fetched again."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None), cache_ttl_seconds=0)
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+            await client.list_server_tools("echo")
+            await client.list_server_tools("echo")
+
+        assert connection.session.list_tools.await_count == 2
+
+    async def test_disconnect_closes_session(self) -> None:
+        """Disconnecting closes the exit stack that owns the server process."""
+        factory = _SessionFactory()
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            await client.connect_to_server(SERVER)
+
+        assert await client.disconnect_from_server("echo") is True
+        factory.closed.assert_awaited_once()
+        assert await client.get_connection_status() == {}
+
+    async def test_cleanup_tears_down_every_server(self) -> None:
+        """Cleanup closes all sessions, even if one teardown fails."""
+        factory = _SessionFactory()
+        pool = McpInstancePool(heartbeat_interval=None)
+        client = MCPClient(pool=pool)
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            for name in ("a", "b", "c"):
+                await client.connect_to_server({**SERVER, "name": name, "args": [name]})
+        factory.closed.side_effect = [None, RuntimeError("stuck"), None]
+
+        await client.cleanup()
+
+        assert factory.closed.await_count == 3
+        assert await client.get_connection_status() == {}
+        assert pool.get_stats()["instances"] == 0
+
+    async def test_failed_connection_reported(self) -> None:
+        """Spawn errors produce a disconnected connection instead of raising."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch(
+            "src.tools.mcp_pool._open_session", AsyncMock(side_effect=OSError("no such file"))
+        ):
+            connection = await client.connect_to_server(SERVER)
+
+        assert connection.connected is False
+        assert connection.error == "no such file"
+
+
+# ============================================================================
+# MCP Instance Pool Tests
+# ============================================================================
+
+
+class TestMcpInstancePool:
+    """Tests for sharing server processes between clients."""
+
+    def test_config_hash_ignores_env_order(self) -> None:
+        """Env ordering does not matter, argument order does."""
+        base = {"command": "srv", "args": ["a", "b"], "env": {"X": "1", "Y": "2"}}
+
+        assert compute_mcp_config_hash(base) == compute_mcp_config_hash(
+            {**base, "env": {"Y": "2", "X": "1"}}
+        )
+        assert compute_mcp_config_hash(base) != compute_mcp_config_hash(
+            {**base, "args": ["b", "a"]}
+        )
+
+    def test_config_hash_distinguishes_http_servers(self) -> None:
+        """Remote servers are keyed by URL and headers."""
+        remote = {"url": "https://mcp.example.com/mcp", "headers": {"A": "1", "B": "2"}}
+
+        assert compute_mcp_config_hash(remote) == compute_mcp_config_hash(
+            {**remote, "headers": {"B": "2", "A": "1"}}
+        )
+        assert compute_mcp_config_hash(remote) != compute_mcp_config_hash(
+            {**remote, "url": "https://other.example.com/mcp"}
+        )
+
+    async def test_startup_error_reported_without_hanging(self) -> None:
+        """Errors before the session is ready (e.g. missing SDK) fail the connect."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch.dict("sys.modules", {"mcp": None}):
+            connection = await asyncio.wait_for(client.connect_to_server(SERVER), 1)
+
+        assert connection.connected is False
+        assert connection.error
+
+    async def test_identical_configs_share_one_process(self) -> None:
+        """The server stops only after the last client disconnects."""
+        factory = _SessionFactory()
+        pool = McpInstancePool(heartbeat_interval=None)
+        first, second = MCPClient(pool=pool), MCPClient(pool=pool)
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            a = await first.connect_to_server(SERVER)
+            b = await second.connect_to_server(SERVER)
+
+        assert factory.spawned == 1
+        assert a.session is b.session
+        assert pool.get_stats()["consumers"] == 2
+
+        await first.disconnect_from_server("echo")
+        factory.closed.assert_not_awaited()
+        await second.disconnect_from_server("echo")
+        factory.closed.assert_awaited_once()
+        assert pool.get_stats()["instances"] == 0
+
+    async def test_aliases_in_one_client_hold_separate_references(self) -> None:
+        """Two server names with one config keep the process until both disconnect."""
+        factory = _SessionFactory()
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            await client.connect_to_server(SERVER)
+            await client.connect_to_server({**SERVER, "name": "alias"})
+
+        await client.disconnect_from_server("echo")
+        factory.closed.assert_not_awaited()
+        await client.disconnect_from_server("alias")
+        factory.closed.assert_awaited_once()
+
+    async def test_no_share_gets_private_process(self) -> None:
+        """Servers flagged no_share are spawned per client."""
+        factory = _SessionFactory()
+        pool = McpInstancePool(heartbeat_interval=None)
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            for client in (MCPClient(pool=pool), MCPClient(pool=pool)):
+                await client.connect_to_server({**SERVER, "no_share": True})
+
+        assert factory.spawned == 2
+
+
+    async def test_dead_server_respawned_by_heartbeat(self) -> None:
+        """A failed ping replaces the session that clients see."""
+        factory = _SessionFactory()
+        pool = McpInstancePool(heartbeat_interval=0.01, heartbeat_timeout=0.1)
+        client = MCPClient(pool=pool)
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            connection = await client.connect_to_server(SERVER)
+            dead = connection.session
+            dead.send_ping = AsyncMock(side_effect=ConnectionError("broken pipe"))
+            for _ in range(50):
+                if factory.spawned == 2:
+                    break
+                await asyncio.sleep(0.01)
+            connection.session.send_ping = AsyncMock()
+
+            assert factory.spawned == 2
+            assert connection.session is not dead
+            factory.closed.assert_awaited_once()
+
+            await client.cleanup()
+
+        assert factory.closed.await_count == 2
+        assert pool.get_stats()["instances"] == 0
+
+
+# ============================================================================
+# MCP Integration Tests
+# ============================================================================
+
+
+class TestMCPIntegration:
+    """Tests for MCPIntegration on top of MCPClient."""
+
+    async def test_tools_loaded_and_executed_through_client(self) -> None:
+        """Loaded tools execute on the same session they were listed from."""
+        factory = _SessionFactory()
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+        integration._register_server(MCPServer(name="echo", command="echo-server"))
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            tools = await integration.load_mcp_tools("echo")
+            result = await integration.execute_mcp_tool("echo", {"text": "hi"})
+
+        assert [tool.name for tool in tools] == ["echo"]
+        assert result["status"] == "success"
+        assert factory.spawned == 1
+
+    async def test_missing_config_discovers_nothing(self, tmp_path: Path) -> None:
+        """A missing config file yields no servers instead of raising."""
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+
+        assert await integration.discover_mcp_servers(str(tmp_path / "absent.json")) == []
+
+    async def test_initialize_loads_servers_concurrently(self, tmp_path: Path) -> None:
+        """All enabled servers load at once; disabled ones are skipped."""
+        config = tmp_path / "mcp_config.json"
+        config.write_text(json.dumps({"mcpServers": {
+            "a": {"command": "a"},
+            "b": {"command": "b"},
+            "off": {"command": "off", "enabled": False},
+        }}))
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+        in_flight: list[str] = []
+        peak = 0
+
+        async def list_tools(server: MCPServer) -> list[Any]:
+            nonlocal peak
+            in_flight.append(server.name)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(server.name)
+            return []
+
+        with patch.object(integration, "_connect_and_list_tools", list_tools):
+            await integration.initialize(str(config), preload=True)
+
+        assert peak == 2
+
+    async def test_failing_server_does_not_hide_other_resources(self) -> None:
+        """Resources from healthy servers are returned when another fails."""
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+        integration._register_server(MCPServer(name="ok", command="ok"))
+        integration._register_server(MCPServer(name="bad", command="bad"))
+        resource = MCPResource(uri="file://a", server="ok", name="a", description="")
+
+        async def list_resources(server: MCPServer) -> list[MCPResource]:
+            if server.name == "bad":
+                raise RuntimeError("down")
+            return [resource]
+
+        with patch.object(integration, "_list_server_resources", list_resources):
+            resources = await integration.handle_mcp_resources()
+
+        assert resources == [resource]
+        assert integration._resources == {"file://a": resource}
+
+    async def test_enabled_index_tracks_registrations(self) -> None:
+        """Disabled servers are counted and queried from the enabled index."""
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+        integration._register_server(MCPServer(name="a", command="a"))
+        integration._register_server(MCPServer(name="b", command="b"))
+        integration._register_server(MCPServer(name="a", command="a", enabled=False))
+
+        stats = await integration.get_statistics()
+
+        assert stats["servers_configured"] == 2
+        assert stats["servers_enabled"] == 1
+        assert list(integration._enabled_servers) == ["b"]
+        assert await integration.handle_mcp_resources("a") == []
+
+    async def test_initialize_defers_loading_until_tool_used(self, tmp_path: Path) -> None:
+        """Servers start only when one of their tools is first requested."""
+        config = tmp_path / "mcp_config.json"
+        config.write_text(json.dumps({"mcpServers": {
+            "echo": {"command": "echo-server"},
+            "other": {"command": "other-server"},
+        }}))
+        factory = _SessionFactory()
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+
+        with patch("src.tools.mcp_pool._open_session", factory):
+            await integration.initialize(str(config))
+            assert factory.spawned == 0
+            with pytest.raises(RuntimeError, match="not loaded"):
+                integration.get_tool("echo")
+
+            tools = await asyncio.gather(*(integration.aget_tool("echo/echo") for _ in range(3)))
+            assert factory.spawned == 1
+            assert all(tool is not None and tool.server == "echo" for tool in tools)
+
+            result = await integration.execute_mcp_tool("echo", {})
+            assert factory.spawned == 1
+
+            assert await integration.aget_tool("other/missing") is None
+            assert factory.spawned == 2
+
+        assert result["status"] == "success"
+
+    async def test_sync_getters_need_every_server_tried(self, tmp_path: Path) -> None:
+        """Sync lookups raise while servers are unloaded, then answer once all were tried."""
+        config = tmp_path / "mcp_config.json"
+        config.write_text(json.dumps({"mcpServers": {
+            "echo": {"command": "echo-server"},
+            "broken": {"command": "broken-server"},
+        }}))
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+
+        async def list_tools(server: MCPServer) -> list[MCPTool]:
+            if server.name == "broken":
+                raise RuntimeError("down")
+            return [MCPTool(name="echo", server="echo", description="", input_schema={})]
+
+        with patch.object(integration, "_connect_and_list_tools", list_tools):
+            await integration.initialize(str(config))
+            await integration.aget_tool("echo/echo")
+
+            assert integration.get_tool("echo") is not None
+            with pytest.raises(RuntimeError, match="broken"):
+                integration.get_available_tools()
+
+            await integration.initialize(str(config), preload=True)
+
+        assert [tool.name for tool in integration.get_available_tools()] == ["echo"]
+        assert integration.get_tool("missing") is None
+
+    async def test_missing_required_parameters_rejected_before_rpc(self) -> None:
+        """The compiled caller checks the schema's required keys locally."""
+        client = MCPClient(pool=McpInstancePool(heartbeat_interval=None))
+        integration = MCPIntegration(client)
+        tool = MCPTool(
+            name="echo", server="echo", description="", input_schema={"required": ["text"]}
+        )
+        integration._tools["echo"] = tool
+        integration._tool_callers["echo"] = integration._compile_caller(tool)
+
+        with patch("src.tools.mcp_pool._open_session", _SessionFactory()):
+            connection = await client.connect_to_server(SERVER)
+
+            with pytest.raises(ValueError, match="text"):
+                await integration.execute_mcp_tool("echo", {})
+            await integration.execute_mcp_tool("echo", {"text": "hi"})
+
+        assert connection.session.call_tool.await_count == 1
+
+    async def test_resources_streamed_as_servers_respond(self) -> None:
+        """Fast servers' resources arrive before slow ones finish."""
+        integration = MCPIntegration(MCPClient(pool=McpInstancePool(heartbeat_interval=None)))
+        integration._register_server(MCPServer(name="slow", command="slow"))
+        integration._register_server(MCPServer(name="fast", command="fast"))
+        slow_done = asyncio.Event()
+
+        async def list_resources(server: MCPServer) -> list[MCPResource]:
+            if server.name == "slow":
+                await asyncio.sleep(10)
+                slow_done.set()
+            return [MCPResource(uri=f"file://{server.name}", server=server.name,
+                                name=server.name, description="")]
+
+        with patch.object(integration, "_list_server_resources", list_resources):
+            stream = integration.iter_mcp_resources()
+            first = await asyncio.wait_for(anext(stream), 1)
+            await stream.aclose()
+
+        assert first.server == "fast"
+        assert not slow_done.is_set()
+        assert list(integration._resources) == ["file://fast"]
+
+
+# ============================================================================
+# Domain Memory MCP Server Tests
+# ============================================================================
+
+
+class TestDomainMemoryMCPServer:
+    """Tests for the semantic cache in front of memory tools."""
+
+    @pytest.fixture
+    def server(self) -> DomainMemoryMCPServer:
+        vectors = {
+            "how do we do auth": [1.0, 0.0, 0.0],
+            "how is auth done": [0.99, 0.05, 0.0],
+            "database migrations": [0.0, 1.0, 0.0],
+        }
+        with patch("src.tools.mcp_server.MemoryStore"):
+            server = DomainMemoryMCPServer()
+        server._initialized = True
+        provider = MagicMock()
+        provider.get_embedding = AsyncMock(side_effect=lambda text: vectors[text])
+        server.memory_store.embedding_provider = provider
+        server.memory_store.find_similar = AsyncMock(return_value=[{"id": "m1"}])
+        server.memory_store.store_pattern = AsyncMock(return_value=SimpleNamespace(id="p1"))
+        return server
+
+    async def test_similar_query_served_from_cache(self, server: DomainMemoryMCPServer) -> None:
+        """A paraphrase reuses the response; the embedding is computed once per query."""
+        first = await server.execute_tool("search_similar", {"query": "how do we do auth"})
+        second = await server.execute_tool("search_similar", {"query": "how is auth done"})
+
+        assert second == first
+        assert server.memory_store.find_similar.await_count == 1
+        call = server.memory_store.find_similar.await_args
+        assert call.kwargs["query_embedding"] == [1.0, 0.0, 0.0]
+        assert server.memory_store.embedding_provider.get_embedding.await_count == 2
+
+    async def test_exact_repeat_skips_embedding(self, server: DomainMemoryMCPServer) -> None:
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+
+        assert server.memory_store.embedding_provider.get_embedding.await_count == 1
+
+    async def test_dissimilar_or_filtered_query_misses(
+        self, server: DomainMemoryMCPServer
+    ) -> None:
+        """Different topics and different filters go to the store."""
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+        await server.execute_tool("search_similar", {"query": "database migrations"})
+        await server.execute_tool(
+            "search_similar", {"query": "how is auth done", "domain": "testing"}
+        )
+
+        assert server.memory_store.find_similar.await_count == 3
+
+    async def test_store_invalidates_cache(self, server: DomainMemoryMCPServer) -> None:
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+        await server.execute_tool(
+            "store_pattern", {"pattern_type": "auth", "pattern_data": {"flow": "jwt"}}
+        )
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+
+        assert server.memory_store.find_similar.await_count == 2
+
+    async def test_definitions_are_shared_constants(self, server: DomainMemoryMCPServer) -> None:
+        tools = await server.list_tools()
+
+        assert await server.list_tools() is tools
+        assert await server.list_resources() is await server.list_resources()
+        assert json.loads(TOOLS_JSON)[0]["name"] == tools[0]["name"] == "query_memory"
+
+    async def test_unknown_tool_and_domain_are_reported(
+        self, server: DomainMemoryMCPServer
+    ) -> None:
+        unknown = await server.execute_tool("drop_memories", {})
+        bad_domain = await server.execute_tool(
+            "search_similar", {"query": "how do we do auth", "domain": "gossip"}
+        )
+
+        assert unknown == {"error": "Unknown tool: drop_memories", "success": False}
+        assert bad_domain["success"] is False
+        assert "gossip" in bad_domain["error"]
+
+    async def test_query_memory_omits_embeddings(self, server: DomainMemoryMCPServer) -> None:
+        entry = MemoryEntry(
+            domain="knowledge", category="auth", key="jwt", value={}, embedding=[0.1] * 8
+        )
+        server.memory_store.query = AsyncMock(
+            return_value=SimpleNamespace(entries=[entry], total_count=1)
+        )
+
+        result = await server.execute_tool("query_memory", {"domain": "knowledge"})
+
+        assert result["entries"][0]["key"] == "jwt"
+        assert "embedding" not in result["entries"][0]
+
+    async def test_execute_tool_json_encodes_result(self, server: DomainMemoryMCPServer) -> None:
+        server.memory_store.find_similar.return_value = [
+            {"id": "m1", "created_at": datetime(2026, 1, 2, 3, 4, 5)}
+        ]
+
+        payload = await server.execute_tool_json("search_similar", {"query": "how do we do auth"})
+
+        assert json.loads(payload) == {
+            "success": True,
+            "results": [{"id": "m1", "created_at": "2026-01-02T03:04:05"}],
+        }
+
+    async def test_concurrent_misses_share_one_search(self, server: DomainMemoryMCPServer) -> None:
+        release = asyncio.Event()
+
+        async def find_similar(**kwargs: Any) -> list[dict[str, Any]]:
+            await release.wait()
+            return [{"id": "m1"}]
+
+        server.memory_store.find_similar = AsyncMock(side_effect=find_similar)
+        calls = [
+            asyncio.create_task(
+                server.execute_tool("search_similar", {"query": "how do we do auth"})
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert server.memory_store.find_similar.await_count == 1
+        assert results[0] == results[1] == results[2]
+
+    async def test_store_during_search_is_not_cached_stale(
+        self, server: DomainMemoryMCPServer
+    ) -> None:
+        async def find_similar(**kwargs: Any) -> list[dict[str, Any]]:
+            server.cache.clear()
+            return [{"id": "m1"}]
+
+        server.memory_store.find_similar = AsyncMock(side_effect=find_similar)
+
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+        await server.execute_tool("search_similar", {"query": "how do we do auth"})
+
+        assert server.memory_store.find_similar.await_count == 2
+
+    async def test_arguments_validated_against_input_schema(
+        self, server: DomainMemoryMCPServer
+    ) -> None:
+        missing = await server.execute_tool("search_similar", {"domain": "knowledge"})
+        wrong_type = await server.execute_tool(
+            "search_similar", {"query": "how do we do auth", "limit": True}
+        )
+        valid = await server.execute_tool(
+            "search_similar", {"query": "how do we do auth", "domain": "preference"}
+        )
+
+        assert "query" in missing["error"]
+        assert "'limit' of search_similar must be a number" in wrong_type["error"]
+        assert valid["success"] is True
+        assert server.memory_store.find_similar.await_count == 1
@@ -0,0 +1,246 @@
+"""Tests for the OpenRouter client and chat sessions."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError
+
+from src.models.openrouter import (
+    ChatSession,
+    CircuitBreaker,
+    CircuitOpenError,
+    OpenRouterClient,
+)
+
+
+def _session(reply: str = "ok", budget_tokens: int | None = None) -> ChatSession:
+    """Create a ChatSession over a stubbed client."""
+    client = MagicMock()
+    client.chat = AsyncMock(return_value=reply)
+    return ChatSession(client=client, system="sys", budget_tokens=budget_tokens)
+
+
+# ============================================================================
+# ChatSession Tests
+# ============================================================================
+
+
+class TestChatSession:
+    """Tests for ChatSession history handling."""
+
+    async def test_send_appends_user_and_assistant_turns(self) -> None:
+        """Each send records the user turn and the reply."""
+        session = _session(reply="hello")
+
+        reply = await session.send("hi")
+
+        assert reply == "hello"
+        assert session.messages == [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+        ]
+        session.client.chat.assert_awaited_once_with(
+            [{"role": "user", "content": "hi"}], system="sys"
+        )
+
+    async def test_failed_send_rolls_back_user_turn(self) -> None:
+        """A failed request leaves the history unchanged."""
+        session = _session()
+        await session.send("first")
+        session.client.chat = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            await session.send("second")
+
+        assert [m["content"] for m in session.messages] == ["first", "ok"]
+
+    async def test_failed_send_keeps_history_it_would_have_trimmed(self) -> None:
+        """Trimming only takes effect once the request succeeds."""
+        session = _session(reply="r" * 8, budget_tokens=5)
+        await session.send("a" * 8)
+        session.client.chat = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            await session.send("b" * 8)
+
+        assert [m["content"][0] for m in session.messages] == ["a", "r"]
+        sent = session.client.chat.await_args.args[0]
+        assert [m["content"][0] for m in sent] == ["b"]
+
+    def test_trim_drops_oldest_pairs_over_budget(self) -> None:
+        """Oldest user/assistant pairs are rolled off until under budget."""
+        session = _session(budget_tokens=5)
+        messages = [
+            {"role": "user", "content": "a" * 8},
+            {"role": "assistant", "content": "b" * 8},
+            {"role": "user", "content": "c" * 8},
+            {"role": "assistant", "content": "d" * 8},
+            {"role": "user", "content": "e" * 8},
+        ]
+
+        trimmed = session._trim_to_budget(messages)
+
+        assert [m["content"][0] for m in trimmed] == ["e"]
+        assert len(messages) == 5
+
+    def test_trim_keeps_latest_user_turn(self) -> None:
+        """The newest user turn is kept even if it alone exceeds the budget."""
+        session = _session(budget_tokens=1)
+
+        trimmed = session._trim_to_budget([{"role": "user", "content": "x" * 100}])
+
+        assert len(trimmed) == 1
+
+    def test_no_budget_keeps_everything(self) -> None:
+        """Without a budget the history is never trimmed."""
+        session = _session()
+
+        trimmed = session._trim_to_budget([{"role": "user", "content": "x" * 1000}] * 3)
+
+        assert len(trimmed) == 3
+
+
+# ============================================================================
+# Retry and Circuit Breaker Tests
+# ============================================================================
+
+
+def _connection_error() -> APIConnectionError:
+    """A transient, retryable API error."""
+    return APIConnectionError(request=httpx.Request("POST", "https://openrouter.ai"))
+
+
+def _client(create: AsyncMock, breaker: CircuitBreaker | None = None) -> OpenRouterClient:
+    """Create an OpenRouterClient with a stubbed chat.completions.create."""
+    client = OpenRouterClient(model="test/model")
+    client.client = MagicMock()
+    client.client.chat.completions.create = create
+    client._breakers = {"test/model": breaker or CircuitBreaker()}
+    return client
+
+
+@pytest.fixture
+def no_sleep():
+    """Skip retry backoff waits."""
+    with patch("src.models.openrouter.asyncio.sleep", new=AsyncMock()) as sleep:
+        yield sleep
+
+
+class TestRetries:
+    """Tests for OpenRouterClient._create retries."""
+
+    def test_sdk_retries_disabled(self) -> None:
+        """The SDK must not retry on its own behind the breaker's back."""
+        assert OpenRouterClient(model="test/model").client.max_retries == 0
+
+    async def test_retries_until_success(self, no_sleep: AsyncMock) -> None:
+        """Transient errors are retried and the eventual result returned."""
+        create = AsyncMock(side_effect=[_connection_error(), _connection_error(), "done"])
+        client = _client(create)
+
+        assert await client._create(model="test/model") == "done"
+        assert create.await_count == 3
+        assert no_sleep.await_count == 2
+        assert client.breaker._failures == 0
+
+    async def test_gives_up_after_max_attempts(self, no_sleep: AsyncMock) -> None:
+        """The last transient error is raised after MAX_ATTEMPTS calls."""
+        create = AsyncMock(side_effect=_connection_error())
+        client = _client(create)
+
+        with pytest.raises(APIConnectionError):
+            await client._create(model="test/model")
+
+        assert create.await_count == OpenRouterClient.MAX_ATTEMPTS
+        assert client.breaker._failures == OpenRouterClient.MAX_ATTEMPTS
+
+    async def test_non_retryable_error_is_not_retried(self, no_sleep: AsyncMock) -> None:
+        """Client errors are raised immediately and not counted."""
+        response = httpx.Response(400, request=httpx.Request("POST", "https://openrouter.ai"))
+        create = AsyncMock(side_effect=BadRequestError("bad", response=response, body=None))
+        client = _client(create)
+
+        with pytest.raises(BadRequestError):
+            await client._create(model="test/model")
+
+        assert create.await_count == 1
+        assert client.breaker._failures == 0
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_at_threshold(self) -> None:
+        """Consecutive failures open the breaker at the threshold."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+
+        breaker.record_failure()
+        assert not breaker.is_open
+        breaker.record_failure()
+
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_allows_single_trial(self) -> None:
+        """After the timeout only one call is let through."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        with patch("src.models.openrouter.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+
+        with patch("src.models.openrouter.time.monotonic", return_value=31.0):
+            breaker.before_call()
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+
+    def test_trial_success_closes(self) -> None:
+        """A successful trial closes the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        with patch("src.models.openrouter.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+
+        with patch("src.models.openrouter.time.monotonic", return_value=31.0):
+            breaker.before_call()
+            breaker.record_success()
+
+            assert not breaker.is_open
+            breaker.before_call()
+            breaker.before_call()
+
+    def test_trial_failure_reopens(self) -> None:
+        """A failed trial re-opens the breaker for another timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        with patch("src.models.openrouter.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+
+        with patch("src.models.openrouter.time.monotonic", return_value=31.0):
+            breaker.before_call()
+            breaker.record_failure()
+            assert breaker.is_open
+
+        with patch("src.models.openrouter.time.monotonic", return_value=62.0):
+            breaker.before_call()
+
+    def test_release_frees_trial_slot(self) -> None:
+        """An abandoned trial does not block the next one."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        with patch("src.models.openrouter.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+
+        with patch("src.models.openrouter.time.monotonic", return_value=31.0):
+            breaker.before_call()
+            breaker.release()
+            breaker.before_call()
+
+    async def test_open_breaker_fails_fast(self, no_sleep: AsyncMock) -> None:
+        """_create does not call the API while the breaker is open."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        breaker.record_failure()
+        create = AsyncMock(return_value="done")
+        client = _client(create, breaker)
+
+        with pytest.raises(CircuitOpenError):
+            await client._create(model="test/model")
+
+        create.assert_not_awaited()
@@ -5,9 +5,9 @@ import pytest
 from src.agents.orchestrator import OrchestratorAgent, TaskStatus
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def orchestrator() -> OrchestratorAgent:
-    """Create an orchestrator instance."""
+    """Create one orchestrator for the module; the tests only run tasks on it."""
     return OrchestratorAgent()
 
 
@@ -24,45 +24,21 @@ class TestOrchestratorAgent:
         assert "failed" in result
         assert "tasks" in result
 
-    @pytest.mark.asyncio
-    async def test_categorize_frontend_task(
-        self, orchestrator: OrchestratorAgent
-    ) -> None:
-        """Test that frontend tasks are categorized correctly."""
-        category = orchestrator._categorize_task("Build a React component")
-        assert category == "frontend"
-
-    @pytest.mark.asyncio
-    async def test_categorize_backend_task(
-        self, orchestrator: OrchestratorAgent
-    ) -> None:
-        """Test that backend tasks are categorized correctly."""
-        category = orchestrator._categorize_task("Create an API endpoint")
-        assert category == "backend"
-
-    @pytest.mark.asyncio
-    async def test_categorize_database_task(
-        self, orchestrator: OrchestratorAgent
-    ) -> None:
-        """Test that database tasks are categorized correctly."""
-        category = orchestrator._categorize_task("Write a SQL migration")
-        assert category == "database"
-
-    @pytest.mark.asyncio
-    async def test_categorize_devops_task(
-        self, orchestrator: OrchestratorAgent
-    ) -> None:
-        """Test that devops tasks are categorized correctly."""
-        category = orchestrator._categorize_task("Deploy the Docker container")
-        assert category == "devops"
-
-    @pytest.mark.asyncio
-    async def test_categorize_general_task(
-        self, orchestrator: OrchestratorAgent
+    @pytest.mark.parametrize(
+        ("description", "expected"),
+        [
+            ("Build a React component", "frontend"),
+            ("Create an API endpoint", "backend"),
+            ("Write a SQL migration", "database"),
+            ("Deploy the Docker container", "devops"),
+            ("Do something random", "general"),
+        ],
+    )
+    def test_categorize_task(
+        self, orchestrator: OrchestratorAgent, description: str, expected: str
     ) -> None:
-        """Test that generic tasks are categorized as general."""
-        category = orchestrator._categorize_task("Do something random")
-        assert category == "general"
+        """Test that tasks are categorized by their description."""
+        assert orchestrator._categorize_task(description) == expected
 
     @pytest.mark.asyncio
     async def test_task_with_context(self, orchestrator: OrchestratorAgent) -> None:
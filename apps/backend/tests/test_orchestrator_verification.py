@@ -41,8 +41,7 @@ class TestOrchestratorIntegration:
         """Create orchestrator instance."""
         return OrchestratorAgent()
 
-    @pytest.mark.anyio
-    async def test_orchestrator_uses_independent_verifier(
+    def test_orchestrator_uses_independent_verifier(
         self, orchestrator: OrchestratorAgent
     ) -> None:
         """Orchestrator must use IndependentVerifier, not agent self-verification."""
@@ -52,8 +51,7 @@ class TestOrchestratorIntegration:
         # Verify verifier ID is different from orchestrator agent ID
         assert orchestrator.verifier.get_verifier_id() != orchestrator.agent_id
 
-    @pytest.mark.anyio
-    async def test_task_not_complete_without_verification(
+    def test_task_not_complete_without_verification(
         self, orchestrator: OrchestratorAgent
     ) -> None:
         """Task must not be marked complete without passing verification."""
@@ -71,8 +69,7 @@ class TestOrchestratorIntegration:
         assert state.current_task.status == TaskStatus.AWAITING_VERIFICATION
         assert len(state.completed_tasks) == 0
 
-    @pytest.mark.anyio
-    async def test_verification_uses_different_agent_id(
+    def test_verification_uses_different_agent_id(
         self, orchestrator: OrchestratorAgent
     ) -> None:
         """Verification request must have different agent ID than verifier."""
@@ -94,8 +91,7 @@ class TestVerificationGate:
     def orchestrator(self) -> OrchestratorAgent:
         return OrchestratorAgent()
 
-    @pytest.mark.anyio
-    async def test_verification_gate_passes_with_evidence(
+    def test_verification_gate_passes_with_evidence(
         self, orchestrator: OrchestratorAgent
     ) -> None:
         """Verification gate passes when evidence is provided."""
@@ -125,8 +121,7 @@ class TestVerificationGate:
         assert mock_result.passed_checks == 3
         assert len(mock_result.evidence) > 0
 
-    @pytest.mark.anyio
-    async def test_verification_gate_fails_without_evidence(
+    def test_verification_gate_fails_without_evidence(
         self, orchestrator: OrchestratorAgent
     ) -> None:
         """Verification gate fails when no evidence is provided."""
@@ -0,0 +1,194 @@
+"""Tests for the skills loader, parser and executor."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from src.skills.executor import (
+    TRIGGER_KEYWORDS,
+    _build_keyword_matcher,
+)
+from src.skills.loader import SkillLoader
+from src.skills.parser import extract_verification_steps, parse_skill_frontmatter
+
+
+def _scan_triggers(
+    text: str,
+    pattern: object,
+    outputs: dict[str, frozenset[str]],
+    trigger_keywords: dict[str, list[str]],
+) -> list[str]:
+    """Match triggers with the compiled matcher, in declaration order."""
+    matched: set[str] = set()
+    for match in pattern.finditer(text):  # type: ignore[attr-defined]
+        matched |= outputs[match.group(1)]
+    return [t for t in trigger_keywords if t in matched]
+
+
+def _naive_triggers(text: str, trigger_keywords: dict[str, list[str]]) -> list[str]:
+    """Reference implementation: one substring scan per keyword."""
+    return [
+        trigger
+        for trigger, keywords in trigger_keywords.items()
+        if any(kw in text for kw in keywords)
+    ]
+
+
+# ============================================================================
+# Keyword Matcher Tests
+# ============================================================================
+
+
+class TestKeywordMatcher:
+    """The compiled matcher must agree with the naive any() scan."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "build a react component",
+            "deploy the docker image via ci/cd",
+            "write a python api agent",
+            "run the supabase sql migration",
+            "cicd",
+            "nextapi",
+            "nothing relevant here",
+        ],
+    )
+    def test_matches_naive_scan_for_default_keywords(self, text: str) -> None:
+        """Default trigger table gives the same triggers as the naive scan."""
+        pattern, outputs = _build_keyword_matcher(TRIGGER_KEYWORDS)
+
+        assert _scan_triggers(text, pattern, outputs, TRIGGER_KEYWORDS) == _naive_triggers(
+            text, TRIGGER_KEYWORDS
+        )
+
+    def test_overlapping_keywords(self) -> None:
+        """Keywords that overlap in the text are all reported."""
+        keywords = {"a": ["abc"], "b": ["bcd"], "c": ["cde"]}
+        pattern, outputs = _build_keyword_matcher(keywords)
+
+        assert _scan_triggers("abcde", pattern, outputs, keywords) == ["a", "b", "c"]
+
+    def test_prefix_keywords(self) -> None:
+        """A keyword that is a prefix of a longer one still fires its trigger."""
+        keywords = {"short": ["ap"], "long": ["api"]}
+        pattern, outputs = _build_keyword_matcher(keywords)
+
+        assert _scan_triggers("api", pattern, outputs, keywords) == ["short", "long"]
+        assert _scan_triggers("apx", pattern, outputs, keywords) == ["short"]
+
+    def test_random_texts_match_naive_scan(self) -> None:
+        """Randomized equivalence check over a small alphabet."""
+        keywords = {"x": ["ab", "abc"], "y": ["bc", "c"], "z": ["cab", "ba"]}
+        pattern, outputs = _build_keyword_matcher(keywords)
+        rng = random.Random(0)
+
+        for _ in range(2000):
+            text = "".join(rng.choice("abc ") for _ in range(12))
+            assert _scan_triggers(text, pattern, outputs, keywords) == _naive_triggers(
+                text, keywords
+            )
+
+
+# ============================================================================
+# Parser Tests
+# ============================================================================
+
+
+SKILL_WITH_CHECKLIST = """---
+name: checked
+priority: 1
+---
+# Checked
+
+## Usage
+
+- not a step
+
+## Verification Checklist
+
+- [ ] Tests pass
+- [x] Lint is clean
+- Build succeeds
+"""
+
+
+class TestParseVerificationSteps:
+    """parse_skill_frontmatter precomputes verification steps."""
+
+    def test_steps_included_in_parse_output(self) -> None:
+        """Checklist items from the verification section are parsed once."""
+        result = parse_skill_frontmatter(SKILL_WITH_CHECKLIST)
+
+        assert result["verification_steps"] == [
+            "Tests pass",
+            "Lint is clean",
+            "Build succeeds",
+        ]
+
+    def test_steps_match_extract_on_content(self) -> None:
+        """Precomputed steps equal extracting from the parsed body."""
+        result = parse_skill_frontmatter(SKILL_WITH_CHECKLIST)
+
+        assert result["verification_steps"] == extract_verification_steps(result["content"])
+
+    def test_no_verification_section(self) -> None:
+        """Skills without a verification section get an empty list."""
+        result = parse_skill_frontmatter("---\nname: plain\n---\n## Usage\n\n- step\n")
+
+        assert result["verification_steps"] == []
+
+    def test_without_frontmatter(self) -> None:
+        """Steps are extracted when there is no frontmatter."""
+        result = parse_skill_frontmatter("## Verification\n\n- Works\n")
+
+        assert result["verification_steps"] == ["Works"]
+
+
+# ============================================================================
+# Skill Loader Tests
+# ============================================================================
+
+
+def _write_skill(path: Path, name: str, priority: int) -> None:
+    """Write a minimal SKILL.md file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nname: {name}\npriority: {priority}\n---\n# {name}\n")
+
+
+class TestSkillLoader:
+    """Tests for SkillLoader.load_all_skills / aload_all_skills."""
+
+    def test_load_all_skills_sorted_by_priority(self, tmp_path: Path) -> None:
+        """All skills are returned once, sorted by priority."""
+        _write_skill(tmp_path / "core" / "B.md", "b", 2)
+        _write_skill(tmp_path / "core" / "A.md", "a", 1)
+
+        loader = SkillLoader(tmp_path)
+        loader.load_skill(str(Path("core") / "A.md"))
+
+        assert [s["name"] for s in loader.load_all_skills()] == ["a", "b"]
+
+    def test_deleted_skill_files_are_not_returned(self, tmp_path: Path) -> None:
+        """Results follow the files on disk, not the cache."""
+        _write_skill(tmp_path / "A.md", "a", 1)
+        _write_skill(tmp_path / "B.md", "b", 2)
+
+        loader = SkillLoader(tmp_path)
+        assert len(loader.load_all_skills()) == 2
+
+        (tmp_path / "B.md").unlink()
+
+        assert [s["name"] for s in loader.load_all_skills()] == ["a"]
+
+    async def test_aload_all_skills_matches_sync(self, tmp_path: Path) -> None:
+        """The async loader returns the same skills as the sync one."""
+        _write_skill(tmp_path / "x" / "A.md", "a", 3)
+        _write_skill(tmp_path / "B.md", "b", 1)
+
+        async_skills = await SkillLoader(tmp_path).aload_all_skills()
+        sync_skills = SkillLoader(tmp_path).load_all_skills()
+
+        assert [s["name"] for s in async_skills] == [s["name"] for s in sync_skills]
@@ -0,0 +1,653 @@
+"""Tests for state persistence helpers."""
+
+import asyncio
+import threading
+from datetime import UTC
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from postgrest.types import ReturnMethod
+
+from src.state import buffer as buffer_module
+from src.state import pool
+from src.state import supabase as supabase_module
+from src.state.buffer import WriteBuffer
+from src.state.cache import TTLCache
+from src.state.events import AgentRunWatcher
+from src.state.manager import ConversationState, StateManager, TaskState
+from src.state.supabase import SupabaseStateStore
+
+
+class _RecordingFlush:
+    """Flush stub that records each bulk upsert."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls: list[tuple[str, list[dict[str, Any]]]] = []
+        self.targets: list[str] = []
+        self.error = error
+
+    async def __call__(self, table: str, rows: list[dict[str, Any]], on_conflict: str) -> None:
+        self.calls.append((table, rows))
+        self.targets.append(on_conflict)
+        if self.error:
+            raise self.error
+
+
+# ============================================================================
+# Write Buffer Tests
+# ============================================================================
+
+
+class TestWriteBuffer:
+    """Tests for WriteBuffer coalescing and error propagation."""
+
+    async def test_single_write_is_flushed(self) -> None:
+        """A lone write is sent immediately as a batch of one."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush)
+
+        await buffer.enqueue("conversations", {"id": "a"})
+        await buffer.aclose()
+
+        assert flush.calls == [("conversations", [{"id": "a"}])]
+
+    async def test_burst_is_coalesced(self) -> None:
+        """Concurrent writes share bulk upserts, keeping the last row per id."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush)
+
+        await asyncio.gather(
+            *(buffer.enqueue("tasks", {"id": str(i % 5), "n": i}) for i in range(50))
+        )
+        await buffer.aclose()
+
+        assert len(flush.calls) < 50
+        written = {row["id"]: row["n"] for _, rows in flush.calls for row in rows}
+        assert written == {str(i): 45 + i for i in range(5)}
+
+    async def test_max_items_caps_batch_size(self) -> None:
+        """No bulk upsert exceeds max_items rows."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush, max_items=4)
+
+        await asyncio.gather(*(buffer.enqueue("tasks", {"id": str(i)}) for i in range(10)))
+        await buffer.aclose()
+
+        assert all(len(rows) <= 4 for _, rows in flush.calls)
+        assert sum(len(rows) for _, rows in flush.calls) == 10
+
+    async def test_flush_error_propagates_to_callers(self) -> None:
+        """Every caller in a failed batch sees the error."""
+        flush = _RecordingFlush(error=RuntimeError("db down"))
+        buffer = WriteBuffer(flush=flush)
+
+        results = await asyncio.gather(
+            *(buffer.enqueue("tasks", {"id": str(i)}) for i in range(3)),
+            return_exceptions=True,
+        )
+        await buffer.aclose()
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_default_flush_skips_returned_rows(self) -> None:
+        """The bulk upsert asks PostgREST not to return the written rows."""
+        client = MagicMock()
+        client.table.return_value.upsert.return_value.execute = AsyncMock()
+
+        with patch("src.state.buffer.get_async_client", AsyncMock(return_value=client)):
+            await buffer_module._upsert("tasks", [{"id": "t"}], "id")
+
+        client.table.return_value.upsert.assert_called_once_with(
+            [{"id": "t"}], on_conflict="id", returning=ReturnMethod.minimal
+        )
+
+    async def test_tables_are_flushed_separately(self) -> None:
+        """Rows for different tables never share an upsert."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush)
+
+        await asyncio.gather(
+            buffer.enqueue("tasks", {"id": "t"}),
+            buffer.enqueue("conversations", {"id": "c"}),
+        )
+        await buffer.aclose()
+
+        assert sorted(flush.calls) == [
+            ("conversations", [{"id": "c"}]),
+            ("tasks", [{"id": "t"}]),
+        ]
+
+
+    async def test_conflict_targets_are_flushed_separately(self) -> None:
+        """Each on_conflict target gets its own queue instead of the first caller's."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush)
+
+        await asyncio.gather(
+            buffer.enqueue("tasks", {"id": "1", "slug": "a"}, on_conflict="id"),
+            buffer.enqueue("tasks", {"id": "2", "slug": "a"}, on_conflict="slug"),
+        )
+        await buffer.aclose()
+
+        assert sorted(zip(flush.targets, flush.calls, strict=True)) == [
+            ("id", ("tasks", [{"id": "1", "slug": "a"}])),
+            ("slug", ("tasks", [{"id": "2", "slug": "a"}])),
+        ]
+
+    async def test_dead_worker_fails_its_callers(self) -> None:
+        """A worker that crashes fails the writes it held, and a new one takes over."""
+        flush = _RecordingFlush()
+        buffer = WriteBuffer(flush=flush)
+
+        # An unhashable conflict value breaks the worker outside the flush
+        with pytest.raises(TypeError):
+            await buffer.enqueue("tasks", {"id": ["unhashable"]})
+        await buffer.enqueue("tasks", {"id": "t"})
+        await buffer.aclose()
+
+        assert flush.calls == [("tasks", [{"id": "t"}])]
+
+    async def test_cancelled_worker_fails_its_callers(self) -> None:
+        """Cancelling a worker mid-flush fails the writes it was holding."""
+        release = asyncio.Event()
+
+        async def flush(table: str, rows: list[dict[str, Any]], on_conflict: str) -> None:
+            await release.wait()
+
+        buffer = WriteBuffer(flush=flush)
+        writes = [asyncio.create_task(buffer.enqueue("tasks", {"id": str(i)})) for i in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        for worker in list(buffer._workers.values()):
+            worker.cancel()
+        results = await asyncio.gather(*writes, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_buffer_rejects_another_loop(self) -> None:
+        """Writes from a second loop fail fast instead of hanging on the first."""
+        buffer = WriteBuffer(flush=_RecordingFlush(), max_wait_ms=1000)
+        pending = asyncio.create_task(buffer.enqueue("tasks", {"id": "a"}))
+        await asyncio.sleep(0)
+
+        def write_from_other_loop() -> None:
+            asyncio.run(buffer.enqueue("tasks", {"id": "b"}))
+
+        with pytest.raises(RuntimeError, match="different event loop"):
+            await asyncio.to_thread(write_from_other_loop)
+        await pending
+        await buffer.aclose()
+
+    def test_each_event_loop_gets_its_own_buffer(self) -> None:
+        """The shared buffer is per loop, so workers never cross loops."""
+        async def current() -> WriteBuffer:
+            return buffer_module.get_write_buffer()
+
+        async def same_loop_twice() -> bool:
+            return await current() is await current()
+
+        assert asyncio.run(same_loop_twice())
+        assert asyncio.run(current()) is not asyncio.run(current())
+
+# ============================================================================
+# Read Cache Tests
+# ============================================================================
+
+
+class TestTTLCache:
+    """Tests for the TTL + LRU read cache."""
+
+    def test_get_returns_live_entry(self) -> None:
+        """Entries are returned until they expire."""
+        cache = TTLCache(maxsize=2, ttl=5.0)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_expired_entry_is_dropped(self) -> None:
+        """Entries past their TTL are treated as missing."""
+        cache = TTLCache(maxsize=2, ttl=5.0)
+        with patch("src.state.cache.time.monotonic", return_value=0.0):
+            cache.set("a", 1)
+        with patch("src.state.cache.time.monotonic", return_value=6.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """When full, the entry touched longest ago is evicted."""
+        cache = TTLCache(maxsize=2, ttl=5.0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+def _async_client_returning(data: dict[str, Any]) -> MagicMock:
+    """Build an async Supabase client stub whose queries return ``data``."""
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.eq.return_value.single.return_value
+    query.execute = AsyncMock(return_value=MagicMock(data=data))
+    return client
+
+
+class TestStoreReadCache:
+    """Tests for read-through caching in SupabaseStateStore."""
+
+    def setup_method(self) -> None:
+        supabase_module._read_cache.clear()
+
+    async def test_load_conversation_is_cached(self) -> None:
+        """Repeated loads of one conversation query Supabase once."""
+        client = _async_client_returning({"id": "c1", "messages": []})
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock(return_value=client)):
+            first = await store.load_conversation("c1")
+            second = await store.load_conversation("c1")
+
+        assert first == second == {"id": "c1", "messages": []}
+        client.table.assert_called_once_with("conversations")
+
+    async def test_meta_load_selects_columns_and_skips_cache(self) -> None:
+        """Metadata loads fetch only the meta columns and are not cached."""
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value.single.return_value
+        query.execute = AsyncMock(return_value=MagicMock(data={"id": "c1", "context": {}}))
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock(return_value=client)):
+            meta = await store.load_conversation_meta("c1")
+
+        assert meta == {"id": "c1", "context": {}}
+        client.table.return_value.select.assert_called_once_with(
+            "id,user_id,context,created_at,updated_at"
+        )
+        assert supabase_module._read_cache.get(("conversations", "c1")) is None
+
+    async def test_projection_served_from_cached_full_row(self) -> None:
+        """A cached full row answers projected loads without a query."""
+        supabase_module._read_cache.set(
+            ("conversations", "c1"),
+            {"id": "c1", "messages": [{"role": "user", "content": "hi"}], "context": {}},
+        )
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock()) as get_client:
+            messages = await store.load_conversation_messages("c1")
+
+        assert messages == [{"role": "user", "content": "hi"}]
+        get_client.assert_not_awaited()
+
+    async def test_cached_rows_are_copies(self) -> None:
+        """Mutating a returned row changes neither the cache nor later reads."""
+        client = _async_client_returning({"id": "c1", "context": {}})
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock(return_value=client)):
+            first = await store.load_conversation("c1")
+            first["context"] = {"edited": True}
+            second = await store.load_conversation("c1")
+            second["id"] = "changed"
+            third = await store.load_conversation("c1")
+
+        assert third == {"id": "c1", "context": {}}
+
+    async def test_cached_active_runs_are_copies(self) -> None:
+        """Active-run lists handed out from the cache don't share rows."""
+        supabase_module._active_runs_cache.clear()
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value
+        query.in_.return_value.order.return_value.execute = AsyncMock(
+            return_value=MagicMock(data=[{"id": "r1", "status": "pending"}])
+        )
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock(return_value=client)):
+            first = await store.get_active_agent_runs("u1")
+            first[0]["status"] = "completed"
+            first.clear()
+            second = await store.get_active_agent_runs("u1")
+
+        assert second == [{"id": "r1", "status": "pending"}]
+
+    async def test_save_conversation_invalidates(self) -> None:
+        """Saving a conversation drops its cached copy."""
+        supabase_module._read_cache.set(("conversations", "c1"), {"id": "c1"})
+        buffer = MagicMock(enqueue=AsyncMock())
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_write_buffer", return_value=buffer):
+            await store.save_conversation("c1", None, [])
+
+        assert supabase_module._read_cache.get(("conversations", "c1")) is None
+
+
+# ============================================================================
+# State Model Tests
+# ============================================================================
+
+
+class TestStateModels:
+    """Tests for ConversationState / TaskState defaults."""
+
+    def test_defaults_are_not_shared(self) -> None:
+        """Each conversation gets its own messages list and context dict."""
+        first = ConversationState(id="a")
+        second = ConversationState(id="b")
+        first.messages.append({"role": "user", "content": "hi"})
+        first.context["k"] = "v"
+
+        assert second.messages == []
+        assert second.context == {}
+
+    def test_timestamps_are_per_instance_utc(self) -> None:
+        """Timestamps are taken at construction time, in UTC."""
+        task = TaskState(id="t", description="d")
+
+        assert task.created_at.tzinfo == UTC
+        assert ConversationState(id="c").created_at >= task.created_at
+
+
+class TestStateManagerTaskIndex:
+    """Tests for StateManager per-conversation task lookups."""
+
+    def test_returns_only_conversation_tasks_in_order(self) -> None:
+        """Tasks come back in creation order, filtered by conversation."""
+        manager = StateManager()
+        manager.create_task("t1", "one", conversation_id="c1")
+        manager.create_task("t2", "two", conversation_id="c2")
+        manager.create_task("t3", "three", conversation_id="c1")
+
+        assert [t.id for t in manager.get_conversation_tasks("c1")] == ["t1", "t3"]
+        assert manager.get_conversation_tasks("missing") == []
+
+    def test_recreated_task_moves_conversation(self) -> None:
+        """Re-creating a task id drops it from its old conversation."""
+        manager = StateManager()
+        manager.create_task("t1", "one", conversation_id="c1")
+        manager.create_task("t1", "one again", conversation_id="c2")
+
+        assert manager.get_conversation_tasks("c1") == []
+        assert [t.description for t in manager.get_conversation_tasks("c2")] == ["one again"]
+
+
+class TestCreateAgentRun:
+    """Tests for SupabaseStateStore.create_agent_run."""
+
+    def setup_method(self) -> None:
+        supabase_module._read_cache.clear()
+
+    async def test_run_created_through_write_buffer(self) -> None:
+        """The run ID is generated locally and the row queued on the buffer."""
+        buffer = MagicMock(enqueue=AsyncMock())
+        store = SupabaseStateStore()
+        store._client = MagicMock()
+
+        with patch("src.state.supabase.get_write_buffer", return_value=buffer):
+            run = await store.create_agent_run("t1", "u1", "orchestrator", "orch_1")
+
+        buffer.enqueue.assert_awaited_once_with("agent_runs", run)
+        assert run["status"] == "pending"
+        assert run["started_at"] == run["updated_at"]
+        store._client.table.assert_not_called()
+        assert await store.get_agent_run(run["id"]) == run
+
+    async def test_failed_insert_propagates(self) -> None:
+        """Errors from the buffered insert reach the caller and nothing is cached."""
+        buffer = MagicMock(enqueue=AsyncMock(side_effect=RuntimeError("boom")))
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_write_buffer", return_value=buffer):
+            with pytest.raises(RuntimeError):
+                await store.create_agent_run("t1", "u1", "orchestrator", "orch_1")
+
+        assert len(supabase_module._read_cache) == 0
+
+
+class TestUpdateAgentRun:
+    """Tests for SupabaseStateStore.update_agent_run."""
+
+    def setup_method(self) -> None:
+        supabase_module._read_cache.clear()
+
+    async def test_metadata_merged_in_single_rpc(self) -> None:
+        """Metadata updates go through one RPC with no prior SELECT."""
+        store = SupabaseStateStore()
+        store._client = MagicMock()
+        store._client.rpc.return_value.execute.return_value = MagicMock(
+            data=[{"id": "r1", "user_id": "u1", "metadata": {"a": 1, "b": 2}}]
+        )
+
+        run = await store.update_agent_run("r1", current_step="step", metadata={"b": 2})
+
+        assert run["metadata"] == {"a": 1, "b": 2}
+        store._client.rpc.assert_called_once_with("update_agent_run", {
+            "p_run_id": "r1",
+            "p_updates": {"current_step": "step"},
+            "p_metadata": {"b": 2},
+        })
+        store._client.table.assert_not_called()
+
+    async def test_plain_update_without_metadata(self) -> None:
+        """Updates without metadata use a plain table update."""
+        store = SupabaseStateStore()
+        store._client = MagicMock()
+        update = store._client.table.return_value.update
+        update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": "r1", "user_id": "u1"}]
+        )
+
+        await store.update_agent_run("r1", progress_percent=150.0)
+
+        store._client.table.return_value.update.assert_called_once_with(
+            {"progress_percent": 100.0}
+        )
+        store._client.rpc.assert_not_called()
+
+    async def test_queries_run_off_the_event_loop(self) -> None:
+        """Sync-client queries execute on a worker thread."""
+        store = SupabaseStateStore()
+        query = MagicMock()
+        query.execute.side_effect = lambda: threading.current_thread()
+
+        worker = await store._exec(query)
+
+        assert worker is not threading.main_thread()
+
+    async def test_no_changes_is_a_no_op(self) -> None:
+        """Nothing is sent when no fields are given."""
+        store = SupabaseStateStore()
+        store._client = MagicMock()
+
+        assert await store.update_agent_run("r1") is None
+        store._client.table.assert_not_called()
+        store._client.rpc.assert_not_called()
+
+
+# ============================================================================
+# Shared Client Tests
+# ============================================================================
+
+
+class TestSharedClients:
+    """Tests for the process-wide Supabase clients."""
+
+    async def test_sync_client_is_shared_and_closed(self) -> None:
+        """Stores share one sync client until the pool is closed."""
+        with patch.multiple(
+            pool.settings,
+            supabase_url="https://example.supabase.co",
+            supabase_service_role_key="service-key",
+        ):
+            first = SupabaseStateStore().client
+            second = SupabaseStateStore().client
+            http = pool._sync_http
+
+            assert first is second
+            assert http is not None
+
+            await pool.aclose()
+
+        assert pool._sync_client is None
+        assert http.is_closed
+
+    def test_missing_credentials(self) -> None:
+        """Creating a client without credentials raises ValueError."""
+        with patch.multiple(pool.settings, supabase_url="", supabase_service_role_key=""):
+            with pytest.raises(ValueError):
+                pool.get_sync_client()
+
+
+# ============================================================================
+# Agent Run Watcher Tests
+# ============================================================================
+
+
+def _realtime_client() -> MagicMock:
+    """Async client stub whose Realtime channel records its callback."""
+    client = MagicMock()
+    channel = client.channel.return_value.on_postgres_changes.return_value
+    channel.subscribe = AsyncMock(return_value=channel)
+    channel.unsubscribe = AsyncMock()
+    return client
+
+
+def _change(event_type: str, **run: Any) -> dict[str, Any]:
+    """Build a Realtime postgres_changes payload."""
+    return {"data": {"type": event_type, "record": run}}
+
+
+class TestAgentRunWatcher:
+    """Tests for snapshot-plus-delta streaming of active runs."""
+
+    async def test_snapshot_then_changes(self) -> None:
+        """Subscribers get a snapshot, then only their own users' changes."""
+        client = _realtime_client()
+        watcher = AgentRunWatcher()
+        watcher.store = MagicMock(
+            get_active_agent_runs=AsyncMock(return_value=[{"id": "r1", "status": "pending"}])
+        )
+
+        with patch("src.state.events.get_async_client", AsyncMock(return_value=client)):
+            stream = watcher.watch_active_runs("u1")
+            snapshot = await anext(stream)
+
+            dispatch = client.channel.return_value.on_postgres_changes.call_args.kwargs[
+                "callback"
+            ]
+            dispatch(_change("UPDATE", id="r9", user_id="u2", status="in_progress"))
+            dispatch(_change("UPDATE", id="r1", user_id="u1", status="completed"))
+            change = await anext(stream)
+            await stream.aclose()
+
+        assert snapshot == {"type": "snapshot", "runs": [{"id": "r1", "status": "pending"}]}
+        assert change["run"]["id"] == "r1"
+        assert change["active"] is False
+        assert watcher._subscribers == {}
+
+    async def test_delete_is_routed_by_run_id(self) -> None:
+        """A DELETE whose old_record only has the id still reaches the run's owner."""
+        client = _realtime_client()
+        watcher = AgentRunWatcher()
+        watcher.store = MagicMock(
+            get_active_agent_runs=AsyncMock(return_value=[{"id": "r1", "status": "pending"}])
+        )
+
+        with patch("src.state.events.get_async_client", AsyncMock(return_value=client)):
+            stream = watcher.watch_active_runs("u1")
+            await anext(stream)
+
+            dispatch = client.channel.return_value.on_postgres_changes.call_args.kwargs[
+                "callback"
+            ]
+            dispatch(_change("INSERT", id="r2", user_id="u1", status="pending"))
+            dispatch({"data": {"type": "DELETE", "old_record": {"id": "r9"}}})
+            dispatch({"data": {"type": "DELETE", "old_record": {"id": "r1"}}})
+            dispatch({"data": {"type": "DELETE", "old_record": {"id": "r2"}}})
+            events = [await anext(stream) for _ in range(3)]
+            await stream.aclose()
+
+        assert [(e["type"], e["run"]["id"], e["active"]) for e in events] == [
+            ("INSERT", "r2", True),
+            ("DELETE", "r1", False),
+            ("DELETE", "r2", False),
+        ]
+        assert watcher._run_owners == {}
+
+    async def test_channel_is_shared(self) -> None:
+        """Concurrent watchers reuse one Realtime subscription."""
+        client = _realtime_client()
+        watcher = AgentRunWatcher()
+        watcher.store = MagicMock(get_active_agent_runs=AsyncMock(return_value=[]))
+
+        with patch("src.state.events.get_async_client", AsyncMock(return_value=client)):
+            streams = [watcher.watch_active_runs(user) for user in ("u1", "u2")]
+            await asyncio.gather(*(anext(stream) for stream in streams))
+            for stream in streams:
+                await stream.aclose()
+            await watcher.aclose()
+
+        client.channel.assert_called_once_with("agent_runs_changes")
+        channel = client.channel.return_value.on_postgres_changes.return_value
+        channel.subscribe.assert_awaited_once()
+        channel.unsubscribe.assert_awaited_once()
+
+
+class TestStateManagerMessageWindow:
+    """Tests for the bounded in-memory message window."""
+
+    def test_keeps_most_recent_messages(self) -> None:
+        """Old messages are dropped once the window is full."""
+        manager = StateManager(max_messages=3)
+        for i in range(5):
+            manager.add_message("c1", "user", str(i))
+
+        assert [m["content"] for m in manager.get_messages("c1")] == ["2", "3", "4"]
+
+    def test_unbounded_by_default(self) -> None:
+        """Without max_messages the full history is kept."""
+        manager = StateManager()
+        for i in range(150):
+            manager.add_message("c1", "user", str(i))
+
+        assert len(manager.get_messages("c1")) == 150
+
+
+class TestAppendConversationMessages:
+    """Tests for delta appends of conversation messages."""
+
+    def setup_method(self) -> None:
+        supabase_module._read_cache.clear()
+
+    async def test_appends_only_new_messages(self) -> None:
+        """Only the new messages are sent, and the cached row is dropped."""
+        supabase_module._read_cache.set(("conversations", "c1"), {"id": "c1"})
+        client = MagicMock()
+        client.rpc.return_value.execute = AsyncMock()
+        store = SupabaseStateStore()
+        new = [{"role": "user", "content": "hi"}]
+
+        with patch("src.state.supabase.get_async_client", AsyncMock(return_value=client)):
+            await store.append_conversation_messages("c1", new)
+
+        client.rpc.assert_called_once_with(
+            "append_conversation_messages",
+            {"p_conversation_id": "c1", "p_messages": new},
+        )
+        assert supabase_module._read_cache.get(("conversations", "c1")) is None
+
+    async def test_empty_append_is_a_no_op(self) -> None:
+        """No request is made when there is nothing to append."""
+        store = SupabaseStateStore()
+
+        with patch("src.state.supabase.get_async_client", AsyncMock()) as get_client:
+            await store.append_conversation_messages("c1", [])
+
+        get_client.assert_not_awaited()
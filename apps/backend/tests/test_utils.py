@@ -0,0 +1,34 @@
+"""Tests for shared utilities."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from src.utils import iso_now
+
+
+class TestIsoNow:
+    """Tests for the cached ISO 8601 timestamp formatter."""
+
+    def test_matches_datetime_isoformat(self) -> None:
+        """Output parses back to the current UTC time."""
+        before = datetime.now(UTC)
+        stamp = datetime.fromisoformat(iso_now())
+        after = datetime.now(UTC)
+
+        assert stamp.tzinfo == UTC
+        assert before - timedelta(milliseconds=1) <= stamp <= after + timedelta(milliseconds=1)
+
+    def test_formats_known_instant(self) -> None:
+        """A fixed instant formats exactly like isoformat()."""
+        ns = 1_792_152_000_123_456_789
+        expected = datetime.fromtimestamp(ns // 1000 / 1_000_000, UTC)
+
+        with patch("src.utils.timestamps.time.time_ns", return_value=ns):
+            assert iso_now() == expected.isoformat()
+
+    def test_second_rollover(self) -> None:
+        """The cached second prefix is refreshed when the second changes."""
+        with patch("src.utils.timestamps.time.time_ns", return_value=1_000_000_000):
+            assert iso_now() == "1970-01-01T00:00:01.000000+00:00"
+        with patch("src.utils.timestamps.time.time_ns", return_value=2_999_999_000):
+            assert iso_now() == "1970-01-01T00:00:02.999999+00:00"
@@ -0,0 +1,259 @@
+"""Tests for the shared HTTP client and the web tools that use it."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.tools import _http
+from src.tools.reference import RefToolsTool
+from src.tools.web_search import ExaSearchTool
+
+
+def _mock_client(responses: list[httpx.Response]) -> tuple[httpx.AsyncClient, list[httpx.Request]]:
+    """Client answering requests with the given responses, in order."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses[len(requests) - 1]
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("src.tools._http.asyncio.sleep", new=AsyncMock()) as sleep:
+        yield sleep
+
+
+# ============================================================================
+# Shared Client Tests
+# ============================================================================
+
+
+class TestSharedClient:
+    """Tests for the process-wide client and retry loop."""
+
+    async def test_client_is_reused_until_closed(self) -> None:
+        client = _http.get_client()
+        assert _http.get_client() is client
+
+        await _http.aclose()
+
+        assert client.is_closed
+        assert _http.get_client() is not client
+        await _http.aclose()
+
+    async def test_retries_rate_limit_honouring_retry_after(self, no_sleep: AsyncMock) -> None:
+        client, requests = _mock_client([
+            httpx.Response(429, headers={"retry-after": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, json={"ok": True}),
+        ])
+
+        response = await _http.request("GET", "https://example.com", client=client)
+
+        assert response.status_code == 200
+        assert len(requests) == 3
+        assert [c.args[0] for c in no_sleep.await_args_list] == [2.0, 1.0]
+
+    async def test_gives_up_after_retries(self) -> None:
+        client, requests = _mock_client([httpx.Response(500)] * 3)
+
+        response = await _http.request("GET", "https://example.com", client=client, retries=2)
+
+        assert response.status_code == 500
+        assert len(requests) == 3
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        client, requests = _mock_client([httpx.Response(404)])
+
+        response = await _http.request("GET", "https://example.com", client=client)
+
+        assert response.status_code == 404
+        assert len(requests) == 1
+
+
+    async def test_retry_after_is_capped(self, no_sleep: AsyncMock) -> None:
+        client, _ = _mock_client([
+            httpx.Response(429, headers={"retry-after": "3600"}),
+            httpx.Response(200),
+        ])
+
+        await _http.request("GET", "https://example.com", client=client)
+
+        assert no_sleep.await_args.args[0] == _http.MAX_RETRY_DELAY
+
+    async def test_post_is_not_retried_after_reaching_server(self) -> None:
+        client, requests = _mock_client([httpx.Response(503), httpx.Response(200)])
+
+        response = await _http.request("POST", "https://example.com", client=client)
+
+        assert response.status_code == 503
+        assert len(requests) == 1
+
+    async def test_post_read_error_is_raised_without_retry(self) -> None:
+        attempts = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            raise httpx.ReadError("connection reset", request=request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with pytest.raises(httpx.ReadError):
+            await _http.request("POST", "https://example.com", client=client)
+        assert attempts == 1
+
+    async def test_post_connect_error_is_retried(self) -> None:
+        attempts = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = await _http.request("POST", "https://example.com", client=client)
+
+        assert response.status_code == 200
+        assert attempts == 2
+
+    async def test_idempotent_post_opts_into_retries(self) -> None:
+        client, requests = _mock_client([httpx.Response(503), httpx.Response(200)])
+
+        response = await _http.request(
+            "POST", "https://example.com", client=client, idempotent=True
+        )
+
+        assert response.status_code == 200
+        assert len(requests) == 2
+
+# ============================================================================
+# Web Tool Tests
+# ============================================================================
+
+
+class TestWebTools:
+    """Tests for Exa and Ref.tools requests through the shared client."""
+
+    async def test_exa_search_uses_shared_client(self) -> None:
+        client, requests = _mock_client([httpx.Response(200, json={"results": [{"id": 1}]})])
+        tool = ExaSearchTool(api_key="key")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            results = await tool.search("python")
+
+        assert results == [{"id": 1}]
+        assert requests[0].headers["x-api-key"] == "key"
+
+    async def test_exa_without_key_returns_empty_without_requests(self) -> None:
+        client, requests = _mock_client([])
+        tool = ExaSearchTool(api_key="")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            results = [
+                await tool.search("python"),
+                await tool.get_contents(["https://a.example"]),
+                await tool.find_similar("https://a.example"),
+            ]
+
+        assert results == [[], [], []]
+        assert requests == []
+
+    async def test_doc_page_error_is_reported(self) -> None:
+        client, _ = _mock_client([httpx.Response(404)])
+
+        with patch("src.tools._http.get_client", return_value=client):
+            page = await RefToolsTool().get_doc_page("https://docs.example.com/missing")
+
+        assert page["content"] == ""
+        assert "404" in page["error"]
+
+    async def test_concurrent_get_contents_share_one_request(self) -> None:
+        """Per-URL calls made together become one deduplicated /contents POST."""
+        client, requests = _mock_client([httpx.Response(200, json={"results": [
+            {"url": "https://a.example", "text": "A"},
+            {"url": "https://b.example", "text": "B"},
+        ]})])
+        tool = ExaSearchTool(api_key="key")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            first, second, both = await asyncio.gather(
+                tool.get_contents(["https://a.example"]),
+                tool.get_contents(["https://b.example"]),
+                tool.get_contents(["https://b.example", "https://a.example"]),
+            )
+
+        assert len(requests) == 1
+        assert json.loads(requests[0].content)["urls"] == ["https://a.example", "https://b.example"]
+        assert first == [{"url": "https://a.example", "text": "A"}]
+        assert [r["text"] for r in both] == ["B", "A"]
+        assert second[0]["text"] == "B"
+
+    async def test_contents_match_by_returned_id(self) -> None:
+        """A normalized "url" in the response still reaches the caller that asked."""
+        client, _ = _mock_client([httpx.Response(200, json={"results": [
+            {"id": "https://b.example", "url": "https://b.example/", "text": "B"},
+            {"id": "https://a.example", "url": "https://a.example/", "text": "A"},
+            {"id": "https://c.example", "url": "https://c.example/", "text": "C"},
+        ]})])
+        tool = ExaSearchTool(api_key="key")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            first, second = await asyncio.gather(
+                tool.get_contents(["https://a.example", "https://b.example"]),
+                tool.get_contents(["https://c.example"]),
+            )
+
+        assert [r["text"] for r in first] == ["A", "B"]
+        assert [r["text"] for r in second] == ["C"]
+
+    async def test_contents_match_by_position_without_ids(self) -> None:
+        client, _ = _mock_client([httpx.Response(200, json={"results": [
+            {"url": "https://a.example/", "text": "A"},
+        ]})])
+        tool = ExaSearchTool(api_key="key")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            results = await tool.get_contents(["https://a.example"])
+
+        assert results == [{"url": "https://a.example/", "text": "A"}]
+
+    async def test_unmatched_url_fails_instead_of_vanishing(self) -> None:
+        client, _ = _mock_client([httpx.Response(200, json={"results": [
+            {"id": "https://a.example", "text": "A"},
+        ]})])
+        tool = ExaSearchTool(api_key="key")
+
+        with (
+            patch("src.tools._http.get_client", return_value=client),
+            patch("src.tools.web_search.logger") as log,
+        ):
+            found, missing = await asyncio.gather(
+                tool.get_contents(["https://a.example"]),
+                tool.get_contents(["https://b.example"]),
+            )
+
+        assert found == [{"id": "https://a.example", "text": "A"}]
+        assert missing == []
+        assert "https://b.example" in log.error.call_args.kwargs["error"]
+
+    async def test_failed_batch_returns_empty_for_every_caller(self) -> None:
+        client, _ = _mock_client([httpx.Response(400)])
+        tool = ExaSearchTool(api_key="key")
+
+        with patch("src.tools._http.get_client", return_value=client):
+            results = await asyncio.gather(
+                tool.get_contents(["https://a.example"]),
+                tool.get_contents(["https://b.example"]),
+            )
+
+        assert results == [[], []]
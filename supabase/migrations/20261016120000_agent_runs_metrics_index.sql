@@ -0,0 +1,15 @@
+-- Migration: Agent Runs Metrics Index
+-- Purpose: Support time-windowed per-agent health queries from AgentMetrics
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- AgentMetrics writes and groups by agent_type; make sure it exists on agent_runs
+ALTER TABLE public.agent_runs ADD COLUMN IF NOT EXISTS agent_type TEXT;
+
+-- Per-agent runs, newest first:
+--   WHERE metadata->>'agent_id' = ? AND started_at >= ? ORDER BY started_at DESC LIMIT ?
+CREATE INDEX IF NOT EXISTS idx_agent_runs_agent_id_started_at
+    ON public.agent_runs ((metadata->>'agent_id'), started_at DESC);
+
+COMMIT;
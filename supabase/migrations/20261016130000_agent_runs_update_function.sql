@@ -0,0 +1,42 @@
+-- Migration: Agent Runs Update Function
+-- Purpose: Update an agent run and merge its metadata in one statement
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- Apply column updates and merge metadata server-side, avoiding a separate
+-- SELECT round-trip and the lost-update race between read and write.
+--   p_updates:  column -> new value, only for columns being changed
+--   p_metadata: keys to merge into metadata (NULL leaves metadata untouched)
+CREATE OR REPLACE FUNCTION public.update_agent_run(
+  p_run_id UUID,
+  p_updates JSONB DEFAULT '{}'::jsonb,
+  p_metadata JSONB DEFAULT NULL
+)
+RETURNS SETOF public.agent_runs AS $$
+  UPDATE public.agent_runs ar SET
+    status = CASE WHEN p_updates ? 'status'
+      THEN p_updates->>'status' ELSE ar.status END,
+    current_step = CASE WHEN p_updates ? 'current_step'
+      THEN p_updates->>'current_step' ELSE ar.current_step END,
+    progress_percent = CASE WHEN p_updates ? 'progress_percent'
+      THEN (p_updates->>'progress_percent')::float ELSE ar.progress_percent END,
+    result = CASE WHEN p_updates ? 'result'
+      THEN p_updates->'result' ELSE ar.result END,
+    error = CASE WHEN p_updates ? 'error'
+      THEN p_updates->>'error' ELSE ar.error END,
+    verification_attempts = CASE WHEN p_updates ? 'verification_attempts'
+      THEN (p_updates->>'verification_attempts')::int ELSE ar.verification_attempts END,
+    verification_evidence = CASE WHEN p_updates ? 'verification_evidence'
+      THEN p_updates->'verification_evidence' ELSE ar.verification_evidence END,
+    completed_at = CASE WHEN p_updates ? 'completed_at'
+      THEN (p_updates->>'completed_at')::timestamptz ELSE ar.completed_at END,
+    metadata = CASE WHEN p_metadata IS NULL
+      THEN ar.metadata ELSE COALESCE(ar.metadata, '{}'::jsonb) || p_metadata END
+  WHERE ar.id = p_run_id
+  RETURNING ar.*;
+$$ LANGUAGE sql;
+
+GRANT EXECUTE ON FUNCTION public.update_agent_run(UUID, JSONB, JSONB) TO service_role;
+
+COMMIT;
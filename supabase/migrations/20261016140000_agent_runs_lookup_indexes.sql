@@ -0,0 +1,27 @@
+-- Migration: Agent Runs Lookup Indexes
+-- Purpose: Composite indexes matching the state store's hot list queries
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- Active runs for a user, newest first:
+--   WHERE user_id = ? AND status IN (<active>) ORDER BY started_at DESC
+-- Partial on the active statuses, so it only holds in-flight runs and stays
+-- small regardless of history. status is left out of the key: every row in
+-- the index already matches, and keying on it would force a sort across
+-- the status groups.
+CREATE INDEX IF NOT EXISTS idx_agent_runs_active_user_started_at
+    ON public.agent_runs (user_id, started_at DESC)
+    WHERE status IN ('pending', 'in_progress', 'awaiting_verification', 'verification_in_progress');
+
+-- Runs for a task, newest first:
+--   WHERE task_id = ? ORDER BY started_at DESC LIMIT ?
+CREATE INDEX IF NOT EXISTS idx_agent_runs_task_id_started_at
+    ON public.agent_runs (task_id, started_at DESC);
+
+-- Tasks for a conversation, newest first:
+--   WHERE conversation_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_tasks_conversation_id_created_at
+    ON public.tasks (conversation_id, created_at DESC);
+
+COMMIT;
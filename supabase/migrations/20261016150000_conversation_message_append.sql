@@ -0,0 +1,21 @@
+-- Migration: Conversation Message Append
+-- Purpose: Append new messages to a conversation without rewriting history
+-- Created: 2026-10-16
+
+BEGIN;
+
+-- Append p_messages (a JSON array) to the stored messages in place, so
+-- callers send only the new turns instead of the whole conversation.
+CREATE OR REPLACE FUNCTION public.append_conversation_messages(
+  p_conversation_id UUID,
+  p_messages JSONB
+)
+RETURNS VOID AS $$
+  UPDATE public.conversations
+  SET messages = COALESCE(messages, '[]'::jsonb) || p_messages
+  WHERE id = p_conversation_id;
+$$ LANGUAGE sql;
+
+GRANT EXECUTE ON FUNCTION public.append_conversation_messages(UUID, JSONB) TO service_role;
+
+COMMIT;